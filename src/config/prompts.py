@@ -60,6 +60,35 @@ JSON format:
 Ifade: {expression}
 """
 
+# Hesaplama yerelde yapilir; Gemini parametreleri cikarir. Desteklenmeyen isteklerde
+# ikinci bir cagri gerekmesin diye ayni yanitta tam cozumu de verir.
+FINANCIAL_EXTRACT_PROMPT = """
+Sen bir finans asistanisin. Asagidaki istekten hesaplama parametrelerini cikar, HESAPLAMA YAPMA.
+Faiz/iskonto orani HER ZAMAN YILLIK YUZDE olarak yazilir (ornek: yillik %5 -> 5).
+Istekte aylik oran verildiyse yilliga cevir (aylik %1 -> 12). NPV ve IRR'de nakit
+akisi donemi basina yuzde yaz. Bilinmeyen alanlari null birak.
+Sadece operation "other" ise (islem listede yoksa) istegi kendin coz ve "result"
+ile "steps" alanlarini doldur; aksi halde bu alanlar null kalir.
+Para birimi: {currency}
+JSON format:
+{{
+    "operation": "npv" | "irr" | "xirr" | "pmt" | "amortization" | "pv" | "fv" | "other",
+    "annual_rate_percent": <yillik_oran_yuzde>,
+    "cashflows": [<nakit_akislari>],
+    "dates": ["YYYY-MM-DD", ...],
+    "nper": <toplam_odeme_donemi_sayisi>,
+    "periods_per_year": <yilda_odeme_sayisi>,
+    "pv": <bugunku_deger_veya_anapara>,
+    "pmt": <donemsel_odeme>,
+    "fv": <gelecek_deger>,
+    "result": <sadece_other_icin_numerik_sonuc>,
+    "steps": [<sadece_other_icin_adimlar>],
+    "confidence_score": 0.0-1.0 arasi
+}}
+
+Istek: {expression}
+"""
+
 EQUATION_SOLVER_PROMPT = """
 Sen bir denklem cozucu uzmanisin. Denklemleri adim adim coz ve kokleri goster.
 JSON format:
@@ -94,3 +123,14 @@ JSON format:
 Ifade: {expression}
 """
 
+
+# Birden fazla ifadeyi tek Gemini cagrisinda cozmek icin sarmalayici.
+# {domain_prompt} ilgili modul prompt'udur; "Ifade" alani numaralandirilmis listeyi icerir.
+PACKED_PROMPT = """
+{domain_prompt}
+ONEMLI: Yukaridaki "Ifade" alaninda [0]'dan [{last_index}]'e kadar numaralandirilmis {count} ayri ifade var.
+Her ifadeyi birbirinden bagimsiz olarak coz ve her biri icin yukaridaki JSON formatinda bir obje uret.
+Her objeye ifadenin numarasini "index" alani olarak ekle.
+Yaniti girdiyle ayni sirada TEK BIR JSON DIZISI olarak dondur:
+[{{"index": 0, "result": ..., "steps": [...], ...}}, {{"index": 1, ...}}]
+"""
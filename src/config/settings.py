@@ -17,9 +17,14 @@ class Settings:
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
 
     RATE_LIMIT_CALLS_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_CALLS_PER_MINUTE", "60"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "5"))
+    MAX_CONCURRENT_REQUESTS: int = int(os.getenv("MAX_CONCURRENT_REQUESTS", "5"))
     TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.1"))
     TOP_P: float = float(os.getenv("TOP_P", "0.95"))
     MAX_OUTPUT_TOKENS: int = int(os.getenv("MAX_OUTPUT_TOKENS", "2048"))
+    # Prompt packing: tek cagrida cozulecek ifade sayisi MAX_OUTPUT_TOKENS'a gore ayarlanir
+    PACK_TOKENS_PER_ITEM: int = int(os.getenv("PACK_TOKENS_PER_ITEM", "256"))
+    PACK_MAX_ITEMS: int = int(os.getenv("PACK_MAX_ITEMS", "32"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_BACKOFF_BASE: int = int(os.getenv("RETRY_BACKOFF_BASE", "2"))
 
@@ -30,6 +35,47 @@ class Settings:
         "HARM_CATEGORY_DANGEROUS_CONTENT": "BLOCK_NONE",
     }
 
+    # Kalici yanit cache'i (SQLite, sadece lokal)
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    RESPONSE_CACHE_PATH: str = os.getenv("RESPONSE_CACHE_PATH", "cache/responses.sqlite3")
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+    RESPONSE_CACHE_MAX_BYTES: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+    # Yerel motor sonuclari (bellek ici, kanonik ifadeye gore)
+    LOCAL_RESULT_CACHE_ENABLED: bool = os.getenv("LOCAL_RESULT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOCAL_RESULT_CACHE_SIZE: int = int(os.getenv("LOCAL_RESULT_CACHE_SIZE", "1024"))
+    LOCAL_RESULT_CACHE_MAX_BYTES: int = int(os.getenv("LOCAL_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Bu boyutu asan sonuclar (buyuk matrisler, grafik verisi) cache'lenmez
+    LOCAL_RESULT_CACHE_MAX_ITEM_BYTES: int = int(os.getenv("LOCAL_RESULT_CACHE_MAX_ITEM_BYTES", str(1024 * 1024)))
+
+    # Yerel (Gemini'siz) hesaplama motorlari: worker sayisi ve cagri basina zaman asimi
+    LOCAL_ENGINE_WORKERS: int = int(os.getenv("LOCAL_ENGINE_WORKERS", "4"))
+    LOCAL_ENGINE_TIMEOUT_SECONDS: float = float(os.getenv("LOCAL_ENGINE_TIMEOUT_SECONDS", "5"))
+    # Yerelde cozulecek en yuksek polinom derecesi (ustu Gemini'ye gider)
+    EQUATION_MAX_DEGREE: int = int(os.getenv("EQUATION_MAX_DEGREE", "200"))
+
+    # Dosya tabanli matrisler (@A.npy): okuma koku, sonuc dizini ve bellek butcesi
+    LINALG_DATA_ROOT: str = os.getenv("LINALG_DATA_ROOT", ".")
+    LINALG_OUTPUT_DIR: str = os.getenv("LINALG_OUTPUT_DIR", "output/linalg")
+    LINALG_MEMORY_BUDGET_BYTES: int = int(os.getenv("LINALG_MEMORY_BUDGET_BYTES", str(256 * 1024 * 1024)))
+    LINALG_FILE_TIMEOUT_SECONDS: float = float(os.getenv("LINALG_FILE_TIMEOUT_SECONDS", "600"))
+    # Seyrek matrisler: bu yogunlugun ustunde (ve butceye sigiyorsa) yogun temsile gecilir
+    SPARSE_DENSITY_THRESHOLD: float = float(os.getenv("SPARSE_DENSITY_THRESHOLD", "0.1"))
+    SPARSE_SOLVER_TOL: float = float(os.getenv("SPARSE_SOLVER_TOL", "1e-8"))
+    SPARSE_SOLVER_MAXITER: int = int(os.getenv("SPARSE_SOLVER_MAXITER", "1000"))
+
+    # Grafik cizimi: process pool worker sayisi ve bekleyen istek siniri
+    PLOT_WORKERS: int = int(os.getenv("PLOT_WORKERS", "2"))
+    PLOT_QUEUE_LIMIT: int = int(os.getenv("PLOT_QUEUE_LIMIT", "32"))
+    # f(x, y) izgarasi icin nokta butcesi (cozunurluk buradan secilir)
+    PLOT_GRID_POINTS: int = int(os.getenv("PLOT_GRID_POINTS", "250000"))
+    # Pan/zoom icin bellekte tutulan ornek karolarinin toplam nokta siniri
+    PLOT_TILE_CACHE_POINTS: int = int(os.getenv("PLOT_TILE_CACHE_POINTS", "1000000"))
+    # Icerik adresli grafik cache'i (PNG + SQLite indeks), toplam bayta gore LRU
+    PLOT_CACHE_ENABLED: bool = os.getenv("PLOT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    PLOT_CACHE_DIR: str = os.getenv("PLOT_CACHE_DIR", "cache/plots")
+    PLOT_CACHE_MAX_BYTES: int = int(os.getenv("PLOT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
     DEFAULT_CURRENCY: str = os.getenv("DEFAULT_CURRENCY", "TRY")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
@@ -1,47 +1,24 @@
 """Gemini API communication layer"""
 
 import asyncio
+import copy
 import json
 import re
-from typing import Any, Dict, Optional, List
+from typing import Any, Callable, Dict, Optional, List
 
 import google.generativeai as genai
 from google.generativeai.types import GenerationConfig
 
 from src.config.settings import settings
+from src.core.cache import ResponseCache
+from src.core.rate_limiter import RateLimiter
+from src.core.singleflight import SingleFlight
 from src.utils.exceptions import GeminiAPIError
+from src.utils.json_stream import StepStreamParser
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
-# ============================================================
-# RATE LIMITER (Güncellendi)
-# ============================================================
-class RateLimiter:
-    """Simple async rate limiter"""
-
-    def __init__(self, calls_per_minute: int):
-        self.min_interval = 60.0 / calls_per_minute
-        self.last_call_time = 0.0
-        self.lock = asyncio.Lock()
-
-    async def acquire(self):
-        async with self.lock:
-            # Python 3.10+ uyumlu loop alma yöntemi
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                loop = asyncio.get_event_loop()
-            
-            now = loop.time()
-            elapsed = now - self.last_call_time
-            
-            if elapsed < self.min_interval:
-                await asyncio.sleep(self.min_interval - elapsed)
-
-            self.last_call_time = loop.time()
-
-
 # ============================================================
 # GEMINI AGENT (ASENKRON & JSON MODE DESTEKLİ)
 # ============================================================
@@ -70,9 +47,27 @@ class GeminiAgent:
             safety_settings=settings.SAFETY_SETTINGS # Settings'den gelen güvenlik ayarları
         )
 
-        self.rate_limiter = RateLimiter(settings.RATE_LIMIT_CALLS_PER_MINUTE)
+        self.rate_limiter = RateLimiter(
+            settings.RATE_LIMIT_CALLS_PER_MINUTE,
+            burst=settings.RATE_LIMIT_BURST,
+            max_concurrency=settings.MAX_CONCURRENT_REQUESTS,
+        )
+        self.response_cache = ResponseCache(
+            settings.RESPONSE_CACHE_PATH,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+            enabled=settings.RESPONSE_CACHE_ENABLED,
+        )
+        # Aynı anda gelen özdeş istekler tek bir API çağrısını paylaşır
+        self.single_flight = SingleFlight()
         logger.info(f"GeminiAgent initialized with model {self.model_name}")
 
+    @property
+    def deduplicated_calls(self) -> int:
+        """Single-flight ile birleştirilen (API'ye gitmeyen) çağrı sayısı"""
+        return self.single_flight.deduplicated
+
     # ============================================================
     # TEXT GENERATION (Tamamen Asenkron)
     # ============================================================
@@ -80,9 +75,13 @@ class GeminiAgent:
         self, 
         prompt: str, 
         max_retries: Optional[int] = None,
-        config_overrides: Optional[Dict] = None
+        config_overrides: Optional[Dict] = None,
+        use_cache: bool = True,
     ) -> str:
-        """Metin üretir. Hata durumunda tekrar dener."""
+        """Metin üretir. Hata durumunda tekrar dener.
+
+        use_cache=False verilirse kalici cache atlanir (bypass).
+        """
         
         max_retries = max_retries or settings.MAX_RETRIES
         
@@ -94,16 +93,33 @@ class GeminiAgent:
              # bu yüzden gerektiğinde yeni bir nesne oluşturmak daha güvenlidir.
              pass 
 
-        await self.rate_limiter.acquire()
+        cache_key = ResponseCache.make_key(self.model_name, prompt, current_config)
+        # SQLite okuma/commit'leri thread'de çalışır; event loop disk I/O'da beklemez
+        if use_cache:
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                logger.info("Response cache hit (text)")
+                return cached
 
+        return await self.single_flight.do(
+            cache_key,
+            lambda: self._generate_text(prompt, current_config, cache_key, max_retries),
+        )
+
+    async def _generate_text(
+        self, prompt: str, config: GenerationConfig, cache_key: str, max_retries: int
+    ) -> str:
+        """Tek bir metin üretim çağrısı (retry + rate limit dahil)"""
         for attempt in range(max_retries):
             try:
                 # KRİTİK DEĞİŞİKLİK: generate_content_async kullanımı
                 # Bu sayede işlem sırasında diğer async görevler durmaz.
-                response = await self.model.generate_content_async(
-                    prompt,
-                    generation_config=current_config
-                )
+                # Her deneme bir token + eşzamanlılık slotu kullanır.
+                async with self.rate_limiter.slot():
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=config
+                    )
 
                 # Güvenlik filtresine takıldıysa text özelliği hata verebilir
                 if response.prompt_feedback and response.prompt_feedback.block_reason:
@@ -112,7 +128,9 @@ class GeminiAgent:
                 if not response.parts:
                      raise GeminiAPIError("Gemini boş yanıt döndürdü (Blocked or Empty).")
 
-                return response.text.strip()
+                text = response.text.strip()
+                await asyncio.to_thread(self.response_cache.set, cache_key, text)
+                return text
 
             except Exception as e:
                 logger.error(f"Gemini API error ({attempt+1}/{max_retries}): {e}")
@@ -126,33 +144,65 @@ class GeminiAgent:
     # ============================================================
     # JSON OUTPUT GENERATOR (Native JSON Mode)
     # ============================================================
+    @staticmethod
+    def _json_config(max_output_tokens: Optional[int] = None) -> GenerationConfig:
+        """JSON Modu için özel config"""
+        return GenerationConfig(
+            temperature=0.2, # JSON için daha düşük sıcaklık iyidir
+            top_p=0.95,
+            max_output_tokens=max_output_tokens,
+            response_mime_type="application/json" # İŞTE SİHİRLİ KOD BURASI
+        )
+
     async def generate_json_response(
-        self, prompt: str, max_retries: Optional[int] = None
+        self,
+        prompt: str,
+        max_retries: Optional[int] = None,
+        use_cache: bool = True,
+        max_output_tokens: Optional[int] = None,
+        cache_prompt: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Gemini'yi JSON modunda çalışmaya zorlar.
+        Başarılı yanıtlar kalıcı cache'e yazılır; use_cache=False bypass eder.
+        cache_prompt verilirse anahtar onunla üretilir (kanonik ifadeli prompt);
+        böylece eşdeğer yazımlar aynı cache kaydını paylaşır.
         """
         max_retries = max_retries or settings.MAX_RETRIES
 
-        await self.rate_limiter.acquire()
+        json_config = self._json_config(max_output_tokens)
 
-        # JSON Modu için özel config
-        json_config = GenerationConfig(
-            temperature=0.2, # JSON için daha düşük sıcaklık iyidir
-            top_p=0.95,
-            response_mime_type="application/json" # İŞTE SİHİRLİ KOD BURASI
+        cache_key = ResponseCache.make_key(self.model_name, cache_prompt or prompt, json_config)
+        if use_cache:
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                logger.info("Response cache hit (json)")
+                return cached
+
+        # Her bekleyen kendi kopyasını alır; paylaşılan dict mutasyona uğramaz
+        parsed = await self.single_flight.do(
+            cache_key,
+            lambda: self._generate_json(prompt, json_config, cache_key, max_retries),
         )
+        return copy.deepcopy(parsed)
 
+    async def _generate_json(
+        self, prompt: str, config: GenerationConfig, cache_key: str, max_retries: int
+    ) -> Dict[str, Any]:
+        """Tek bir JSON üretim çağrısı (retry + rate limit dahil)"""
         for attempt in range(max_retries):
             try:
-                response = await self.model.generate_content_async(
-                    prompt,
-                    generation_config=json_config
-                )
+                async with self.rate_limiter.slot():
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=config
+                    )
                 
                 # Gemini direkt JSON string döndürür, regex'e gerek kalmaz
                 cleaned_text = response.text.strip()
-                return json.loads(cleaned_text)
+                parsed = json.loads(cleaned_text)
+                await asyncio.to_thread(self.response_cache.set, cache_key, parsed)
+                return parsed
 
             except json.JSONDecodeError:
                 logger.warning(f"JSON Decode hatası. Deneme {attempt+1}")
@@ -164,4 +214,109 @@ class GeminiAgent:
                  logger.error("JSON oluşturulamadı, fallback yapılıyor.")
                  return {"error": "Failed to generate valid JSON", "raw_output": ""}
             
-            await asyncio.sleep(settings.RETRY_BACKOFF_BASE ** attempt)
\ No newline at end of file
+            await asyncio.sleep(settings.RETRY_BACKOFF_BASE ** attempt)
+    # ============================================================
+    # STREAMING JSON (Adımlar geldikçe)
+    # ============================================================
+    async def stream_json_response(
+        self,
+        prompt: str,
+        on_step: Callable[[str], Any],
+        max_retries: Optional[int] = None,
+        use_cache: bool = True,
+        cache_prompt: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """JSON yanıtını akış (stream) olarak alır.
+
+        "steps" dizisinin her elemanı tamamlandığı anda on_step ile bildirilir;
+        dönen değer generate_json_response ile aynı (tam parse edilmiş JSON).
+        """
+        max_retries = max_retries or settings.MAX_RETRIES
+        json_config = self._json_config()
+
+        cache_key = ResponseCache.make_key(self.model_name, cache_prompt or prompt, json_config)
+        if use_cache:
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                logger.info("Response cache hit (stream)")
+                if isinstance(cached, dict):
+                    for step in cached.get("steps", []):
+                        on_step(str(step))
+                # generate_json_response gibi: çağıran kendi kopyasını değiştirebilir
+                return copy.deepcopy(cached)
+
+        emitted = 0
+        for attempt in range(max_retries):
+            parser = StepStreamParser()
+            seen = 0
+            chunks: List[str] = []
+            try:
+                async with self.rate_limiter.slot():
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=json_config,
+                        stream=True,
+                    )
+                    async for chunk in response:
+                        text = chunk.text if chunk.parts else ""
+                        chunks.append(text)
+                        for step in parser.feed(text):
+                            seen += 1
+                            # Önceki denemede gösterilen adımları tekrar basma
+                            if seen > emitted:
+                                emitted = seen
+                                on_step(step)
+
+                parsed = json.loads("".join(chunks).strip())
+                await asyncio.to_thread(self.response_cache.set, cache_key, parsed)
+                return parsed
+
+            except json.JSONDecodeError:
+                logger.warning(f"Stream JSON decode hatası. Deneme {attempt+1}")
+            except Exception as e:
+                logger.error(f"Gemini stream error ({attempt+1}/{max_retries}): {e}")
+
+            if attempt + 1 == max_retries:
+                logger.error("Stream JSON oluşturulamadı, fallback yapılıyor.")
+                return {"error": "Failed to generate valid JSON", "raw_output": ""}
+
+            await asyncio.sleep(settings.RETRY_BACKOFF_BASE ** attempt)
+
+    # ============================================================
+    # PACKED JSON ARRAY (Çoklu ifade tek çağrı)
+    # ============================================================
+    @staticmethod
+    def pack_size(tokens_per_item: Optional[int] = None) -> int:
+        """MAX_OUTPUT_TOKENS'a sığacak ifade sayısını (K) hesaplar"""
+        tokens_per_item = tokens_per_item or settings.PACK_TOKENS_PER_ITEM
+        fit = settings.MAX_OUTPUT_TOKENS // max(1, tokens_per_item)
+        return max(1, min(settings.PACK_MAX_ITEMS, fit))
+
+    async def generate_json_array(
+        self,
+        prompt: str,
+        max_retries: Optional[int] = None,
+        use_cache: bool = True,
+        cache_prompt: Optional[str] = None,
+    ) -> List[Any]:
+        """Paketlenmiş prompt için JSON dizisi döndürür.
+
+        Model diziyi bir obje içine sararsa ("results"/"items") açılır;
+        dizi çıkarılamazsa boş liste döner (çağıran taraf tek tek dener).
+        """
+        response = await self.generate_json_response(
+            prompt,
+            max_retries=max_retries,
+            use_cache=use_cache,
+            max_output_tokens=settings.MAX_OUTPUT_TOKENS,
+            cache_prompt=cache_prompt,
+        )
+
+        if isinstance(response, list):
+            return response
+        if isinstance(response, dict):
+            for key in ("results", "items", "data"):
+                if isinstance(response.get(key), list):
+                    return response[key]
+        logger.warning("Packed response is not a JSON array")
+        return []
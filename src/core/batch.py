@@ -0,0 +1,242 @@
+"""Batch evaluation of JSONL/CSV expression files with bounded concurrency"""
+
+import asyncio
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# JSONL kayıtlarında ifadenin aranacağı alanlar (sırasıyla)
+EXPRESSION_FIELDS = ("expression", "command", "input")
+
+
+def iter_batch_input(path: str) -> Iterator[Tuple[int, str, Optional[Any]]]:
+    """Girdi dosyasını tembel (lazy) okur: (satır_no, ifade, id) üretir.
+
+    - .jsonl: her satır bir JSON string'i ya da {"expression": ..., "id": ...} objesi
+    - .csv: başlık satırı olmalı; "expression" kolonu yoksa ilk kolon kullanılır
+    Satır numaraları 1'den başlar ve checkpoint anahtarı olarak kullanılır.
+    """
+    file_path = Path(path)
+
+    if file_path.suffix.lower() == ".csv":
+        with open(file_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            column = None
+            for line_no, row in enumerate(reader, start=1):
+                if column is None:
+                    column = "expression" if "expression" in row else reader.fieldnames[0]
+                expression = (row.get(column) or "").strip()
+                if expression:
+                    yield line_no, expression, row.get("id")
+        return
+
+    with open(file_path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Düz metin satırı da kabul edilir
+                yield line_no, line, None
+                continue
+
+            if isinstance(record, dict):
+                expression = next(
+                    (str(record[k]) for k in EXPRESSION_FIELDS if record.get(k)), ""
+                )
+                if expression:
+                    yield line_no, expression, record.get("id")
+            elif isinstance(record, str) and record.strip():
+                yield line_no, record.strip(), None
+
+
+def load_checkpoint(out_path: str) -> Set[int]:
+    """Çıktı dosyasındaki başarıyla tamamlanmış satır numaralarını döndürür.
+
+    Çıktı dosyasının kendisi checkpoint'tir. Yarım yazılmış son satır
+    (ani kesinti) kesilip atılır, böylece dosyaya güvenle eklenebilir.
+    Hatalı (ok=False) kayıtlar checkpoint sayılmaz: dosyadan çıkarılır ve
+    bu satırlar yeniden denenir.
+    """
+    path = Path(out_path)
+    if not path.exists():
+        return set()
+
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[: data.rfind(b"\n") + 1]
+
+    done: Set[int] = set()
+    kept: List[str] = []
+    lines = data.decode("utf-8").splitlines()
+    for line in lines:
+        try:
+            record = json.loads(line)
+            line_no = int(record["line"])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            continue
+        if record.get("ok") is False:
+            continue
+        done.add(line_no)
+        kept.append(line)
+
+    if len(kept) < len(lines):
+        # Hatalı kayıtlar atılır; yeniden denenenlerin sonucu sona eklenir
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text("".join(line + "\n" for line in kept), encoding="utf-8")
+        os.replace(tmp, path)
+        logger.info(f"Checkpoint: {len(lines) - len(kept)} failed/unreadable records will be retried")
+    return done
+
+
+def _make_record(line_no: int, expression: str, record_id: Any, outcome: Any) -> Dict[str, Any]:
+    """Sonuç ya da istisnadan çıktı kaydını oluşturur"""
+    record: Dict[str, Any] = {"line": line_no, "input": expression}
+    if record_id is not None:
+        record["id"] = record_id
+
+    if isinstance(outcome, Exception):
+        logger.warning(f"Batch line {line_no} failed: {outcome}")
+        record["ok"] = False
+        record["error"] = f"{type(outcome).__name__}: {outcome}"
+    else:
+        record["ok"] = True
+        record["output"] = outcome.model_dump(mode="json")
+    return record
+
+
+async def _evaluate_record(agent, line_no: int, expression: str, record_id: Any) -> Dict[str, Any]:
+    try:
+        outcome = await agent.evaluate(expression)
+    except Exception as e:
+        outcome = e
+    return _make_record(line_no, expression, record_id, outcome)
+
+
+async def _evaluate_group(agent, items: List[Tuple[int, int, str, Any]]) -> List[Dict[str, Any]]:
+    """Kayıtları tek `agent.evaluate_many` çağrısıyla işler (aynı modüldekiler paketlenir)"""
+    try:
+        outcomes = await agent.evaluate_many([expression for _, _, expression, _ in items])
+    except Exception as e:
+        outcomes = [e] * len(items)
+    return [
+        _make_record(line_no, expression, record_id, outcome)
+        for (_, line_no, expression, record_id), outcome in zip(items, outcomes)
+    ]
+
+
+async def run_batch(
+    agent,
+    input_path: str,
+    out_path: str,
+    concurrency: int = 8,
+    ordered: bool = True,
+    resume: bool = True,
+    group_size: int = 8,
+) -> Dict[str, int]:
+    """Girdi dosyasını `agent.evaluate` ile eşzamanlı işler.
+
+    Args:
+        agent: `async evaluate(str) -> CalculationResult` sunan nesne
+        input_path: .jsonl veya .csv girdi dosyası
+        out_path: Sonuçların yazılacağı .jsonl dosyası (aynı zamanda checkpoint)
+        concurrency: Aynı anda işlenecek ifade sayısı
+        ordered: True → girdi sırası, False → tamamlanma sırası
+        resume: True → daha önce başarıyla tamamlanan satırlar atlanır, hatalılar yeniden denenir
+        group_size: Agent `evaluate_many` sunuyorsa bir işçinin kuyrukta bekleyen
+            kayıtlardan tek seferde alacağı en fazla kayıt; aynı modüle düşenler
+            tek `calculate_many` çağrısında (paketlenmiş Gemini istekleri) çözülür
+
+    Returns:
+        {"processed", "skipped", "failed"} sayaçları
+    """
+    done = load_checkpoint(out_path) if resume else set()
+    stats = {"processed": 0, "skipped": 0, "failed": 0}
+
+    group_size = max(1, group_size) if hasattr(agent, "evaluate_many") else 1
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2 * group_size)
+    # Sıralı modda yeniden sıralama tamponunu sınırlar
+    window = asyncio.Semaphore(concurrency * 4 * group_size)
+    pending: Dict[int, Dict[str, Any]] = {}
+    next_seq = 0
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    out = open(out_path, "a" if resume else "w", encoding="utf-8")
+
+    def write(record: Dict[str, Any]) -> None:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        stats["processed"] += 1
+        if not record["ok"]:
+            stats["failed"] += 1
+        window.release()
+
+    def emit(seq: int, record: Dict[str, Any]) -> None:
+        nonlocal next_seq
+        if not ordered:
+            write(record)
+            return
+        pending[seq] = record
+        while next_seq in pending:
+            write(pending.pop(next_seq))
+            next_seq += 1
+
+    async def producer() -> None:
+        seq = 0
+        for line_no, expression, record_id in iter_batch_input(input_path):
+            if line_no in done:
+                stats["skipped"] += 1
+                continue
+            await window.acquire()
+            await queue.put((seq, line_no, expression, record_id))
+            seq += 1
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if group_size == 1:
+                seq, line_no, expression, record_id = item
+                emit(seq, await _evaluate_record(agent, line_no, expression, record_id))
+                continue
+
+            # Kuyrukta bekleyen kayıtlar da alınıp birlikte işlenir
+            items, finished = [item], False
+            while len(items) < group_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    finished = True
+                    break
+                items.append(item)
+            for (seq, *_), record in zip(items, await _evaluate_group(agent, items)):
+                emit(seq, record)
+            if finished:
+                return
+
+    tasks = [asyncio.ensure_future(producer())]
+    tasks += [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # Hata/iptal durumunda kalan görevleri de durdur
+        for task in tasks:
+            task.cancel()
+        out.flush()
+        os.fsync(out.fileno())
+        out.close()
+
+    logger.info(f"Batch finished: {stats}")
+    return stats
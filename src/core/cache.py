@@ -0,0 +1,294 @@
+"""Persistent (SQLite) response cache for Gemini calls and in-memory local result cache"""
+
+import dataclasses
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class ResponseCache:
+    """Disk uzerinde, TTL ve boyut sinirli (LRU) yanit cache'i.
+
+    Anahtar: model adi + tam prompt + generation config. Deger JSON olarak
+    saklanir, boylece process yeniden baslasa bile ayni sorgu API'ye
+    gitmeden cevaplanir.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 10_000,
+        max_bytes: int = 50 * 1024 * 1024,
+        enabled: bool = True,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.enabled:
+            self._connect()
+
+    def _connect(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+        )
+        self._conn.commit()
+
+    # ============================================================
+    # KEY
+    # ============================================================
+    @staticmethod
+    def make_key(model_name: str, prompt: str, config: Any = None) -> str:
+        """Model + prompt + config'ten stabil bir SHA-256 anahtar uretir"""
+        if dataclasses.is_dataclass(config):
+            config = dataclasses.asdict(config)
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "config": config},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ============================================================
+    # GET / SET
+    # ============================================================
+    def get(self, key: str) -> Optional[Any]:
+        """Cache'ten deger dondurur, yoksa veya suresi dolmussa None"""
+        if not self.enabled or self._conn is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Degeri cache'e yazar ve gerekirse LRU eviction yapar"""
+        if not self.enabled or self._conn is None:
+            return
+
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Response not cacheable: {e}")
+            return
+
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Suresi dolanlari siler, sonra en eski erisilenleri limitlere inene kadar siler"""
+        if self.ttl_seconds:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    # ============================================================
+    # MAINTENANCE
+    # ============================================================
+    def clear(self) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss sayaclari ve doluluk bilgisi"""
+        entries, total = 0, 0
+        if self._conn is not None:
+            with self._lock:
+                entries, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+
+class LocalResultCache:
+    """Yerel motor sonuclari icin bellek ici, sinirli (LRU) cache, thread-safe.
+
+    Anahtar: domain + kanonik ifade + hesaplama parametreleri. Toplam boyut
+    (JSON uzunluguyla tahmini bayt) ve kayit sayisiyla sinirlidir;
+    max_item_bytes'i asan sonuclar (buyuk diziler, grafik verisi) saklanmaz.
+    Sonuclar yuzeysel kopyalanir ve metadata sozlugu ayrica kopyalanir;
+    cagiranin metadata'yi degistirmesi cache'teki kaydi etkilemez. Diger
+    alanlar paylasilir, yerinde degistirilmemelidir.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        enabled: bool = True,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_item_bytes: int = 1024 * 1024,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.max_item_bytes = min(max_item_bytes, max_bytes)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (sonuc, tahmini bayt)
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def make_key(domain: str, canonical: str, params: Optional[Dict[str, Any]] = None) -> str:
+        return json.dumps(
+            {"domain": domain, "expression": canonical, "params": params or {}},
+            sort_keys=True,
+            default=str,
+        )
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        copied = result.model_copy()
+        copied.metadata = dict(result.metadata) if result.metadata is not None else None
+        return copied
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._copy(entry[0])
+
+    def set(self, key: str, result: Any) -> None:
+        if not self.enabled:
+            return
+        size = len(result.model_dump_json())
+        if size > self.max_item_bytes:
+            return
+        result = self._copy(result)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,337 @@
+"""Safe AST based arithmetic evaluator (Gemini'ye gitmeden yerel hesaplama)"""
+
+import ast
+import math
+import operator
+import re
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from src.utils.exceptions import (
+    CalculationError,
+    InvalidInputError,
+    UnsupportedExpressionError,
+)
+
+Number = Union[int, float, Fraction, Decimal]
+
+# Desteklenen sayi modlari
+MODES = ("float", "fraction", "decimal")
+
+# Decimal modunda sabitler icin yeterli hassasiyet (context prec = 28)
+_PI_DIGITS = "3.14159265358979323846264338327950288419716939937510"
+_E_DIGITS = "2.71828182845904523536028747135266249775724709369995"
+
+_BIN_OPS: Dict[type, Tuple[str, Callable[[Any, Any], Any]]] = {
+    ast.Add: ("+", operator.add),
+    ast.Sub: ("-", operator.sub),
+    ast.Mult: ("*", operator.mul),
+    ast.Div: ("/", operator.truediv),
+    ast.FloorDiv: ("//", operator.floordiv),
+    ast.Mod: ("%", operator.mod),
+    ast.Pow: ("^", operator.pow),
+}
+
+_UNARY_OPS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+_REPLACEMENTS = (
+    ("×", "*"),
+    ("÷", "/"),
+    ("−", "-"),
+    ("π", "pi"),
+    ("^", "**"),
+)
+
+_SQRT_SYMBOL = re.compile(r"√\s*(\d+(?:\.\d+)?|[a-z]+)")
+
+
+def _is_exact_square(value: int) -> bool:
+    return value >= 0 and math.isqrt(value) ** 2 == value
+
+
+class SafeEvaluator:
+    """eval() kullanmadan saf aritmetik ifadeleri degerlendirir.
+
+    Sadece sayilar, + - * / // % ^, bilinen fonksiyonlar (sqrt, log, trig...)
+    ve pi/e/tau sabitleri desteklenir. Diger her sey
+    UnsupportedExpressionError firlatir, boylece cagiran taraf Gemini'ye
+    devredebilir.
+    """
+
+    MAX_EXPONENT = 10_000
+    MAX_FACTORIAL = 1_000
+    # Tam sayi/kesir sonuclarin en fazla basamak sayisi (str() siniri 4300)
+    MAX_DIGITS = 4_000
+
+    def __init__(self, mode: str = "float"):
+        if mode not in MODES:
+            raise InvalidInputError(
+                f"Gecersiz sayi modu: {mode} (desteklenenler: {', '.join(MODES)})"
+            )
+        self.mode = mode
+        self.steps: List[str] = []
+        self._source = ""
+
+        self.constants: Dict[str, Callable[[], Number]] = {
+            "pi": lambda: self._constant(math.pi, _PI_DIGITS),
+            "e": lambda: self._constant(math.e, _E_DIGITS),
+            "tau": lambda: self._constant(math.tau, None),
+        }
+
+        self.functions: Dict[str, Callable[..., Number]] = {
+            "sqrt": self._sqrt,
+            "abs": abs,
+            "round": lambda x, n=0: round(x, int(n)) if n else round(x),
+            "floor": math.floor,
+            "ceil": math.ceil,
+            "factorial": self._factorial,
+            "exp": self._exp,
+            "ln": self._ln,
+            "log": self._log,
+            "log10": self._log10,
+            "log2": lambda x: self._log(x, 2),
+            "sin": self._wrap_float(math.sin),
+            "cos": self._wrap_float(math.cos),
+            "tan": self._wrap_float(math.tan),
+            "asin": self._wrap_float(math.asin),
+            "acos": self._wrap_float(math.acos),
+            "atan": self._wrap_float(math.atan),
+            "sinh": self._wrap_float(math.sinh),
+            "cosh": self._wrap_float(math.cosh),
+            "tanh": self._wrap_float(math.tanh),
+        }
+
+    # ============================================================
+    # PUBLIC API
+    # ============================================================
+    def evaluate(self, expression: str) -> Tuple[Number, List[str]]:
+        """Ifadeyi degerlendirir ve (sonuc, adimlar) dondurur."""
+        self.steps = []
+        source = self.normalize(expression)
+        self._source = source
+
+        try:
+            tree = ast.parse(source, mode="eval")
+        except (SyntaxError, ValueError) as e:
+            raise UnsupportedExpressionError(f"Ifade parse edilemedi: {e}")
+
+        try:
+            value = self._visit(tree.body)
+        except ZeroDivisionError:
+            raise CalculationError("Sifira bolme hatasi")
+        except OverflowError:
+            raise CalculationError("Sayisal tasma: sonuc cok buyuk")
+        except (ValueError, InvalidOperation) as e:
+            raise CalculationError(f"Tanim kumesi hatasi: {e}")
+        except RecursionError:
+            raise UnsupportedExpressionError("Ifade cok derin ic ice")
+
+        if not self.steps:
+            self.steps.append(f"Sonuc: {self.format_number(value)}")
+        return value, self.steps
+
+    @staticmethod
+    def normalize(expression: str) -> str:
+        """Kullanici yazimini Python aritmetik sozdizimine cevirir."""
+        text = expression.strip().lower()
+        text = _SQRT_SYMBOL.sub(r"sqrt(\1)", text)
+        for old, new in _REPLACEMENTS:
+            text = text.replace(old, new)
+        return text.rstrip("=").strip()
+
+    @staticmethod
+    def format_number(value: Number) -> str:
+        """Adimlarda gosterilecek sayi formati"""
+        if isinstance(value, float):
+            return f"{value:.12g}"
+        return str(value)
+
+    # ============================================================
+    # AST WALK
+    # ============================================================
+    def _visit(self, node: ast.AST) -> Number:
+        if isinstance(node, ast.Constant):
+            return self._literal(node)
+
+        if isinstance(node, ast.Name):
+            if node.id in self.constants:
+                return self.constants[node.id]()
+            raise UnsupportedExpressionError(f"Bilinmeyen sembol: {node.id}")
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            return _UNARY_OPS[type(node.op)](self._visit(node.operand))
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+            left = self._visit(node.left)
+            right = self._visit(node.right)
+            symbol, func = _BIN_OPS[type(node.op)]
+
+            if symbol == "/":
+                value = self._divide(left, right)
+            elif symbol == "^":
+                value = self._power(left, right)
+            else:
+                value = func(left, right)
+            self._check_size(value)
+
+            self.steps.append(
+                f"{self.format_number(left)} {symbol} "
+                f"{self.format_number(right)} = {self.format_number(value)}"
+            )
+            return value
+
+        if isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in self.functions
+                or node.keywords
+            ):
+                raise UnsupportedExpressionError("Desteklenmeyen fonksiyon cagrisi")
+
+            name = node.func.id
+            args = [self._visit(arg) for arg in node.args]
+            try:
+                value = self.functions[name](*args)
+            except TypeError:
+                raise UnsupportedExpressionError(f"{name} icin gecersiz arguman sayisi")
+            self._check_size(value)
+
+            arg_text = ", ".join(self.format_number(a) for a in args)
+            self.steps.append(f"{name}({arg_text}) = {self.format_number(value)}")
+            return value
+
+        raise UnsupportedExpressionError(
+            f"Desteklenmeyen ifade tipi: {type(node).__name__}"
+        )
+
+    # ============================================================
+    # NUMBER HANDLING
+    # ============================================================
+    def _literal(self, node: ast.Constant) -> Number:
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise UnsupportedExpressionError("Sadece sayisal sabitler desteklenir")
+        self._check_size(value)
+        if self.mode == "float" or isinstance(value, int):
+            return Fraction(value) if self.mode == "fraction" else (
+                Decimal(value) if self.mode == "decimal" else value
+            )
+
+        # Kesin modlarda ondalik sayi float'a yuvarlanmadan yazildigi metinden kurulur
+        # (1.0000000000000000001 float'ta 1.0 olur)
+        text = (ast.get_source_segment(self._source, node) or repr(value)).replace("_", "")
+        return Fraction(text) if self.mode == "fraction" else Decimal(text)
+
+    def _check_size(self, value: Number) -> None:
+        """Cok buyuk tam sayi/kesir sonuclari (formatlanamaz) reddeder"""
+        if isinstance(value, Fraction):
+            bits = max(value.numerator.bit_length(), value.denominator.bit_length())
+        elif isinstance(value, int):
+            bits = value.bit_length()
+        else:
+            return
+        if bits * math.log10(2) > self.MAX_DIGITS:
+            raise UnsupportedExpressionError(
+                f"Sonuc cok buyuk (maksimum {self.MAX_DIGITS} basamak)"
+            )
+
+    def _constant(self, approx: float, digits: Union[str, None]) -> Number:
+        if self.mode == "decimal":
+            return +Decimal(digits) if digits else Decimal(repr(approx))
+        return approx
+
+    def _to_mode(self, value: float) -> Number:
+        """Float sonucu aktif moda geri cevirir (fraction modunda float kalir)"""
+        if self.mode == "decimal":
+            return Decimal(repr(value))
+        return value
+
+    def _wrap_float(self, func: Callable[[float], float]) -> Callable[[Number], Number]:
+        return lambda x: self._to_mode(func(float(x)))
+
+    def _divide(self, left: Number, right: Number) -> Number:
+        if right == 0:
+            raise ZeroDivisionError
+        if isinstance(left, int) and isinstance(right, int) and left % right == 0:
+            return left // right
+        return left / right
+
+    def _power(self, base: Number, exponent: Number) -> Number:
+        if abs(exponent) > self.MAX_EXPONENT and abs(base) not in (0, 1):
+            raise CalculationError(
+                f"Us cok buyuk (maksimum {self.MAX_EXPONENT})"
+            )
+        if isinstance(base, (int, Fraction)) and abs(base) not in (0, 1):
+            # Sonuc hesaplanmadan basamak sayisi tahmin edilir (3^10000 ~ 4772 basamak)
+            largest = max(abs(Fraction(base).numerator), Fraction(base).denominator)
+            if float(abs(exponent)) * math.log10(largest) > self.MAX_DIGITS:
+                raise UnsupportedExpressionError(
+                    f"Sonuc cok buyuk (maksimum {self.MAX_DIGITS} basamak)"
+                )
+        if isinstance(base, Fraction) and isinstance(exponent, Fraction):
+            if exponent.denominator == 1:
+                return base ** exponent.numerator
+            value = float(base) ** float(exponent)
+        else:
+            value = base ** exponent
+        if isinstance(value, complex):
+            raise ValueError("negatif sayinin kesirli kuvveti")
+        return value
+
+    def _sqrt(self, x: Number) -> Number:
+        if x < 0:
+            raise ValueError("negatif sayinin karekoku")
+        if isinstance(x, Decimal):
+            return x.sqrt()
+        if isinstance(x, Fraction):
+            if _is_exact_square(x.numerator) and _is_exact_square(x.denominator):
+                return Fraction(math.isqrt(x.numerator), math.isqrt(x.denominator))
+            return math.sqrt(x)
+        if isinstance(x, int) and _is_exact_square(x):
+            return math.isqrt(x)
+        return math.sqrt(x)
+
+    def _factorial(self, x: Number) -> Number:
+        if x != int(x) or x < 0:
+            raise ValueError("faktoriyel sadece negatif olmayan tam sayilar icin")
+        if x > self.MAX_FACTORIAL:
+            raise CalculationError(
+                f"Faktoriyel argumani cok buyuk (maksimum {self.MAX_FACTORIAL})"
+            )
+        return math.factorial(int(x))
+
+    def _exp(self, x: Number) -> Number:
+        if isinstance(x, Decimal):
+            return x.exp()
+        return math.exp(x)
+
+    def _ln(self, x: Number) -> Number:
+        if isinstance(x, Decimal):
+            if x <= 0:
+                raise ValueError("log sadece pozitif sayilar icin")
+            return x.ln()
+        return math.log(x)
+
+    def _log10(self, x: Number) -> Number:
+        if isinstance(x, Decimal):
+            if x <= 0:
+                raise ValueError("log sadece pozitif sayilar icin")
+            return x.log10()
+        return math.log10(x)
+
+    def _log(self, x: Number, base: Union[Number, None] = None) -> Number:
+        """log(x) dogal logaritma, log(x, taban) verilen tabanda"""
+        if base is None:
+            return self._ln(x)
+        if isinstance(x, Decimal) or isinstance(base, Decimal):
+            return self._ln(Decimal(x)) / self._ln(Decimal(base))
+        return math.log(x, base)
+
+
+def evaluate_expression(expression: str, mode: str = "float") -> Tuple[Number, List[str]]:
+    """Kisa yol: SafeEvaluator(mode).evaluate(expression)"""
+    return SafeEvaluator(mode).evaluate(expression)
@@ -31,7 +31,8 @@ class CommandParser:
             "plot", "graph", "çiz", "draw", "grafik"
         ],
         "financial": [
-            "npv", "irr", "loan", "interest", "faiz", "kredi"
+            "npv", "irr", "loan", "interest", "faiz", "kredi",
+            "amortization", "amortisman", "mortgage", "taksit"
         ],
     }
 
@@ -0,0 +1,212 @@
+"""Content-addressed, persistent plot cache"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class PlotCache:
+    """Disk uzerinde, toplam bayta gore LRU sinirli grafik cache'i.
+
+    Anahtar: normalize edilmis ifade + aralik + stil bilgisinin SHA-256 ozeti.
+    Dosya adi anahtarin kendisidir (<ozet>.png), boylece ayni grafik hangi
+    process'te istenirse istensin ayni dosyaya denk gelir. Indeks (dosya
+    adlari, boyut, erisim zamani, sonuc bilgisi) ayni dizindeki SQLite
+    dosyasindadir ve baslangicta diskle uzlastirilir.
+
+    get/put disk ve SQLite islemi yapar; event loop'tan asyncio.to_thread ile
+    cagrilmalidir. Indekse girmeyen dosyalar (cizim hatasi, boyut siniri)
+    discard ile silinir.
+    """
+
+    INDEX_NAME = "index.sqlite3"
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024, enabled: bool = True):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.enabled:
+            self._connect()
+            self._reconcile()
+
+    def _connect(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.directory / self.INDEX_NAME), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS plots (
+                key TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                files TEXT NOT NULL DEFAULT '[]',
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(plots)")}
+        if "files" not in columns:
+            # Eski indeks: dosya listesi yok, sadece ana dosya bilinir
+            self._conn.execute("ALTER TABLE plots ADD COLUMN files TEXT NOT NULL DEFAULT '[]'")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_plots_accessed ON plots(accessed_at)")
+        self._conn.commit()
+
+    def _reconcile(self) -> None:
+        """Dosyasi silinmis indeks kayitlarini temizler"""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, filename FROM plots").fetchall()
+            missing = [(key,) for key, filename in rows if not (self.directory / filename).is_file()]
+            if missing:
+                self._conn.executemany("DELETE FROM plots WHERE key = ?", missing)
+                self._conn.commit()
+                logger.info(f"Plot cache: dropped {len(missing)} index entries without files")
+
+    # ============================================================
+    # KEY
+    # ============================================================
+    @staticmethod
+    def make_key(expression: str, x_range: Any, style: Optional[Dict[str, Any]] = None) -> str:
+        """Normalize ifade + aralik + stilden stabil anahtar (hash() gibi tuzlanmaz)"""
+        payload = json.dumps(
+            {
+                "expression": expression,
+                "range": [repr(float(v)) for v in x_range],
+                "style": style or {},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, suffix: str = ".png") -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    # ============================================================
+    # GET / PUT
+    # ============================================================
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Kayitli sonuc bilgisini dondurur; dosya yoksa kaydi silip None"""
+        if not self.enabled or self._conn is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename, payload FROM plots WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or not (self.directory / row[0]).is_file():
+                if row is not None:
+                    self._conn.execute("DELETE FROM plots WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE plots SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[1])
+
+    def put(self, key: str, paths: Union[Path, Sequence[Path]], payload: Dict[str, Any]) -> None:
+        """Yazilmis dosyalari indekse ekler ve gerekirse LRU eviction yapar.
+
+        paths: ana dosya (ilk) ve yan dosyalar (ornek: <ozet>.npz veri
+        dosyasi); hepsinin adi indekse yazilir ve boyutu sayilir. Sinira
+        sigmayan kayit indekse girmez, dosyalari silinir.
+        """
+        paths = [Path(paths)] if isinstance(paths, (str, Path)) else [Path(p) for p in paths]
+        if not self.enabled or self._conn is None:
+            return
+
+        names = list(dict.fromkeys(p.name for p in paths))
+        size = sum(f.stat().st_size for f in self._existing(names))
+        if size > self.max_bytes:
+            self.discard(key, paths)
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plots (key, filename, files, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, names[0], json.dumps(names), json.dumps(payload, ensure_ascii=False, default=str),
+                 size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def discard(self, key: str, paths: Sequence[Path]) -> None:
+        """Indekse girmemis dosyalari siler (yarim kalan cizim, sigmayan kayit)"""
+        with self._lock:
+            if self._conn is not None and self._conn.execute(
+                "SELECT 1 FROM plots WHERE key = ?", (key,)
+            ).fetchone():
+                return
+        for path in paths:
+            Path(path).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Toplam boyut sinira inene kadar en eski erisilen grafikleri siler"""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM plots").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, filename, files, size FROM plots ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale = []
+        for key, filename, files, size in rows:
+            if total <= self.max_bytes:
+                break
+            for file in self._existing(json.loads(files) or [filename]):
+                file.unlink(missing_ok=True)
+            stale.append((key,))
+            total -= size
+
+        self._conn.executemany("DELETE FROM plots WHERE key = ?", stale)
+
+    def _existing(self, names: Sequence[str]) -> List[Path]:
+        return [path for path in (self.directory / name for name in names) if path.is_file()]
+
+    # ============================================================
+    # MAINTENANCE
+    # ============================================================
+    def stats(self) -> Dict[str, Any]:
+        entries, total = 0, 0
+        if self._conn is not None:
+            with self._lock:
+                entries, total = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM plots"
+                ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,137 @@
+"""Token-bucket rate limiter with a concurrency limit for Gemini calls"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+class RateLimiter:
+    """Token-bucket hız sınırlayıcı + eşzamanlı istek sınırı.
+
+    - Dakikada `calls_per_minute` token dolar, kova en fazla `burst` token tutar.
+      Böylece kota varken `burst` kadar istek aynı anda çıkabilir.
+    - Token rezervasyonu kilitsiz ve senkron yapılır: her çağıran geliş
+      sırasına göre bir zaman dilimi alır (FIFO) ve kimse uyurken kilit tutmaz.
+    - `max_concurrency` verilirse aynı anda uçuşta olan istek sayısı sınırlanır.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: int,
+        burst: int = 1,
+        max_concurrency: Optional[int] = None,
+    ):
+        if calls_per_minute <= 0:
+            raise ValueError("calls_per_minute pozitif olmali")
+
+        self.rate = calls_per_minute / 60.0  # token / saniye
+        self.capacity = max(1, burst)
+        self.max_concurrency = max_concurrency
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+
+        # Gözlemlenebilirlik
+        self.waiting = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+
+    # ============================================================
+    # TOKEN BUCKET
+    # ============================================================
+    def _reserve(self) -> float:
+        """Bir token rezerve eder, beklenmesi gereken süreyi döndürür"""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.capacity), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= 1.0
+
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def _refund(self) -> None:
+        self._tokens = min(float(self.capacity), self._tokens + 1.0)
+
+    async def acquire(self) -> float:
+        """Bir token alır (gerekirse sırasını bekler). Beklenen süreyi döndürür."""
+        delay = self._reserve()
+        started = time.monotonic()
+
+        if delay > 0:
+            self.waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._refund()
+                raise
+            finally:
+                self.waiting -= 1
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.last_wait = waited
+        return waited
+
+    # ============================================================
+    # CONCURRENCY SLOT
+    # ============================================================
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Token + eşzamanlılık slotu alır; blok bitince slot serbest kalır.
+
+        Kullanım:
+            async with limiter.slot():
+                await model.generate_content_async(...)
+        """
+        await self.acquire()
+
+        if self._semaphore is not None:
+            started = time.monotonic()
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            waited = time.monotonic() - started
+            self.total_wait += waited
+            self.last_wait += waited
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    # ============================================================
+    # STATS
+    # ============================================================
+    @property
+    def queue_depth(self) -> int:
+        """Şu anda token veya slot bekleyen çağrı sayısı"""
+        return self.waiting
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "acquired": self.acquired,
+            "last_wait": self.last_wait,
+            "average_wait": self.average_wait,
+            "tokens_available": max(0.0, self._tokens),
+        }
@@ -0,0 +1,251 @@
+"""Range-indexed sample tiles for incremental re-plotting"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.sampling import (
+    INITIAL_POINTS,
+    MAX_DEPTH,
+    MAX_POINTS,
+    TOLERANCE,
+    estimate_scale,
+    value_scale,
+    finish_samples,
+    sample_interval,
+)
+
+# (x, y, mutlak hata toleransi)
+Tile = Tuple[np.ndarray, np.ndarray, float]
+
+
+class SampleTileCache:
+    """Derlenmis ifade basina, araliga gore indekslenmis ornek karolari.
+
+    Sayi dogrusu her seviyede 2**level genislikli karolara bolunur; bir gorunum
+    genisliginin 1/TILES_PER_VIEW'una en yakin (altindaki) seviyeyi kullanir.
+    Kaydirmada (pan) ortusen karolar aynen yeniden kullanilir, sadece yeni
+    karolar orneklenir. Yakinlastirma/uzaklastirmada yeni seviyenin karolari
+    diger seviyelerdeki noktalarla tohumlanir; yalnizca kapsanmayan ya da
+    seyrek kalan kisimlar hesaplanir.
+
+    Hata toleransi gorunumun y olcegine goredir ve karoyla birlikte saklanir;
+    daha duz bir bolgeye yakinlasinca (tolerans yarinin altina inince) karo
+    yetersiz sayilip kendi noktalariyla tohumlanarak inceltilir. Tohum
+    araliklari sadece ayni ya da daha ince seviyede, yeterli toleransla kontrol
+    edilmis komsu noktalar arasindaysa yeniden kontrol edilmez. Karo izgarasi
+    her karoda farkli (deterministik) titrestirilir; boylece periyodik
+    fonksiyonlar ikili (dyadic) izgarayla ortusup (aliasing) duz gorunmez.
+    Bellek toplam nokta sayisina gore LRU ile sinirlidir.
+    """
+
+    TILES_PER_VIEW = 8
+    # Karo basina kaba izgara ve degerlendirme butcesi (gorunumde en fazla ~17 karo)
+    POINTS_PER_TILE = 5
+    # Ic izgara noktalarinin en fazla kaydirilacagi aralik orani
+    JITTER = 0.25
+    _GOLDEN = (math.sqrt(5) - 1) / 2
+    # Karonun toleransi istenenin bu katina kadar kabul edilir
+    TOLERANCE_SLACK = 2.0
+    TILE_BUDGET = MAX_POINTS // TILES_PER_VIEW
+    # Karo sinirlari tam sayilara / 0'a denk gelmesin (ornek: 1/x)
+    PHASE = 1e-7 * math.sqrt(2)
+
+    def __init__(self, max_points: int = 1_000_000):
+        self.max_points = max_points
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._tiles: "OrderedDict[Tuple[str, int, int], Tile]" = OrderedDict()
+        self._points = 0
+
+    # ============================================================
+    # KARO GEOMETRISI
+    # ============================================================
+    @classmethod
+    def level_for(cls, a: float, b: float) -> int:
+        return math.floor(math.log2((b - a) / cls.TILES_PER_VIEW))
+
+    @classmethod
+    def bounds(cls, level: int, index: int) -> Tuple[float, float]:
+        width = 2.0 ** level
+        return (index + cls.PHASE) * width, (index + 1 + cls.PHASE) * width
+
+    @classmethod
+    def grid(cls, level: int, index: int) -> np.ndarray:
+        """Karonun kaba izgarasi: uclar sabit, ic noktalar dusuk-tutarsizlikli dizi ile kaydirilir"""
+        low, high = cls.bounds(level, index)
+        n = cls.POINTS_PER_TILE
+        j = np.arange(1, n - 1)
+        u = ((index * (n - 2) + level * 7919 + j) * cls._GOLDEN) % 1.0 - 0.5
+        grid = np.linspace(low, high, n)
+        grid[1:-1] += 2 * cls.JITTER * u * (high - low) / (n - 1)
+        return grid
+
+    @classmethod
+    def indices(cls, level: int, a: float, b: float) -> range:
+        width = 2.0 ** level
+        return range(math.floor(a / width - cls.PHASE), math.ceil(b / width - cls.PHASE))
+
+    # ============================================================
+    # ORNEKLEME
+    # ============================================================
+    def sample(
+        self, key: str, f: Callable[[np.ndarray], np.ndarray], a: float, b: float
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        """[a, b] gorunumunu karolardan birlestirir; eksik karolari ornekler.
+
+        Returns:
+            (x, y, {"samples", "rounds", "discontinuities", "tiles", "reused_tiles"});
+            samples bu istekte yapilan yeni degerlendirme sayisidir (olcek
+            tahmini ve gorunum uclari dahil).
+        """
+        if not (np.isfinite(a) and np.isfinite(b)) or a >= b:
+            raise ValueError(f"Gecersiz aralik: [{a}, {b}]")
+
+        samples, rounds, reused = 0, 0, 0
+        scale = self._known_scale(key, a, b)
+        if scale is None:
+            scale = estimate_scale(f, a, b)
+            samples += INITIAL_POINTS
+        eps = TOLERANCE * scale
+        level = self.level_for(a, b)
+        indices = self.indices(level, a, b)
+        parts: List[Tile] = []
+
+        for index in indices:
+            tile = self._get((key, level, index))
+            if tile is not None and tile[2] <= eps * self.TOLERANCE_SLACK:
+                reused += 1
+            else:
+                low, high = self.bounds(level, index)
+                x, y, info = sample_interval(
+                    f, low, high, self.POINTS_PER_TILE, self.TILE_BUDGET, scale,
+                    seed=self._seed(key, low, high, eps, level),
+                    grid=self.grid(level, index),
+                )
+                tile = (x, y, eps)
+                samples += info["samples"]
+                rounds = max(rounds, info["rounds"])
+                self._put((key, level, index), tile)
+            parts.append(tile)
+
+        # Gorunum karo sinirlarina hizali degil: uclar ayrica hesaplanir
+        x = np.concatenate([p[0] for p in parts])
+        y = np.concatenate([p[1] for p in parts])
+        inside = (x > a) & (x < b)
+        ends = np.array([a, b])
+        y_ends = f(ends)
+        x = np.concatenate([ends[:1], x[inside], ends[1:]])
+        y = np.concatenate([y_ends[:1], y[inside], y_ends[1:]])
+        samples += 2
+        x, unique = np.unique(x, return_index=True)
+        y = y[unique]
+
+        min_width = 2.0 ** level / (self.POINTS_PER_TILE - 1) / 2 ** MAX_DEPTH
+        x, y, breaks = finish_samples(x, y, min_width, TOLERANCE)
+        return x, y, {
+            "samples": int(samples),
+            "rounds": rounds,
+            "discontinuities": breaks,
+            "tiles": len(indices),
+            "reused_tiles": reused,
+        }
+
+    def _known_scale(self, key: str, a: float, b: float) -> Optional[float]:
+        """Gorunumu kaba izgara sikliginda kapsayan bilinen noktalar varsa onlardan y olcegi"""
+        x, y, _ = self._seed(key, a, b, np.inf, thin=False)
+        spacing = (b - a) / (INITIAL_POINTS - 1)
+        if x.size < INITIAL_POINTS or np.max(np.diff(np.concatenate([[a], x, [b]]))) > spacing:
+            return None
+        return value_scale(y)
+
+    def _seed(
+        self, key: str, low: float, high: float, eps: float,
+        level: Optional[int] = None, thin: bool = True,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Ayni ifadenin karolarindan [low, high] icine dusen bilinen noktalar.
+
+        Ucuncu dizi her noktanin kendi karosundaki kontrol edilmis komsusudur
+        (sonraki x). Sadece level'dan ince ya da esit seviyede ve yeterince siki
+        toleransla orneklenmis karolarin komsulugu guvenilirdir; digerleri NaN
+        (degerler kullanilir ama araliklar yeniden kontrol edilir).
+        """
+        xs, ys, nexts = [], [], []
+        with self._lock:
+            for (tile_key, tile_level, _), (x, y, tile_eps) in self._tiles.items():
+                if tile_key != key or x[-1] < low or x[0] > high:
+                    continue
+                inside = np.flatnonzero((x >= low) & (x <= high))
+                following = np.full(inside.size, np.nan)
+                if tile_eps <= eps * self.TOLERANCE_SLACK and (level is None or tile_level <= level):
+                    following[:-1] = x[inside[1:]]
+                xs.append(x[inside])
+                ys.append(y[inside])
+                nexts.append(following)
+        if not xs:
+            return np.empty(0), np.empty(0), np.empty(0)
+
+        # Ayni nokta birden fazla karoda olabilir; komsusu bilinen kopya tercih edilir
+        x, y, following = np.concatenate(xs), np.concatenate(ys), np.concatenate(nexts)
+        order = np.lexsort((np.isnan(following), x))
+        x, y, following = x[order], y[order], following[order]
+        first = np.concatenate([[True], np.diff(x) > 0])
+        x, y, following = x[first], y[first], following[first]
+        if not thin:
+            return x, y, following
+        # Guvenilmeyen tohumlarin her araligi yeniden kontrol edilir; karonun bir
+        # kosesindeki sik tohumlar butceyi tuketip geri kalani kaba birakmasin
+        untrusted = np.flatnonzero(np.isnan(following))
+        stride = math.ceil(untrusted.size / (self.TILE_BUDGET // 8)) if untrusted.size else 1
+        keep = np.ones(x.size, dtype=bool)
+        keep[untrusted] = False
+        keep[untrusted[::stride]] = True
+        x, y, following = x[keep], y[keep], following[keep]
+        # Uzaklastirmada ince karolar butceyi asmasin; seyreltilen noktalarin
+        # komsulari artik ornekte olmadigindan araliklari yeniden kontrol edilir
+        stride = max(1, math.ceil(x.size / (self.TILE_BUDGET // 2)))
+        return x[::stride], y[::stride], following[::stride]
+
+    # ============================================================
+    # LRU
+    # ============================================================
+    def _get(self, tile_key: Tuple[str, int, int]) -> Any:
+        with self._lock:
+            tile = self._tiles.get(tile_key)
+            if tile is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(tile_key)
+            self.hits += 1
+            return tile
+
+    def _put(self, tile_key: Tuple[str, int, int], tile: Tile) -> None:
+        with self._lock:
+            old = self._tiles.pop(tile_key, None)
+            if old is not None:
+                self._points -= old[0].size
+            self._tiles[tile_key] = tile
+            self._points += tile[0].size
+            while self._points > self.max_points and len(self._tiles) > 1:
+                _, (x, _, _) = self._tiles.popitem(last=False)
+                self._points -= x.size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "tiles": len(self._tiles),
+            "points": self._points,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+            self._points = 0
@@ -0,0 +1,65 @@
+"""Single-flight coalescing of identical in-flight async calls"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class _Call:
+    """Uçuştaki tek bir ortak çağrı ve onu bekleyenlerin sayısı"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Aynı anahtarla eşzamanlı gelen çağrıları tek bir görevde birleştirir.
+
+    İlk çağıran görevi başlatır, sonrakiler aynı görevin sonucunu bekler.
+    Hata tüm bekleyenlere iletilir. Bir bekleyenin iptal edilmesi ortak
+    görevi durdurmaz; ancak bekleyen kalmazsa görev de iptal edilir.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.deduplicated = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, call))
+        else:
+            self.deduplicated += 1
+            logger.info(f"Single-flight: joined in-flight request ({self.deduplicated} deduplicated)")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # İptal edilen görev hemen unutulur; aynı anahtarla yeni gelen
+                # çağrı iptal olmakta olan göreve katılmaz, yenisini başlatır
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Kimse beklemiyorsa "exception was never retrieved" uyarısını engelle
+        if not call.task.cancelled():
+            call.task.exception()
@@ -1,7 +1,8 @@
+import argparse
 import asyncio
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # Proje root'unu Python path'ine ekle
 project_root = Path(__file__).parent.parent
@@ -9,18 +10,23 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from src.core.agent import GeminiAgent
+from src.core.batch import run_batch
 from src.core.parser import CommandParser
 from src.core.validator import InputValidator
 from src.config.settings import settings
+from src.modules.base_module import local_result_cache_stats, step_listener
+from src.schemas.models import CalculationResult
+from src.utils.expressions import expression_cache_stats
+from src.utils.helpers import format_result_for_display
 from src.utils.logger import setup_logger
 
 # Modülleri içe aktar (Henüz olmayanları yorum satırı yapabilirsiniz)
 from src.modules.basic_math import BasicMathModule
-# from src.modules.calculus import CalculusModule
-# from src.modules.linear_algebra import LinearAlgebraModule
-# from src.modules.financial import FinancialModule
-# from src.modules.equation_solver import EquationSolverModule
-# from src.modules.graph_plotter import GraphPlotterModule
+from src.modules.calculus import CalculusModule
+from src.modules.linear_algebra import LinearAlgebraModule
+from src.modules.financial import FinancialModule
+from src.modules.equation_solver import EquationSolverModule
+from src.modules.graph_plotter import GraphPlotterModule
 
 from src.utils.exceptions import (
     CalculationError,
@@ -53,40 +59,114 @@ class CalculatorAgent:
         # Dosyaları oluşturdukça yorum satırlarını açabilirsiniz.
         self.modules = {
             "basic_math": BasicMathModule(self.gemini_agent),
-            # "calculus": CalculusModule(self.gemini_agent),
-            # "linear_algebra": LinearAlgebraModule(self.gemini_agent),
-            # "financial": FinancialModule(self.gemini_agent),
-            # "equation_solver": EquationSolverModule(self.gemini_agent),
-            # "graph_plotter": GraphPlotterModule(self.gemini_agent),
+            "calculus": CalculusModule(self.gemini_agent),
+            "linear_algebra": LinearAlgebraModule(self.gemini_agent),
+            "financial": FinancialModule(self.gemini_agent),
+            "equation_solver": EquationSolverModule(self.gemini_agent),
+            "graph_plotter": GraphPlotterModule(self.gemini_agent),
         }
 
         logger.info("Calculator Agent başlatıldı")
 
-    async def process_command(self, user_input: str) -> Optional[str]:
-        """Kullanıcı komutunu işler"""
-        try:
-            # Komutu parse et (Hangi modül? Hangi işlem?)
-            module_name, expression = self.parser.parse(user_input)
-            
-            # Güvenlik kontrolü
-            self.validator.sanitize_expression(expression)
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tüm cache'lerin hit/miss sayaçları ve hit oranları"""
+        return {
+            "response": self.gemini_agent.response_cache.stats(),
+            "local_result": local_result_cache_stats(),
+            **self.modules["graph_plotter"].cache_stats(),
+            "expression": expression_cache_stats(),
+        }
+
+    def format_cache_stats(self) -> str:
+        lines = ["📊 Cache İstatistikleri:"]
+        for name, stats in self.cache_stats().items():
+            lookups = stats["hits"] + stats["misses"]
+            lines.append(
+                f"  {name:<13} {stats['hits']}/{lookups} isabet (%{stats['hit_rate'] * 100:.1f})"
+            )
+        return "\n".join(lines)
+
+    def _route(self, user_input: str) -> Tuple[str, str]:
+        """Komutu parse edip (modül adı, ifade) döndürür"""
+        # Komutu parse et (Hangi modül? Hangi işlem?)
+        module_name, expression = self.parser.parse(user_input)
+
+        # Güvenlik kontrolü
+        self.validator.sanitize_expression(expression)
+
+        # Modül var mı kontrol et
+        if module_name not in self.modules:
+            # Eğer parser bir modül buldu ama bizde yüklü değilse basic_math'e yönlendir (Fallback)
+            if "basic_math" in self.modules:
+                module_name = "basic_math"
+            else:
+                raise ModuleNotFoundError(f"Modül bulunamadı: {module_name}")
+        return module_name, expression
+
+    async def evaluate(self, user_input: str) -> CalculationResult:
+        """Komutu çalıştırır ve yapılandırılmış sonucu döndürür (hataları fırlatır)"""
+        module_name, expression = self._route(user_input)
+        logger.info(f"Processing: {module_name} - {expression}")
 
-            # Modül var mı kontrol et
-            if module_name not in self.modules:
-                # Eğer parser bir modül buldu ama bizde yüklü değilse basic_math'e yönlendir (Fallback)
-                if "basic_math" in self.modules:
-                    module_name = "basic_math"
-                else:
-                    raise ModuleNotFoundError(f"Modül bulunamadı: {module_name}")
+        # Hesaplamayı yap
+        return await self.modules[module_name].calculate(expression)
 
+    async def evaluate_many(self, user_inputs: List[str]) -> List[Union[CalculationResult, Exception]]:
+        """Birden çok komutu aynı modüle düşenleri gruplayarak çalıştırır.
+
+        Her grup tek `calculate_many` çağrısıyla işlenir; yerel çözülemeyenler
+        paketlenmiş Gemini çağrılarına gider. Sonuçlar girdiyle aynı sıradadır;
+        hata veren komutun yerinde istisna nesnesi döner.
+        """
+        results: List[Union[CalculationResult, Exception, None]] = [None] * len(user_inputs)
+        groups: Dict[str, List[Tuple[int, str]]] = {}
+        for i, user_input in enumerate(user_inputs):
+            try:
+                module_name, expression = self._route(user_input)
+                self.modules[module_name].validate_input(expression)
+            except Exception as e:
+                results[i] = e
+                continue
+            groups.setdefault(module_name, []).append((i, expression))
+
+        async def run_group(module_name: str, items: List[Tuple[int, str]]) -> None:
             module = self.modules[module_name]
-            logger.info(f"Processing: {module_name} - {expression}")
+            logger.info(f"Processing {len(items)} expressions together: {module_name}")
+            try:
+                outputs = await module.calculate_many([expression for _, expression in items])
+            except Exception:
+                # Bir ifadenin hatası grubun diğerlerini düşürmesin
+                outputs = await asyncio.gather(
+                    *(module.calculate(expression) for _, expression in items), return_exceptions=True
+                )
+            for (i, _), output in zip(items, outputs):
+                results[i] = output
+
+        await asyncio.gather(*(run_group(name, items) for name, items in groups.items()))
+        return results
+
+    async def process_command(
+        self,
+        user_input: str,
+        on_step: Optional[Callable[[str], Any]] = None,
+    ) -> Optional[str]:
+        """Kullanıcı komutunu işler
+
+        on_step verilirse Gemini yanıtı stream edilir ve adımlar geldikçe
+        bu fonksiyona iletilir; zaten gösterilen adımlar çıktıda tekrarlanmaz.
+        """
+        streamed = []
+
+        def relay(step: str) -> None:
+            streamed.append(step)
+            on_step(step)
+
+        token = step_listener.set(relay if on_step else None)
+        try:
+            result = await self.evaluate(user_input)
 
-            # Hesaplamayı yap
-            result = await module.calculate(expression)
-            
             # Sonucu formatla ve döndür
-            return self._format_output(result)
+            return self._format_output(result, include_steps=not streamed)
 
         except SecurityViolationError as e:
             return f"❌ Güvenlik Hatası: {e}"
@@ -99,8 +179,10 @@ class CalculatorAgent:
         except Exception as e:
             logger.error(f"Unexpected error: {e}", exc_info=True)
             return f"💥 Beklenmeyen Hata: {e}"
+        finally:
+            step_listener.reset(token)
 
-    def _format_output(self, result) -> str:
+    def _format_output(self, result, include_steps: bool = True) -> str:
         """Sonucu kullanıcı dostu ve şık bir formatta gösterir"""
         output = []
         separator = "=" * 50
@@ -112,13 +194,13 @@ class CalculatorAgent:
         # 1. Sonuç Kısmı
         if result.result:
             # Eğer sonuç çok uzunsa veya liste ise düzgün göster
-            res_str = str(result.result)
+            res_str = format_result_for_display(result.result)
             output.append(f"🎯 Sonuç: {res_str}")
         else:
             output.append("ℹ️  Sonuç: (Bilgi/Sohbet yanıtı)")
 
         # 2. Adımlar Kısmı
-        if result.steps:
+        if include_steps and result.steps:
             output.append("\n📝 Adımlar:")
             for i, step in enumerate(result.steps, start=1):
                 clean_step = str(step).strip()
@@ -130,9 +212,12 @@ class CalculatorAgent:
 
         # 4. Görsel Veri (Grafik vs.)
         if result.visual_data and "plot_paths" in result.visual_data:
-            png = result.visual_data["plot_paths"].get("png")
-            if png:
-                output.append(f"\n📈 Grafik Oluşturuldu: {png}")
+            paths = result.visual_data["plot_paths"]
+            figure = paths.get("png") or paths.get("svg")
+            if figure:
+                output.append(f"\n📈 Grafik Oluşturuldu: {figure}")
+            elif paths.get("data"):
+                output.append(f"\n📈 Grafik Verisi: {paths['data']}")
 
         output.append(separator)
         return "\n".join(output)
@@ -144,7 +229,8 @@ async def interactive_mode():
     print("\n" + "=" * 60)
     print(f"🤖 AI AGENT BAŞLATILDI - v{APP_VERSION}")
     print("=" * 60)
-    print("Çıkmak için 'q', 'quit' veya 'exit' yazabilirsiniz.\n")
+    print("Çıkmak için 'q', 'quit' veya 'exit' yazabilirsiniz.")
+    print("Cache isabet oranları için 'stats' yazabilirsiniz.\n")
 
     while True:
         try:
@@ -157,10 +243,25 @@ async def interactive_mode():
             if not user_input:
                 continue
 
+            if user_input.lower() in ["stats", "istatistik"]:
+                print(agent.format_cache_stats())
+                continue
+
             # İşleniyor mesajı (isteğe bağlı, yavaş bağlantılarda iyi olur)
             print("⏳ Düşünüyor...", end="\r")
-            
-            result = await agent.process_command(user_input)
+
+            # Adımlar Gemini'den geldikçe canlı olarak gösterilir
+            streamed_count = 0
+
+            def show_step(step: str) -> None:
+                nonlocal streamed_count
+                if streamed_count == 0:
+                    print(" " * 20, end="\r")
+                    print("📝 Adımlar:")
+                streamed_count += 1
+                print(f"  {streamed_count}. {step.strip()}", flush=True)
+
+            result = await agent.process_command(user_input, on_step=show_step)
             
             # Satırı temizle
             print(" " * 20, end="\r")
@@ -181,10 +282,83 @@ async def single_command_mode(expression: str):
     if result:
         print(result)
 
+async def batch_mode(
+    input_path: str,
+    out_path: str,
+    concurrency: int,
+    order: str,
+    resume: bool,
+    group_size: int = 8,
+):
+    """Toplu mod: JSONL/CSV dosyasındaki ifadeleri eşzamanlı işler"""
+    agent = CalculatorAgent()
+    stats = await run_batch(
+        agent,
+        input_path,
+        out_path,
+        concurrency=concurrency,
+        ordered=(order == "input"),
+        resume=resume,
+        group_size=group_size,
+    )
+    print(
+        f"✅ Toplu işlem tamamlandı: {stats['processed']} işlendi, "
+        f"{stats['skipped']} atlandı (checkpoint), {stats['failed']} hatalı → {out_path}"
+    )
+
+
+def _parse_batch_args(args) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="calculator-agent", description="Toplu hesaplama modu")
+    parser.add_argument("--batch", required=True, help="Girdi dosyası (.jsonl veya .csv)")
+    parser.add_argument("--out", help="Çıktı dosyası (varsayılan: <girdi>.results.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Aynı anda işlenecek ifade sayısı")
+    parser.add_argument(
+        "--order",
+        choices=["input", "completion"],
+        default="input",
+        help="Sonuçları girdi sırasına göre veya tamamlanma sırasına göre yaz",
+    )
+    parser.add_argument(
+        "--group-size",
+        type=int,
+        default=8,
+        help="Aynı modüle düşen ifadeleri en fazla bu kadarlık gruplar halinde birlikte işle",
+    )
+    parser.add_argument("--no-resume", action="store_true", help="Checkpoint'i yok say, baştan başla")
+    parsed = parser.parse_args(args)
+
+    if parsed.concurrency < 1:
+        parser.error("--concurrency en az 1 olmalı")
+    if parsed.group_size < 1:
+        parser.error("--group-size en az 1 olmalı")
+    if not parsed.out:
+        parsed.out = str(Path(parsed.batch).with_suffix(".results.jsonl"))
+    return parsed
+
+
 def main():
     """Ana giriş noktası"""
-    if len(sys.argv) > 1:
-        expression = " ".join(sys.argv[1:])
+    args = sys.argv[1:]
+
+    # --no-cache: kalıcı yanıt cache'ini bu çalıştırma için devre dışı bırakır
+    if "--no-cache" in args:
+        args.remove("--no-cache")
+        settings.RESPONSE_CACHE_ENABLED = False
+
+    if "--batch" in args:
+        batch_args = _parse_batch_args(args)
+        asyncio.run(
+            batch_mode(
+                batch_args.batch,
+                batch_args.out,
+                batch_args.concurrency,
+                batch_args.order,
+                resume=not batch_args.no_resume,
+                group_size=batch_args.group_size,
+            )
+        )
+    elif args:
+        expression = " ".join(args)
         asyncio.run(single_command_mode(expression))
     else:
         asyncio.run(interactive_mode())
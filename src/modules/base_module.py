@@ -1,23 +1,100 @@
 """Abstract base class for all calculation modules"""
 
+import asyncio
+import multiprocessing
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Union
 from src.schemas.models import CalculationResult
+from src.config.prompts import PACKED_PROMPT
+from src.config.settings import settings
 from src.core.agent import GeminiAgent
+from src.core.cache import LocalResultCache
 from src.core.validator import InputValidator
+from src.utils.exceptions import UnsupportedExpressionError
+from src.utils.expressions import canonical_key
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Ayarlanırsa Gemini çağrıları stream edilir ve her adım geldikçe bu fonksiyona verilir.
+# ContextVar olduğu için eşzamanlı istekler birbirinin dinleyicisini görmez.
+step_listener: ContextVar[Optional[Callable[[str], Any]]] = ContextVar(
+    "step_listener", default=None
+)
+
+# Yerel motorların (SymPy vb.) CPU-yoğun işleri event loop'u bloklamasın diye
+# paylaşılan worker havuzunda çalışır.
+_local_executor = ThreadPoolExecutor(
+    max_workers=settings.LOCAL_ENGINE_WORKERS, thread_name_prefix="local-engine"
+)
+
+# Zaman aşımında thread durdurulamaz; SymPy gibi patlayabilen işler (x^(10^9) açılımı,
+# devasa faktöriyel...) ayrı süreçlerde çalışır ve zaman aşımında süreçler öldürülür.
+_local_processes: Optional[ProcessPoolExecutor] = None
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _local_processes
+    if _local_processes is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            # Çok thread'li süreçten fork güvenli değil; forkserver SymPy'yi bir kez yükler
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["sympy", __name__])
+        else:
+            context = multiprocessing.get_context("spawn")
+        _local_processes = ProcessPoolExecutor(
+            max_workers=settings.LOCAL_ENGINE_WORKERS, mp_context=context
+        )
+    return _local_processes
+
+
+def _recycle_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Havuzdaki süreçleri sonlandırır; sonraki iş yeni havuzda çalışır"""
+    global _local_processes
+    if _local_processes is pool:
+        _local_processes = None
+    # ProcessPoolExecutor çalışan işi iptal edemez; süreçler doğrudan sonlandırılır
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Yerel motor sonuçları kanonik ifadeye göre tüm modüllerce paylaşılır (domain anahtarda)
+_local_results = LocalResultCache(
+    max_entries=settings.LOCAL_RESULT_CACHE_SIZE,
+    enabled=settings.LOCAL_RESULT_CACHE_ENABLED,
+    max_bytes=settings.LOCAL_RESULT_CACHE_MAX_BYTES,
+    max_item_bytes=settings.LOCAL_RESULT_CACHE_MAX_ITEM_BYTES,
+)
+
+
+def local_result_cache_stats() -> Dict[str, Any]:
+    return _local_results.stats()
+
+
 # 1. DÜZELTME: ABC sınıfından miras almalı
 class BaseModule(ABC):
     """Tüm hesaplama modülleri için abstract base class"""
+
+    # Sonuçlarda kullanılan domain adı
+    DOMAIN: str = ""
+    # Birden fazla ifade tek Gemini çağrısında paketlenebilir mi?
+    SUPPORTS_PACKING: bool = True
+    # Paketlemede ifade başına ayrılan tahmini çıktı token'ı
+    PACK_TOKENS_PER_ITEM: int = settings.PACK_TOKENS_PER_ITEM
+    # Cache anahtarında toplama/çarpma terimleri sıralanabilir mi? (matrislerde hayır)
+    COMMUTATIVE_KEYS: bool = True
     
     def __init__(self, gemini_agent: GeminiAgent):
         """Modül başlatır"""
         self.gemini_agent = gemini_agent
         self.validator = InputValidator()
         self.domain_prompt = self._get_domain_prompt()
+        # Hangi yolun (yerel motor / Gemini) kac istege hizmet ettigi
+        self.engine_stats: Dict[str, int] = {"local": 0, "gemini": 0}
 
     # 2. DÜZELTME: Çöp kodlar temizlendi ve @abstractmethod eklendi
     @abstractmethod
@@ -36,13 +113,196 @@ class BaseModule(ABC):
         self.validator.validate_length(expression)
         return True
     
+    async def _calculate_local(self, expression: str, **kwargs) -> Optional[CalculationResult]:
+        """Yerel motor kancası. Gemini'siz çözülemiyorsa None döndürür."""
+        return None
+
+    def _cache_key(self, expression: str) -> str:
+        """Eşdeğer yazımların paylaştığı kanonik ifade (cache anahtarları için)"""
+        return canonical_key(expression, commutative=self.COMMUTATIVE_KEYS)
+
+    def _local_cache_key(self, expression: str, **kwargs) -> Optional[str]:
+        """Yerel sonuç cache anahtarı; None ise sonuç cache'lenmez"""
+        return LocalResultCache.make_key(self.DOMAIN, self._cache_key(expression), kwargs)
+
+    async def _calculate_local_cached(
+        self, expression: str, **kwargs
+    ) -> Optional[CalculationResult]:
+        """_calculate_local'ı kanonik ifadeye göre bellek içi cache üzerinden çağırır"""
+        key = self._local_cache_key(expression, **kwargs)
+        if key is not None:
+            cached = _local_results.get(key)
+            if cached is not None:
+                logger.info("Local result cache hit")
+                cached.metadata = {**(cached.metadata or {}), "cache": "hit"}
+                return cached
+
+        result = await self._calculate_local(expression, **kwargs)
+        if result is not None and key is not None:
+            _local_results.set(key, result)
+        return result
+
+    async def _run_local(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        isolated: bool = False,
+    ) -> Any:
+        """Senkron yerel hesaplamayı worker'da, zaman aşımıyla çalıştırır.
+
+        isolated=True: iş ayrı bir süreçte çalışır (func ve argümanlar
+        pickle'lanabilir olmalı); zaman aşımında süreç havuzu öldürülüp
+        yenilenir, böylece takılan işler worker'ları tüketmez.
+        Zaman aşımında UnsupportedExpressionError fırlatır; çağıran Gemini'ye düşer.
+        """
+        timeout = timeout or settings.LOCAL_ENGINE_TIMEOUT_SECONDS
+        loop = asyncio.get_running_loop()
+        executor = _process_pool() if isolated else _local_executor
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(executor, func, *args), timeout)
+        except asyncio.TimeoutError:
+            if isolated:
+                _recycle_process_pool(executor)
+            raise UnsupportedExpressionError(
+                f"Yerel hesaplama {timeout:.1f} sn içinde bitmedi"
+            )
+        except BrokenProcessPool:
+            # Aynı havuzdaki başka bir iş zaman aşımına uğrayıp süreçler öldürüldü
+            _recycle_process_pool(executor)
+            raise UnsupportedExpressionError("Yerel hesaplama süreci sonlandırıldı")
+
+    def _mark_engine(self, result: CalculationResult, engine: str) -> CalculationResult:
+        """Sonucu ureten yolu metadata'ya yazar ve sayaci arttirir"""
+        self.engine_stats[engine] = self.engine_stats.get(engine, 0) + 1
+        result.metadata = {**(result.metadata or {}), "engine": engine}
+        return result
+
+    @property
+    def local_hit_rate(self) -> float:
+        """Yerel motorun karsiladigi isteklerin orani (0.0 - 1.0)"""
+        total = sum(self.engine_stats.values())
+        return self.engine_stats.get("local", 0) / total if total else 0.0
+
     async def _call_gemini(self, expression: str, **prompt_kwargs) -> Any:
         """Gemini API'yi çağırır. Return type Dict veya List olabilir."""
         prompt = self.domain_prompt.format(
             expression=expression,
             **prompt_kwargs
         )
-        return await self.gemini_agent.generate_json_response(prompt)
+        # Yanıt cache'i eşdeğer yazımlar için aynı anahtarı kullanır
+        cache_prompt = self.domain_prompt.format(
+            expression=self._cache_key(expression),
+            **prompt_kwargs
+        )
+        listener = step_listener.get()
+        if listener is not None:
+            return await self.gemini_agent.stream_json_response(
+                prompt, on_step=listener, cache_prompt=cache_prompt
+            )
+        return await self.gemini_agent.generate_json_response(prompt, cache_prompt=cache_prompt)
+
+    # ============================================================
+    # PROMPT PACKING (Çoklu ifade tek Gemini çağrısı)
+    # ============================================================
+    async def calculate_many(
+        self, expressions: List[str], **kwargs
+    ) -> List[CalculationResult]:
+        """Aynı domain'deki birden çok ifadeyi hesaplar.
+
+        Önce yerel motor denenir; kalanlar K'lık paketler halinde tek
+        Gemini çağrısıyla çözülür (K, MAX_OUTPUT_TOKENS'a göre ayarlanır).
+        Pakette eksik veya bozuk gelen ifadeler tek tek yeniden denenir.
+        Sonuçlar girdiyle aynı sıradadır.
+        """
+        for expression in expressions:
+            self.validate_input(expression)
+
+        if not self.SUPPORTS_PACKING or not self.domain_prompt:
+            return list(
+                await asyncio.gather(*(self.calculate(e, **kwargs) for e in expressions))
+            )
+
+        results: List[Optional[CalculationResult]] = [None] * len(expressions)
+        remaining: List[int] = []
+
+        local_results = await asyncio.gather(
+            *(self._calculate_local_cached(e, **kwargs) for e in expressions)
+        )
+        for i, local_result in enumerate(local_results):
+            if local_result is not None:
+                results[i] = self._mark_engine(local_result, "local")
+            else:
+                remaining.append(i)
+
+        k = self.gemini_agent.pack_size(self.PACK_TOKENS_PER_ITEM)
+        chunks = [remaining[i:i + k] for i in range(0, len(remaining), k)]
+        logger.info(
+            f"Packing {len(remaining)} expressions into {len(chunks)} Gemini calls (K={k})"
+        )
+
+        packed = await asyncio.gather(
+            *(self._call_gemini_packed([expressions[i] for i in chunk], **kwargs) for chunk in chunks)
+        )
+
+        retry: List[int] = []
+        for chunk, items in zip(chunks, packed):
+            for position, i in enumerate(chunk):
+                item = items[position]
+                if item is None:
+                    retry.append(i)
+                    continue
+                result = self._create_result(item, self.DOMAIN)
+                result.metadata = {**(result.metadata or {}), "packed": len(chunk)}
+                results[i] = self._mark_engine(result, "gemini")
+
+        if retry:
+            logger.info(f"Retrying {len(retry)} packed items individually")
+            retried = await asyncio.gather(
+                *(self.calculate(expressions[i], **kwargs) for i in retry)
+            )
+            for i, result in zip(retry, retried):
+                results[i] = result
+
+        return results
+
+    async def _call_gemini_packed(
+        self, expressions: List[str], **prompt_kwargs
+    ) -> List[Optional[Dict[str, Any]]]:
+        """K ifadeyi tek JSON-dizisi prompt'unda gönderir.
+
+        Her ifade için geçerli obje ya da (eksik/bozuksa) None döndürür.
+        """
+        if len(expressions) == 1:
+            response = await self._call_gemini(expressions[0], **prompt_kwargs)
+            return [response if self._is_valid_item(response) else None]
+
+        def packed_prompt(items: List[str]) -> str:
+            listing = "\n" + "\n".join(f"[{i}] {e}" for i, e in enumerate(items))
+            return PACKED_PROMPT.format(
+                domain_prompt=self.domain_prompt.format(expression=listing, **prompt_kwargs),
+                count=len(items),
+                last_index=len(items) - 1,
+            )
+
+        items = await self.gemini_agent.generate_json_array(
+            packed_prompt(expressions),
+            cache_prompt=packed_prompt([self._cache_key(e) for e in expressions]),
+        )
+
+        matched: List[Optional[Dict[str, Any]]] = [None] * len(expressions)
+        for position, item in enumerate(items):
+            if not self._is_valid_item(item):
+                continue
+            index = item.get("index", position)
+            if isinstance(index, int) and 0 <= index < len(expressions) and matched[index] is None:
+                matched[index] = item
+        return matched
+
+    @staticmethod
+    def _is_valid_item(item: Any) -> bool:
+        """Paket içindeki bir öğe kullanılabilir bir sonuç mu?"""
+        return isinstance(item, dict) and "result" in item and "error" not in item
     
     # 3. DÜZELTME: Liste/Dict ayrımı yapan akıllı fonksiyon
     def _create_result(
@@ -1,8 +1,12 @@
 """Basic math module for Calculator Agent"""
 
+from typing import Optional
+
+from src.core.evaluator import SafeEvaluator
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import BASIC_MATH_PROMPT
+from src.utils.exceptions import UnsupportedExpressionError
 from src.utils.logger import setup_logger
 
 
@@ -28,20 +32,59 @@ def safe_divide(a:float, b: float) -> float:
 
 class BasicMathModule(BaseModule):
     """Temel matematik modulu"""
+
+    DOMAIN = "basic_math"
     
     def _get_domain_prompt(self) -> str:
         """Basic math prompt'unu dondurur"""
         return BASIC_MATH_PROMPT
     
+    async def _calculate_local(
+        self,
+        expression: str,
+        mode: str = "float",
+        **kwargs
+    ) -> Optional[CalculationResult]:
+        """Saf aritmetik ifadeleri Gemini'ye gitmeden hesaplar.
+
+        Ifade yerel olarak islenemiyorsa None dondurur.
+        """
+        try:
+            value, steps = SafeEvaluator(mode).evaluate(expression)
+        except UnsupportedExpressionError as e:
+            logger.info(f"Local evaluator skipped: {e}")
+            return None
+
+        metadata = {"mode": mode}
+        if mode == "float" or isinstance(value, float):
+            try:
+                result_value = float(value)
+            except OverflowError:
+                result_value = str(value)
+        else:
+            # Tam (exact) modlarda sonucu string olarak koruyoruz
+            result_value = str(value)
+            metadata["numeric"] = float(value)
+
+        return CalculationResult(
+            result=result_value,
+            steps=steps,
+            confidence_score=1.0,
+            domain="basic_math",
+            metadata=metadata,
+        )
+
     async def calculate(
         self,
         expression: str,
+        mode: str = "float",
         **kwargs
     ) -> CalculationResult:
         """Temel matematik islemi yapar
         
         Args:
             expression: Hesaplanacak ifade
+            mode: Sayi modu ("float", "fraction" veya "decimal")
             **kwargs: Ek parametreler
             
         Returns:
@@ -52,8 +95,15 @@ class BasicMathModule(BaseModule):
         logger.info(f"Basic math calculation: {expression}")
         
         try:
+            local_result = await self._calculate_local_cached(expression, mode=mode)
+            if local_result is not None:
+                logger.info(f"Calculation successful (local): {local_result.result}")
+                return self._mark_engine(local_result, "local")
+
             response = await self._call_gemini(expression)
-            result = self._create_result(response, "basic_math")
+            result = self._mark_engine(
+                self._create_result(response, "basic_math"), "gemini"
+            )
             
             
             if isinstance(result.result, (int, float)) and "*" in expression:
@@ -1,8 +1,14 @@
 """Calculus module for Calculator Agent"""
 
+import math
+import re
+from typing import Any, Dict, Optional
+
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import CALCULUS_PROMPT
+from src.utils.exceptions import UnsupportedExpressionError
+from src.utils.expressions import parse_expression
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -17,12 +23,221 @@ def _get_symp():
     return sympy
 
 
+# ============================================================
+# KOMUT KALIPLARI (parser'in buraya yonlendirdigi bicimler)
+# ============================================================
+_DERIVATIVE = re.compile(
+    r"^(?:(?P<nth>second|2nd|third|3rd)\s+)?(?:derivative|türev|turev|diff)\s+(?:of\s+)?"
+    r"(?P<expr>.+?)"
+    r"(?:\s+(?:wrt|with respect to)\s+(?P<var>[a-z]))?"
+    r"(?:\s+at\s+(?:(?P<pvar>[a-z])\s*=\s*)?(?P<point>\S+))?$"
+)
+_INTEGRAL = re.compile(
+    r"^(?:integral|integrate|∫)\s+(?:of\s+)?(?P<expr>.+?)"
+    r"(?:\s+d(?P<var>[a-z]))?"
+    r"(?:\s+from\s+(?P<a>\S+)\s+to\s+(?P<b>\S+))?$"
+)
+_LIMIT = re.compile(
+    r"^(?:limit|lim)\s+(?:of\s+)?(?P<expr>.+?)\s*(?:,|\s+as|\s+when)?\s+"
+    r"(?P<var>[a-z])\s*(?:->|→|to)\s*(?P<point>\S+)$"
+)
+_TAYLOR = re.compile(
+    r"^(?:taylor(?:\s+series)?|series|seri)\s+(?:of\s+)?(?P<expr>.+?)"
+    r"(?:\s+(?:at|around)\s+(?:(?P<var>[a-z])\s*=\s*)?(?P<point>\S+))?"
+    r"(?:\s+(?:order|n)\s*=?\s*(?P<order>\d+))?$"
+)
+
+_NTH = {"second": 2, "2nd": 2, "third": 3, "3rd": 3}
+
+
+def parse_calculus_command(expression: str) -> Optional[Dict[str, Any]]:
+    """derivative/integral/limit/taylor komutunu parcalarina ayirir.
+
+    Taninmayan bicimde None dondurur (Gemini'ye devredilir).
+    """
+    text = " ".join(expression.strip().lower().split())
+
+    match = _DERIVATIVE.match(text)
+    if match:
+        return {
+            "operation": "derivative",
+            "expr": match["expr"],
+            "var": match["var"] or match["pvar"],
+            "point": match["point"],
+            "order": _NTH.get(match["nth"] or "", 1),
+        }
+
+    match = _INTEGRAL.match(text)
+    if match:
+        return {
+            "operation": "integral",
+            "expr": match["expr"],
+            "var": match["var"],
+            "bounds": (match["a"], match["b"]) if match["a"] else None,
+        }
+
+    match = _LIMIT.match(text)
+    if match:
+        point, direction = match["point"], "+-"
+        if len(point) > 1 and point[-1] in "+-":
+            point, direction = point[:-1], point[-1]
+        return {
+            "operation": "limit",
+            "expr": match["expr"],
+            "var": match["var"],
+            "point": point,
+            "direction": direction,
+        }
+
+    match = _TAYLOR.match(text)
+    if match:
+        return {
+            "operation": "taylor",
+            "expr": match["expr"],
+            "var": match["var"],
+            "point": match["point"] or "0",
+            "order": int(match["order"] or 6),
+        }
+
+    return None
+
+
+# ============================================================
+# SEMBOLIK MOTOR (worker thread'de calisir)
+# ============================================================
+def _pick_variable(expr: Any, name: Optional[str]) -> Any:
+    sympy = _get_symp()
+    if name:
+        return sympy.Symbol(name)
+    free = sorted(expr.free_symbols, key=str)
+    for symbol in free:
+        if str(symbol) == "x":
+            return symbol
+    return free[0] if free else sympy.Symbol("x")
+
+
+def _numeric(value: Any) -> Optional[float]:
+    """Sembolik degerin sonlu reel sayisal karsiligi (yoksa None)"""
+    try:
+        if not value.is_number:
+            return None
+        number = complex(value.evalf())
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if abs(number.imag) > 1e-12 or not math.isfinite(number.real):
+        return None
+    return number.real
+
+
+def _ensure_evaluated(value: Any) -> Any:
+    sympy = _get_symp()
+    if value.has(sympy.Integral, sympy.Limit, sympy.Derivative, sympy.nan, sympy.zoo):
+        raise UnsupportedExpressionError("SymPy kapali formda cozemedi")
+    return value
+
+
+def solve_calculus_command(command: Dict[str, Any]) -> Dict[str, Any]:
+    """Ayristirilmis komutu SymPy ile cozer; result/steps/metadata dondurur"""
+    sympy = _get_symp()
+    expr = parse_expression(command["expr"])
+    var = _pick_variable(expr, command.get("var"))
+    operation = command["operation"]
+    steps = [f"f({var}) = {expr}"]
+    point_value = None
+
+    if operation == "derivative":
+        order = command["order"]
+        symbolic = _ensure_evaluated(sympy.diff(expr, var, order))
+        prefix = f"d/d{var}" if order == 1 else f"d^{order}/d{var}^{order}"
+        steps.append(f"{prefix} [{expr}] = {symbolic}")
+        exact = symbolic
+        if command["point"]:
+            point_value = parse_expression(command["point"])
+            exact = sympy.simplify(symbolic.subs(var, point_value))
+            steps.append(f"{var} = {point_value} icin: {exact}")
+
+    elif operation == "integral":
+        bounds = command["bounds"]
+        antiderivative = _ensure_evaluated(sympy.integrate(expr, var))
+        steps.append(f"∫ {expr} d{var} = {antiderivative} + C")
+        exact = antiderivative
+        if bounds:
+            a = parse_expression(bounds[0])
+            b = parse_expression(bounds[1])
+            exact = _ensure_evaluated(sympy.integrate(expr, (var, a, b)))
+            steps.append(f"[{antiderivative}] {a} → {b} = {exact}")
+
+    elif operation == "limit":
+        point_value = parse_expression(command["point"])
+        exact = _ensure_evaluated(
+            sympy.limit(expr, var, point_value, dir=command["direction"])
+        )
+        arrow = "" if command["direction"] == "+-" else command["direction"]
+        steps.append(f"lim {var}→{point_value}{arrow} {expr} = {exact}")
+
+    elif operation == "taylor":
+        point_value = parse_expression(command["point"])
+        order = command["order"]
+        exact = sympy.series(expr, var, point_value, order).removeO()
+        steps.append(
+            f"{var} = {point_value} etrafinda {order}. dereceye kadar Taylor acilimi: {exact}"
+        )
+
+    else:
+        raise UnsupportedExpressionError(f"Bilinmeyen islem: {operation}")
+
+    numeric = _numeric(exact)
+    if numeric is not None and not exact.is_Integer:
+        steps.append(f"Sayisal deger ≈ {numeric:.12g}")
+
+    if numeric is not None:
+        result: Any = numeric
+    elif operation == "integral" and not command["bounds"]:
+        result = f"{exact} + C"
+    else:
+        result = str(exact)
+
+    return {
+        "result": result,
+        "steps": steps,
+        "metadata": {
+            "operation": operation,
+            "variable": str(var),
+            "exact": str(exact),
+            "numeric": numeric,
+        },
+    }
+
+
 class CalculusModule(BaseModule):
     """Kalkulus modulu (limit, turev, integral, seri)"""
+
+    DOMAIN = "calculus"
     
     def _get_domain_prompt(self) -> str:
         """Calculus prompt'unu dondurur"""
         return CALCULUS_PROMPT
+
+    async def _calculate_local(self, expression: str, **kwargs) -> Optional[CalculationResult]:
+        """Komutu SymPy ile worker'da cozer; parse/cozum basarisizsa None"""
+        command = parse_calculus_command(expression)
+        if command is None:
+            return None
+
+        try:
+            solved = await self._run_local(solve_calculus_command, command, isolated=True)
+        except Exception as e:
+            # SymPy cok cesitli hata tipleri firlatabilir; hepsinde Gemini'ye dus
+            logger.info(f"Local calculus engine skipped: {e}")
+            return None
+
+        return CalculationResult(
+            result=solved["result"],
+            steps=solved["steps"],
+            confidence_score=1.0,
+            domain="calculus",
+            metadata=solved["metadata"],
+        )
     
     async def calculate(
         self,
@@ -38,11 +253,17 @@ class CalculusModule(BaseModule):
         logger.info(f"Calculus calculation: {expression}")
         
         try:
+            # Önce yerel SymPy motoru; çözemezse Gemini
+            local_result = await self._calculate_local_cached(expression)
+            if local_result is not None:
+                logger.info(f"Calculus calculation successful (local): {local_result.result}")
+                return self._mark_engine(local_result, "local")
+
             # Gemini çağrısı
             response = await self._call_gemini(expression)
 
             # CalculationResult oluşturma
-            result = self._create_result(response, "calculus")
+            result = self._mark_engine(self._create_result(response, "calculus"), "gemini")
 
             # derivative / integral özel düzeltmeler
             expr_lower = expression.lower()
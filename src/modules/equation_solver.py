@@ -1,19 +1,291 @@
 """Equation solver module for Calculator Agent"""
 
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
 from src.config.prompts import EQUATION_SOLVER_PROMPT
+from src.config.settings import settings
+from src.utils.exceptions import UnsupportedExpressionError
+from src.utils.expressions import parse_expression
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Kesin (sembolik) cozum aranacak en buyuk sistem boyutu
+MAX_EXACT_SYSTEM_SIZE = 8
+# Sanal kismi bu esigin altindaki kokler reel kabul edilir
+IMAG_TOLERANCE = 1e-9
+
+_LEADING_WORDS = re.compile(r"^(?:solve|çöz|coz|denklem|equation)\s*:?\s*", re.IGNORECASE)
+_TRAILING_VAR = re.compile(r"\s+(?:for|icin|için)\s+[a-z](?:\s*,\s*[a-z])*\s*$", re.IGNORECASE)
+_SYSTEM_SEPARATOR = re.compile(r"\s*(?:;|\band\b|\bve\b)\s*", re.IGNORECASE)
+
+
+# ============================================================
+# SAYISAL CEKIRDEK
+# ============================================================
+def polynomial_roots(coefficients: Any) -> np.ndarray:
+    """Polinom koklerini companion matrisin ozdegerleriyle bulur.
+
+    Args:
+        coefficients: En yuksek dereceden baslayan katsayilar. (n+1,) tek
+            polinom, (m, n+1) ise ayni dereceli m polinom (tek vektorize cagri).
+
+    Returns:
+        (n,) ya da (m, n) kompleks kok dizisi
+
+    Derece EQUATION_MAX_DEGREE'i asarsa (n x n companion matrisi) UnsupportedExpressionError.
+    """
+    coeffs = np.asarray(coefficients)
+    single = coeffs.ndim == 1
+    coeffs = np.atleast_2d(coeffs)
+    _check_degree(coeffs.shape[1] - 1)
+
+    leading = coeffs[:, :1]
+    if np.any(leading == 0):
+        raise ValueError("Bas katsayi sifir olamaz")
+
+    monic = coeffs[:, 1:] / leading
+    m, n = monic.shape
+    if n == 0:
+        roots = np.empty((m, 0), dtype=complex)
+        return roots[0] if single else roots
+
+    companion = np.zeros((m, n, n), dtype=monic.dtype)
+    companion[:, 0, :] = -monic
+    companion[:, np.arange(1, n), np.arange(n - 1)] = 1.0
+
+    roots = np.linalg.eigvals(companion)
+    return roots[0] if single else roots
+
+
+def _check_degree(degree: int) -> None:
+    if degree > settings.EQUATION_MAX_DEGREE:
+        raise UnsupportedExpressionError(
+            f"Polinom derecesi cok yuksek: {degree} > {settings.EQUATION_MAX_DEGREE}"
+        )
+
+
+def _degree_bound(expr: Any) -> int:
+    """Ifadeyi genisletmeden (expand) derecesi icin ust sinir"""
+    if expr.is_Symbol:
+        return 1
+    if expr.is_Atom:
+        return 0
+    if expr.is_Pow:
+        base, exponent = expr.args
+        if exponent.is_Integer:
+            return _degree_bound(base) * abs(int(exponent))
+        return _degree_bound(base)
+    bounds = [_degree_bound(arg) for arg in expr.args]
+    if expr.is_Mul:
+        return sum(bounds)
+    return max(bounds, default=0)
+
+
+def _format_complex(value: complex) -> str:
+    real, imag = value.real, value.imag
+    sign = "+" if imag >= 0 else "-"
+    return f"{real:.10g} {sign} {abs(imag):.10g}i"
+
+
+# ============================================================
+# DENKLEM AYRISTIRMA + YEREL COZUM (worker'da calisir)
+# ============================================================
+def split_equations(expression: str) -> List[str]:
+    """Girdiden 'solve' vb. kelimeleri atar, sistemi denklemlere boler"""
+    text = _LEADING_WORDS.sub("", expression.strip())
+    text = _TRAILING_VAR.sub("", text)
+
+    parts = [p for p in _SYSTEM_SEPARATOR.split(text) if p.strip()]
+    # "2x + y = 5, x - y = 1" bicimi: her parca kendi '=' isaretine sahipse
+    if len(parts) == 1 and text.count("=") > 1:
+        comma_parts = [p for p in text.split(",") if p.strip()]
+        if all("=" in p for p in comma_parts):
+            parts = comma_parts
+    return [p.strip() for p in parts]
+
+
+def _to_zero_form(equation: str) -> Any:
+    """'lhs = rhs' → lhs - rhs (sympy)"""
+    if equation.count("=") > 1:
+        raise UnsupportedExpressionError("Denklemde birden fazla '=' var")
+    if "=" in equation:
+        lhs, rhs = equation.split("=")
+        return parse_expression(lhs) - parse_expression(rhs)
+    return parse_expression(equation)
+
+
+def solve_equations_locally(expression: str) -> Dict[str, Any]:
+    """Dogrusal/polinom denklemleri ve kucuk dogrusal sistemleri cozer.
+
+    Siniflandirilamayan bicimlerde UnsupportedExpressionError firlatir.
+    """
+    import sympy
+
+    equations = split_equations(expression)
+    if not equations:
+        raise UnsupportedExpressionError("Denklem bulunamadi")
+
+    forms = [_to_zero_form(eq) for eq in equations]
+    # (x+1)^20000 gibi ifadeler genisletilmeden reddedilir
+    for form in forms:
+        _check_degree(_degree_bound(form))
+    exprs = [sympy.expand(form) for form in forms]
+    symbols = sorted(set().union(*(e.free_symbols for e in exprs)), key=str)
+
+    if len(exprs) == 1 and len(symbols) <= 1:
+        var = symbols[0] if symbols else sympy.Symbol("x")
+        return _solve_polynomial(exprs[0], var)
+
+    if len(exprs) == len(symbols):
+        return _solve_linear_system(exprs, symbols)
+
+    raise UnsupportedExpressionError("Bilinmeyen sayisi denklem sayisina esit degil")
+
+
+def _solve_polynomial(expr: Any, var: Any) -> Dict[str, Any]:
+    import sympy
+
+    if not expr.is_polynomial(var):
+        raise UnsupportedExpressionError("Polinom olmayan denklem")
+
+    poly = sympy.Poly(expr, var)
+    if not all(c.is_number for c in poly.all_coeffs()):
+        raise UnsupportedExpressionError("Sayisal olmayan katsayi")
+
+    degree = poly.degree()
+    _check_degree(degree)
+    steps = [f"Standart bicim: {poly.as_expr()} = 0", f"Derece: {degree}"]
+
+    if degree <= 0:
+        identity = poly.is_zero
+        steps.append("Her deger cozumdur" if identity else "Cozum yoktur")
+        return {
+            "result": "Sonsuz cozum" if identity else "Cozum yok",
+            "steps": steps,
+            "metadata": {"degree": max(degree, 0), "method": "trivial"},
+        }
+
+    coeffs = poly.all_coeffs()
+    exact_roots: List[Any] = []
+    if all(c.is_rational for c in coeffs):
+        # Derece <= 2 kapali form; daha yuksekte sadece carpanlara ayrilabilen kokler
+        found = sympy.roots(poly, cubics=False, quartics=False, quintics=False)
+        for root, multiplicity in found.items():
+            exact_roots.extend([root] * multiplicity)
+
+    if len(exact_roots) == degree:
+        numeric = np.array([complex(sympy.N(r, 17)) for r in exact_roots])
+        method = "exact"
+        steps.append(f"Kesin kokler: {', '.join(str(r) for r in exact_roots)}")
+    else:
+        numeric = polynomial_roots(np.array([complex(c) for c in coeffs]))
+        method = "companion_matrix"
+        steps.append("Kokler companion matrisin ozdegerleri olarak hesaplandi")
+
+    real = sorted(float(r.real) for r in numeric if abs(r.imag) <= IMAG_TOLERANCE)
+    complex_roots = [r for r in numeric if abs(r.imag) > IMAG_TOLERANCE]
+
+    if complex_roots:
+        result: Any = {
+            "real": real,
+            "complex": [_format_complex(r) for r in complex_roots],
+        }
+    else:
+        result = real
+
+    steps.append(f"{var} = " + ", ".join(
+        [f"{r:.10g}" for r in real] + [_format_complex(r) for r in complex_roots]
+    ))
+
+    return {
+        "result": result,
+        "steps": steps,
+        "metadata": {
+            "degree": degree,
+            "variable": str(var),
+            "method": method,
+            "exact": [str(r) for r in exact_roots],
+        },
+    }
+
+
+def _solve_linear_system(exprs: List[Any], symbols: List[Any]) -> Dict[str, Any]:
+    import sympy
+
+    n = len(symbols)
+    a = np.zeros((n, n))
+    b = np.zeros(n)
+    rows = []
+    for i, expr in enumerate(exprs):
+        poly = sympy.Poly(expr, *symbols)
+        if poly.total_degree() > 1:
+            raise UnsupportedExpressionError("Dogrusal olmayan sistem")
+        row = [poly.coeff_monomial(s) for s in symbols]
+        constant = -poly.coeff_monomial(1)
+        if not all(c.is_number for c in row + [constant]):
+            raise UnsupportedExpressionError("Sayisal olmayan katsayi")
+        rows.append((row, constant))
+        a[i] = [float(c) for c in row]
+        b[i] = float(constant)
+
+    try:
+        solution = np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        raise UnsupportedExpressionError("Sistem tekil (tek cozum yok)")
+
+    steps = [
+        f"Katsayi matrisi A = {a.tolist()}",
+        f"Sabitler b = {b.tolist()}",
+        "A·x = b numpy.linalg.solve ile cozuldu",
+    ]
+
+    exact: Dict[str, str] = {}
+    if n <= MAX_EXACT_SYSTEM_SIZE and all(c.is_rational for row, k in rows for c in row + [k]):
+        matrix = sympy.Matrix([row for row, _ in rows])
+        vector = sympy.Matrix([k for _, k in rows])
+        exact = {str(s): str(v) for s, v in zip(symbols, matrix.LUsolve(vector))}
+        steps.append("Kesin cozum: " + ", ".join(f"{k} = {v}" for k, v in exact.items()))
+
+    result = {str(s): float(v) for s, v in zip(symbols, solution)}
+    steps.append(", ".join(f"{k} = {v:.10g}" for k, v in result.items()))
+
+    return {
+        "result": result,
+        "steps": steps,
+        "metadata": {"method": "linear_system", "size": n, "exact": exact},
+    }
+
 
 class EquationSolverModule(BaseModule):
     """Denklem cozucu modulu"""
+
+    DOMAIN = "equation_solver"
     
     def _get_domain_prompt(self) -> str:
         """Equation solver prompt'unu dondurur"""
         return EQUATION_SOLVER_PROMPT
+
+    async def _calculate_local(self, expression: str, **kwargs) -> Optional[CalculationResult]:
+        """Siniflandirilabilen denklemleri yerel olarak cozer, aksi halde None"""
+        try:
+            solved = await self._run_local(solve_equations_locally, expression, isolated=True)
+        except Exception as e:
+            logger.info(f"Local equation solver skipped: {e}")
+            return None
+
+        return CalculationResult(
+            result=solved["result"],
+            steps=solved["steps"],
+            confidence_score=1.0,
+            domain="equation_solver",
+            metadata=solved["metadata"],
+        )
     
     async def calculate(
         self,
@@ -34,8 +306,15 @@ class EquationSolverModule(BaseModule):
         logger.info(f"Equation solving: {expression}")
         
         try:
+            local_result = await self._calculate_local_cached(expression)
+            if local_result is not None:
+                logger.info(f"Equation solving successful (local): {local_result.result}")
+                return self._mark_engine(local_result, "local")
+
             response = await self._call_gemini(expression)
-            result = self._create_result(response, "basic_math")  # await eksik!
+            result = self._mark_engine(
+                self._create_result(response, "basic_math"), "gemini"
+            )  # await eksik!
    
             
             
@@ -1,7 +1,17 @@
-from decimal import Decimal, getcontext
+"""Financial calculations module for Calculator Agent"""
+
+import re
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP, getcontext
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 from src.modules.base_module import BaseModule
 from src.schemas.models import CalculationResult
-from src.config.prompts import FINANCIAL_PROMPT
+from src.config.prompts import FINANCIAL_PROMPT, FINANCIAL_EXTRACT_PROMPT
+from src.utils import finance
+from src.utils.exceptions import UnsupportedExpressionError
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -9,21 +19,347 @@ logger = setup_logger()
 # Finansal hesaplamalarda yüksek hassasiyet (opsiyonel)
 getcontext().prec = 28
 
+CENT = Decimal("0.01")
+
+# Ayni konumda eslesmede listedeki sira kazanir
+_OPERATIONS = [
+    ("xirr", re.compile(r"\bxirr\b", re.IGNORECASE)),
+    ("irr", re.compile(r"\b(?:irr|ivo|ic verim orani|iç verim oranı)\b", re.IGNORECASE)),
+    ("npv", re.compile(r"\b(?:npv|nbd|net bugunku deger|net bugünkü değer)\b", re.IGNORECASE)),
+    ("amortization", re.compile(r"\b(?:amorti[sz]ation|amortisman|odeme plani|ödeme planı|schedule)\b", re.IGNORECASE)),
+    ("pmt", re.compile(r"\b(?:pmt|loan|kredi|taksit|payment|mortgage)\b", re.IGNORECASE)),
+    ("pv", re.compile(r"\bpv\b", re.IGNORECASE)),
+    ("fv", re.compile(r"\bfv\b", re.IGNORECASE)),
+]
+_LIST = re.compile(r"\[([^\[\]]*)\]")
+_DATE = re.compile(r"^\s*['\"]?(\d{4})-(\d{2})-(\d{2})['\"]?\s*$")
+# "5%" ya da Turkce "%5"; bosluklu "100000 % 2" belirsizdir, oran sayilmaz
+_PERCENT = re.compile(r"(?:(?<![\w.%])(-?\d+(?:\.\d+)?)%(?![\w.%]|,\d)|(?<![\w.%])%(-?\d+(?:\.\d+)?)(?![\w.%]|,\d))")
+_KEY_VALUE = re.compile(
+    r"\b(rate|oran|nper|pmt|pv|fv|principal|anapara|when)\s*=\s*(-?\d+(?:\.\d+)?)(\s*%)?",
+    re.IGNORECASE,
+)
+_YEARS = re.compile(r"(\d+(?:\.\d+)?)\s*(?:years?|yil|yıl)\b", re.IGNORECASE)
+_MONTHS = re.compile(r"(\d+)\s*(?:months?|ay)\b", re.IGNORECASE)
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_ANNUAL_PAYMENTS = re.compile(r"\b(?:annual(?:ly)?|yearly|yillik|yıllık)\b", re.IGNORECASE)
+_EXACT = re.compile(r"\b(?:exact|decimal|kesin)\b", re.IGNORECASE)
+
+# Bunun uzerindeki yillik oranlar (>%100) yanlis ayristirma sayilir; Gemini'ye dusulur
+MAX_ANNUAL_RATE = 1.0
+
+_KEY_ALIASES = {"oran": "rate", "principal": "pv", "anapara": "pv"}
+_REQUIRED = {
+    "npv": ("rate", "cashflows"),
+    "irr": ("cashflows",),
+    "xirr": ("cashflows", "dates"),
+    "pmt": ("rate", "nper", "pv"),
+    "amortization": ("rate", "nper", "pv"),
+    "pv": ("rate", "nper", "pmt"),
+    "fv": ("rate", "nper"),
+}
+
+
+# ============================================================
+# KOMUT AYRISTIRMA
+# ============================================================
+def _parse_list(body: str) -> Optional[List[Any]]:
+    items = [item.strip() for item in body.split(",") if item.strip()]
+    if not items:
+        return None
+    dates = [_DATE.match(item) for item in items]
+    if all(dates):
+        return [date(*(int(g) for g in m.groups())) for m in dates]
+    try:
+        return [float(item) for item in items]
+    except ValueError:
+        return None
+
+
+def _is_complete(command: Dict[str, Any]) -> bool:
+    required = _REQUIRED.get(command.get("operation"), None)
+    if required is None:
+        return False
+    if command["operation"] == "fv" and command.get("pmt") is None and command.get("pv") is None:
+        return False
+    if command.get("rate") is not None and abs(command["rate"]) > MAX_ANNUAL_RATE:
+        return False
+    return all(command.get(key) is not None for key in required)
+
+
+def parse_financial_command(expression: str) -> Optional[Dict[str, Any]]:
+    """Yaygin finans komutlarini regex ile ayristirir.
+
+    Ornekler: "npv 10% [-1000, 300, 400, 500]", "irr [-1000, 300, 400, 500]",
+    "loan 200000 at 5% for 30 years", "fv rate=5% nper=10 pmt=-100".
+    Oranlar yillik, donemsel oran = rate / periods_per_year. "rate=" degeri
+    1'den kucukse ondalik (0.05 → %5), 1 ve ustu ise yuzde okunur (rate=1 → %1,
+    rate=5 → %5); "5%" / "%5" her zaman yuzdedir.
+    Eksik, belirsiz ("100000 % 2", birden fazla oran) ya da %100'u asan
+    oranli komutlarda None doner.
+    """
+    # Ifadede en once gecen anahtar kelime islemi belirler ("fv ... pmt=-100" → fv)
+    found = [(m.start(), name) for name, pattern in _OPERATIONS for m in [pattern.search(expression)] if m]
+    if not found:
+        return None
+    operation = min(found)[1]
+
+    loan = operation in ("pmt", "amortization")
+    command: Dict[str, Any] = {
+        "operation": operation,
+        "periods_per_year": 1 if not loan or _ANNUAL_PAYMENTS.search(expression) else 12,
+    }
+
+    rest = expression
+    for match in _LIST.finditer(expression):
+        values = _parse_list(match.group(1))
+        if values is None:
+            return None
+        key = "dates" if isinstance(values[0], date) else "cashflows"
+        command.setdefault(key, values)
+    rest = _LIST.sub(" ", rest)
+
+    for key, value, percent in _KEY_VALUE.findall(rest):
+        key = _KEY_ALIASES.get(key.lower(), key.lower())
+        number = float(value)
+        if key == "rate" and (percent or number >= 1):
+            number /= 100
+        command[key] = number
+    rest = _KEY_VALUE.sub(" ", rest)
+
+    percents = _PERCENT.findall(rest)
+    rest = _PERCENT.sub(" ", rest)
+    if len(percents) > 1 or "%" in rest:
+        # Hangi sayinin oran, hangisinin tutar oldugu belli degil
+        return None
+    if percents and command.get("rate") is None:
+        command["rate"] = float(percents[0][0] or percents[0][1]) / 100
+
+    if command.get("nper") is None:
+        years = _YEARS.search(rest)
+        months = _MONTHS.search(rest)
+        if years:
+            command["nper"] = float(years.group(1)) * command["periods_per_year"]
+        elif months:
+            command["nper"] = float(months.group(1)) * command["periods_per_year"] / 12
+    rest = _MONTHS.sub(" ", _YEARS.sub(" ", rest))
+
+    # Kalan ilk sayi tutardir (kredi anaparasi)
+    if loan and command.get("pv") is None:
+        amount = _NUMBER.search(rest.replace(",", ""))
+        if amount:
+            command["pv"] = float(amount.group(0))
+
+    return command if _is_complete(command) else None
+
+
+def command_from_params(params: Any) -> Optional[Dict[str, Any]]:
+    """Gemini'nin cikardigi parametreleri dogrulanmis komuta cevirir.
+
+    Oran yalnizca acik "annual_rate_percent" alanindan (yillik yuzde) alinir;
+    yillik mi donemsel mi oldugu belirsiz bir "rate" alani kabul edilmez.
+    """
+    if not isinstance(params, dict) or params.get("operation") not in _REQUIRED:
+        return None
+
+    command: Dict[str, Any] = {"operation": params["operation"]}
+    loan = command["operation"] in ("pmt", "amortization")
+    try:
+        command["periods_per_year"] = int(params.get("periods_per_year") or (12 if loan else 1))
+        if params.get("annual_rate_percent") is not None:
+            command["rate"] = float(params["annual_rate_percent"]) / 100
+        for key in ("nper", "pv", "pmt", "fv"):
+            if params.get(key) is not None:
+                command[key] = float(params[key])
+        if params.get("cashflows"):
+            command["cashflows"] = [float(v) for v in params["cashflows"]]
+        if params.get("dates"):
+            command["dates"] = [date.fromisoformat(str(d)) for d in params["dates"]]
+    except (TypeError, ValueError):
+        return None
+
+    return command if _is_complete(command) else None
+
+
+# ============================================================
+# YEREL HESAPLAMA
+# ============================================================
+def _money(value: float) -> float:
+    return round(float(value), 2)
+
+
+def _quantize(value: Decimal) -> str:
+    return str(value.quantize(CENT, rounding=ROUND_HALF_UP))
+
+
+def solve_financial_command(command: Dict[str, Any], exact: bool = False) -> Dict[str, Any]:
+    """Ayristirilmis komutu NumPy (veya exact=True ise Decimal) ile hesaplar.
+
+    Returns:
+        {"result", "steps", "metadata"}
+    """
+    operation = command["operation"]
+    ppy = command.get("periods_per_year", 1)
+    annual_rate = command.get("rate")
+    rate = annual_rate / ppy if annual_rate is not None else None
+    nper = command.get("nper")
+    if nper is not None:
+        if nper <= 0 or nper != int(nper):
+            raise UnsupportedExpressionError("Donem sayisi pozitif tam sayi olmali")
+        nper = int(nper)
+
+    steps: List[str] = []
+    metadata: Dict[str, Any] = {"operation": operation, "exact": exact}
+
+    if operation == "npv":
+        cashflows = command["cashflows"]
+        steps.append(f"Nakit akislari (t=0..{len(cashflows) - 1}): {cashflows}")
+        steps.append(f"Iskonto orani: {annual_rate:.6g}")
+        steps.append("NPV = sum(CF_t / (1 + r)^t)")
+        if exact:
+            value = finance.npv_decimal(Decimal(str(annual_rate)), cashflows)
+            result: Any = _quantize(value)
+            metadata["numeric"] = float(value)
+        else:
+            result = _money(finance.npv(annual_rate, cashflows))
+        steps.append(f"NPV = {result}")
+
+    elif operation in ("irr", "xirr"):
+        cashflows = command["cashflows"]
+        steps.append(f"Nakit akislari: {cashflows}")
+        if operation == "xirr":
+            dates = command["dates"]
+            steps.append(f"Tarihler: {', '.join(d.isoformat() for d in dates)}")
+            value = finance.xirr(cashflows, dates)
+        else:
+            value = finance.irr(cashflows)
+        if np.isnan(value):
+            raise UnsupportedExpressionError("Nakit akislarinda isaret degisimi yok, IRR bulunamadi")
+        steps.append("NPV(r) = 0 kok araligi izgara ile bulundu, Newton/bisection ile daraltildi")
+        steps.append(f"{operation.upper()} = {value:.10g} (%{value * 100:.4f})")
+        result = float(value)
+        metadata["percent"] = round(value * 100, 6)
+
+    elif operation in ("pmt", "amortization"):
+        principal = command["pv"]
+        steps.append(f"Anapara: {principal}, yillik oran: {annual_rate:.6g}, donem: {nper} ({ppy}/yil)")
+        steps.append("Taksit = P * r / (1 - (1 + r)^-n)")
+        if exact:
+            payment_dec = -finance.pmt_decimal(Decimal(str(annual_rate)) / ppy, nper, principal)
+            payment = float(payment_dec)
+            metadata["payment_exact"] = _quantize(payment_dec)
+        else:
+            payment = -finance.pmt(rate, nper, principal)
+        total = payment * nper
+        metadata.update(
+            {"total_paid": _money(total), "total_interest": _money(total - principal)}
+        )
+        steps.append(f"Donemsel taksit = {_money(payment)}")
+        steps.append(f"Toplam odeme = {_money(total)}, toplam faiz = {_money(total - principal)}")
+
+        if operation == "amortization":
+            schedule = finance.amortization_schedule(principal, rate, nper)
+            result = {
+                "payment": _money(payment),
+                "total_paid": metadata["total_paid"],
+                "total_interest": metadata["total_interest"],
+                "columns": ["period", "payment", "interest", "principal", "balance"],
+                "schedule": np.round(schedule, 2).tolist(),
+            }
+        else:
+            result = metadata.pop("payment_exact", None) or _money(payment)
+
+    else:  # pv / fv
+        pmt = command.get("pmt") or 0.0
+        pv = command.get("pv") or 0.0
+        fv = command.get("fv") or 0.0
+        when = int(command.get("when") or 0)
+        steps.append(f"Oran: {rate:.6g}, donem: {nper}, odeme: {pmt}, when: {when}")
+        if operation == "pv":
+            func, func_exact, args = finance.pv, finance.pv_decimal, (pmt, fv)
+        else:
+            func, func_exact, args = finance.fv, finance.fv_decimal, (pmt, pv)
+        if exact:
+            value = func_exact(Decimal(str(annual_rate)) / ppy, nper, *args, when=when)
+            result = _quantize(value)
+            metadata["numeric"] = float(value)
+        else:
+            result = _money(func(rate, nper, *args, when=when))
+        steps.append(f"{operation.upper()} = {result}")
+
+    return {"result": result, "steps": steps, "metadata": metadata}
+
 
 class FinancialModule(BaseModule):
     """Finansal hesaplama modülü"""
 
+    DOMAIN = "financial"
+
     def _get_domain_prompt(self) -> str:
         return FINANCIAL_PROMPT
 
+    # ============================================================
+    # VEKTORIZE API (cok sayida seri tek cagrida)
+    # ============================================================
+    @staticmethod
+    def npv_many(rate: Any, cashflows: Any) -> np.ndarray:
+        """(m, n) nakit akisi matrisinin NPV'leri; rate skaler veya (m,)"""
+        return np.atleast_1d(finance.npv(rate, cashflows))
+
+    @staticmethod
+    def irr_many(cashflows: Any) -> np.ndarray:
+        """(m, n) nakit akisi matrisinin IRR'lari (kok yoksa NaN)"""
+        return np.atleast_1d(finance.irr(np.atleast_2d(cashflows)))
+
+    def _build_result(
+        self, command: Dict[str, Any], expression: str, currency: str, exact: bool
+    ) -> CalculationResult:
+        solved = solve_financial_command(command, exact=exact or bool(_EXACT.search(expression)))
+        return CalculationResult(
+            result=solved["result"],
+            steps=solved["steps"],
+            confidence_score=1.0,
+            domain="financial",
+            metadata={**solved["metadata"], "currency": currency},
+        )
+
+    async def _calculate_local(
+        self, expression: str, currency: str = "USD", exact: bool = False, **kwargs
+    ) -> Optional[CalculationResult]:
+        """Regex ile ayristirilabilen komutlari yerel olarak hesaplar, aksi halde None"""
+        command = parse_financial_command(expression)
+        if command is None:
+            return None
+        try:
+            return self._build_result(command, expression, currency, exact)
+        except Exception as e:
+            logger.info(f"Local financial engine skipped: {e}")
+            return None
+
+    async def _extract_with_gemini(self, expression: str, currency: str) -> Any:
+        """Dogal dildeki istegin parametrelerini Gemini'ye cikartir (hesaplama yerel).
+
+        Desteklenmeyen islemlerde yanit ("other") tam cozumu de icerir.
+        """
+        prompt = FINANCIAL_EXTRACT_PROMPT.format(expression=expression, currency=currency)
+        cache_prompt = FINANCIAL_EXTRACT_PROMPT.format(
+            expression=self._cache_key(expression), currency=currency
+        )
+        return await self.gemini_agent.generate_json_response(prompt, cache_prompt=cache_prompt)
+
     async def calculate(
         self,
         expression: str,
         currency: str = "USD",
+        exact: bool = False,
         **kwargs
     ) -> CalculationResult:
         """
         Finansal hesaplamaları yapar.
+
+        Sira: regex + yerel motor → Gemini ile parametre cikarimi + yerel motor
+        → (ayni yanittaki) Gemini cozumu → ancak ikisi de kullanilamazsa tam
+        Gemini cagrisi. exact=True (veya ifadede "exact"/"kesin") Decimal kullanir.
         """
 
         self.validate_input(expression)
@@ -31,8 +367,27 @@ class FinancialModule(BaseModule):
         logger.info(f"Financial calculation: {expression}")
 
         try:
-            response = await self._call_gemini(expression, currency=currency)
-            result = self._create_result(response, "financial")
+            local_result = await self._calculate_local_cached(expression, currency=currency, exact=exact)
+            if local_result is not None:
+                logger.info(f"Financial calculation successful (local): {local_result.result}")
+                return self._mark_engine(local_result, "local")
+
+            params = await self._extract_with_gemini(expression, currency)
+            command = command_from_params(params)
+            if command is not None:
+                try:
+                    result = self._build_result(command, expression, currency, exact)
+                    logger.info(f"Financial calculation successful (gemini_parse): {result.result}")
+                    return self._mark_engine(result, "gemini_parse")
+                except UnsupportedExpressionError as e:
+                    logger.info(f"Extracted parameters not computable locally: {e}")
+
+            # Desteklenmeyen islem: cozum ayni yanitta geldiyse ikinci cagri yapilmaz
+            if isinstance(params, dict) and params.get("result") is not None:
+                response = params
+            else:
+                response = await self._call_gemini(expression, currency=currency)
+            result = self._mark_engine(self._create_result(response, "financial"), "gemini")
 
             logger.info(f"Financial calculation successful: {result.result}")
             return result
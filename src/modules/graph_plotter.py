@@ -1,106 +1,641 @@
 """Graph plotter module for Calculator Agent"""
 
-import os
-import json
+import asyncio
+import atexit
+import re
 from pathlib import Path
-from typing import Dict, Any
-import matplotlib
-matplotlib.use("Agg")  # Non-interactive backend
-import matplotlib.pyplot as plt
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import numpy as np
 
 from src.modules.base_module import BaseModule
-from src.schemas.models import CalculationResult
+from src.schemas.models import ArrayResult, CalculationResult
 from src.config.prompts import GRAPH_PLOTTER_PROMPT
+from src.config.settings import settings
+from src.core.plot_cache import PlotCache
+from src.core.sample_tiles import SampleTileCache
+from src.core.singleflight import SingleFlight
+from src.utils.expressions import parse_expression, remember_expression
 from src.utils.logger import setup_logger
-from src.utils.exceptions import CalculationError
+from src.utils.exceptions import CalculationError, UnsupportedExpressionError
+from src.utils.plot_render import PlotRenderer, write_arrays_atomic
+from src.utils.sampling import compile_function, downsample_grid, evaluate_grid, sample_series
 
 logger = setup_logger()
 
+# Tum modul ornekleri ayni cizim worker havuzunu paylasir
+_renderer = PlotRenderer(workers=settings.PLOT_WORKERS, queue_limit=settings.PLOT_QUEUE_LIMIT)
+atexit.register(_renderer.shutdown)
+# Ayni grafigi ayni anda isteyenler tek cizimi bekler
+_inflight = SingleFlight()
+# Pan/zoom: ayni ifadenin ornekleri araliga gore karolanip yeniden kullanilir
+_tiles = SampleTileCache(max_points=settings.PLOT_TILE_CACHE_POINTS)
+
+# Cache anahtarina giren cizim stili; degisirse eski PNG'ler yeniden kullanilmaz
+PLOT_STYLE: Dict[str, Any] = {"dpi": 120, "figsize": (8, 5)}
+
+DEFAULT_X_RANGE = (-10.0, 10.0)
+# Parametrik/kutupsal egriler icin t (theta) araligi
+DEFAULT_T_RANGE = (0.0, float(2 * np.pi))
+# Cizimde eksen basina en fazla nokta (3-D yuzey poligon sayisiyla pahali)
+GRID_RENDER_SIDE = {"surface": 80, "contour": 300, "heatmap": 400}
+
+# ============================================================
+# KOMUT KALIPLARI
+# ============================================================
+_PLOT_PREFIX = re.compile(
+    r"^(?:(?:plot|graph|draw|çiz|ciz|grafik(?:ini)?|grafiği|surface|yüzey|yuzey|contour|kontur|"
+    r"heatmap|3d|3-d|parametric|parametrik|polar|kutupsal)\s+)+(?:of\s+)?"
+    r"(?:(?:f\s*\(\s*x\s*(?:,\s*y\s*)?\)|y|z)\s*=\s*)?",
+    re.IGNORECASE,
+)
+_GRID_MODES = {
+    "surface": "surface", "yüzey": "surface", "yuzey": "surface", "3d": "surface", "3-d": "surface",
+    "contour": "contour", "kontur": "contour",
+    "heatmap": "heatmap", "ısı haritası": "heatmap", "isi haritasi": "heatmap",
+}
+_CURVE_MODES = {"parametric": "parametric", "parametrik": "parametric", "polar": "polar", "kutupsal": "polar"}
+_CURVE_WORD = re.compile(r"(?<!\w)(" + "|".join(_CURVE_MODES) + r")(?!\w)", re.IGNORECASE)
+# Liste ogesi basindaki "y =", "f(x) =", "r =", "x =" etiketleri
+_ITEM_LABEL = re.compile(r"^\s*(?:(?P<name>[xyr])|f\s*\(\s*x\s*\))\s*=\s*", re.IGNORECASE)
+OUTPUT_MODES = ("png", "svg", "data")
+# "output=svg", "format: data", "as svg", "--data", "cikti=veri"
+_OUTPUT = re.compile(
+    r"[\s,]*(?:--|\b(?:output|format|as|çıktı|cikti)\s*[=:]?\s*)(png|svg|data|veri)\b", re.IGNORECASE
+)
+_MODE_WORD = re.compile(r"(?<!\w)(" + "|".join(map(re.escape, _GRID_MODES)) + r")(?!\w)", re.IGNORECASE)
+# Her kalip ifadenin sonundan bir aralik soyar; var (x/y/t/theta) verilmezse x kabul edilir
+_RANGE_PATTERNS = (
+    # from -5 to 5 / for x from -5 to 5 / y from 0 to 1
+    re.compile(
+        r"[\s,]+(?:for\s+)?(?:(?P<var>[xyt]|theta)\s+)?from\s+(?P<a>\S+)\s+to\s+(?P<b>[^\s,]+)\s*$", re.IGNORECASE
+    ),
+    # x = -5..5 / x=-5:5
+    re.compile(
+        r"[\s,]+(?P<var>[xyt]|theta)\s*=\s*(?P<a>[^\s.:]+(?:\.\d+)?)\s*(?:\.\.|:)\s*(?P<b>[^\s,]+)\s*$",
+        re.IGNORECASE,
+    ),
+    # x in [-5, 5] / [-5, 5]
+    re.compile(
+        r"[\s,]+(?:(?P<var>[xyt]|theta)\s+in\s+)?\[\s*(?P<a>[^,\]]+)\s*,\s*(?P<b>[^\]]+)\]\s*$", re.IGNORECASE
+    ),
+    # between -5 and 5 / -5 ile 5 arasi
+    re.compile(r"\s+between\s+(?P<a>\S+)\s+and\s+(?P<b>\S+)\s*$", re.IGNORECASE),
+    re.compile(r"\s+(?P<a>\S+)\s+ile\s+(?P<b>\S+)\s+aras[ıi]\w*\s*$", re.IGNORECASE),
+)
+
+
+def _parse_bound(text: str) -> float:
+    """Aralik sinirini (-2pi, 1e3, 5) sayiya cevirir"""
+    value = parse_expression(text)
+    if value.free_symbols:
+        raise ValueError(f"Aralik siniri sayi olmali: {text}")
+    bound = float(value)
+    if not np.isfinite(bound):
+        raise ValueError(f"Aralik siniri sonlu olmali: {text}")
+    return bound
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Parantez disindaki ',' / ';' isaretlerinden boler: "max(x, 0), x^2" → 2 oge"""
+    items, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch in ",;" and depth == 0:
+            items.append(text[start:i].strip())
+            start = i + 1
+    items.append(text[start:].strip())
+    return [item for item in items if item]
+
+
+def _parse_series(items: List[str], curve: Optional[str]) -> List[Dict[str, str]]:
+    """Liste ogelerini fonksiyon / parametrik / kutupsal serilere cevirir"""
+    series: List[Dict[str, str]] = []
+    pending_x: Optional[str] = None
+    for item in items:
+        label = _ITEM_LABEL.match(item)
+        name = (label["name"] or "y").lower() if label else None
+        body = item[label.end():].strip() if label else item
+        parts = _split_top_level(body[1:-1]) if body.startswith("(") and body.endswith(")") else []
+
+        if name == "r" or curve == "polar":
+            series.append({"kind": "polar", "r": body})
+        elif len(parts) == 2:
+            series.append({"kind": "parametric", "x": parts[0], "y": parts[1]})
+        elif curve == "parametric" and name == "x":
+            pending_x = body
+        elif curve == "parametric" and name == "y" and pending_x is not None:
+            series.append({"kind": "parametric", "x": pending_x, "y": body})
+            pending_x = None
+        else:
+            series.append({"kind": "function", "expr": body})
+    if pending_x is not None:
+        raise ValueError("Parametrik egride y(t) eksik")
+    return series
+
+
+def parse_plot_command(expression: str) -> Optional[Dict[str, Any]]:
+    """'plot sin(x) from -5 to 5' benzeri komutu fonksiyon + araliga ayirir.
+
+    f(x, y) icin mod (surface/contour/heatmap) ve y araligi da cikarilir:
+    "contour x^2 - y^2, x=-2..2, y=-1..1". Ortak eksende birden fazla seri
+    ',' / ';' ile verilir: "plot x^2, 2^x, log(x) from 0.1 to 4"; parametrik
+    egri "(cos(t), sin(t))" ya da "parametric x=cos(t), y=sin(t)", kutupsal
+    egri "r = 1 + cos(theta)" / "polar 1 + cos(θ)" bicimindedir (t araligi
+    varsayilan [0, 2π]). Cikti bicimi "output=svg" / "as data" ile secilir.
+    Aralik verilmezse [-10, 10] kullanilir. Taninmayan bicimde None dondurur.
+    """
+    text = " ".join(expression.replace("θ", "theta").strip().split())
+    output_match = _OUTPUT.search(text)
+    output = None
+    if output_match:
+        output = "data" if output_match.group(1).lower() == "veri" else output_match.group(1).lower()
+        text = text[:output_match.start()] + text[output_match.end():]
+    mode_match = _MODE_WORD.search(text)
+    mode = _GRID_MODES[mode_match.group(1).lower()] if mode_match else None
+    curve_match = _CURVE_WORD.search(text)
+    curve = _CURVE_MODES[curve_match.group(1).lower()] if curve_match else None
+    text = _PLOT_PREFIX.sub("", _MODE_WORD.sub(" ", text).strip(), count=1)
+
+    ranges: Dict[str, Tuple[float, float]] = {}
+    matched = True
+    while matched:
+        matched = False
+        for pattern in _RANGE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                var = (match.groupdict().get("var") or "x").lower()
+                try:
+                    ranges["t" if var == "theta" else var] = (_parse_bound(match["a"]), _parse_bound(match["b"]))
+                except (ValueError, TypeError):
+                    return None
+                text = text[:match.start()]
+                matched = True
+                break
+
+    text = text.strip().rstrip(",")
+    x_range = ranges.get("x", DEFAULT_X_RANGE)
+    y_range = ranges.get("y")
+    t_range = ranges.get("t", DEFAULT_T_RANGE)
+    if not text or any(low >= high for low, high in (x_range, y_range or x_range, t_range)):
+        return None
+    try:
+        series = _parse_series(_split_top_level(text), curve)
+    except ValueError:
+        return None
+    if not series or (mode is not None and len(series) > 1):
+        return None
+    if len(series) == 1 and series[0]["kind"] == "function":
+        text = series[0]["expr"]
+    return {
+        "function": text,
+        "x_range": x_range,
+        "y_range": y_range,
+        "t_range": t_range,
+        "mode": mode,
+        "series": series,
+        "output": output,
+    }
+
+
+def sample_tiled(text: str, x_range: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """f(x)'i karo cache'i uzerinden ornekler; ortusen araliklar yeniden hesaplanmaz"""
+    f, expr = compile_function(text)
+    x, y, info = _tiles.sample(str(expr), f, float(x_range[0]), float(x_range[1]))
+    info["expression"] = str(expr)
+    return x, y, info
+
 
 class GraphPlotterModule(BaseModule):
     """Grafik çizim modülü"""
 
+    DOMAIN = "graph_plotter"
+    SUPPORTS_PACKING = False
+
     def __init__(self, gemini_agent):
         # BaseModule bir gemini_agent BEKLİYOR
         super().__init__(gemini_agent)
 
-        # Cache dizini
-        self.cache_dir = Path("cache/plots")
+        # İçerik adresli, kalıcı grafik cache'i (dosya adı = anahtar özeti)
+        self.plot_cache = PlotCache(
+            settings.PLOT_CACHE_DIR,
+            max_bytes=settings.PLOT_CACHE_MAX_BYTES,
+            enabled=settings.PLOT_CACHE_ENABLED,
+        )
+        self.cache_dir = self.plot_cache.directory
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Plot cache dict
-        self.plot_cache: Dict[str, str] = {}
-
     def _get_domain_prompt(self) -> str:
         return GRAPH_PLOTTER_PROMPT
 
-    async def calculate(self, expression: str, **kwargs) -> CalculationResult:
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Grafik (dosya) ve örnek karo cache'lerinin hit oranları"""
+        return {"plot": self.plot_cache.stats(), "sample_tiles": _tiles.stats()}
 
+    async def _calculate_local(self, expression: str, **kwargs) -> Optional[CalculationResult]:
+        """Fonksiyonu yerelde derleyip ornekler; parse edilemezse None"""
+        try:
+            # Aralik sinirlari SymPy ile hesaplanir ("0 to 9^9^9"); izole surecte
+            # zaman asimiyla oldurulebilsin diye event loop'ta calismaz
+            command = await self._run_local(parse_plot_command, expression, isolated=True)
+            if command is None:
+                return None
+            output = kwargs.get("output") or command["output"] or "png"
+            series = command["series"]
+            if len(series) > 1 or series[0]["kind"] != "function":
+                return await self._plot_series(series, command["x_range"], command["t_range"], output)
+            return await self._plot_function(
+                command["function"], command["x_range"], command["y_range"], command["mode"], output
+            )
+        except (ValueError, TypeError, UnsupportedExpressionError) as e:
+            # Zaman asimi (_run_local) dahil; Gemini'ye dusulur
+            logger.info(f"Local plot engine skipped: {e}")
+            return None
+
+    async def calculate(self, expression: str, output: Optional[str] = None, **kwargs) -> CalculationResult:
+        """
+        f(x) / f(x, y) grafiği. output: "png" (varsayılan), "svg" (vektörel)
+        veya "data" (örneklenen seriler; Matplotlib hiç yüklenmez).
+        """
         self.validate_input(expression)
         logger.info(f"Graph plotting: {expression}")
+        if output is not None and output not in OUTPUT_MODES:
+            raise CalculationError(f"Geçersiz çıktı biçimi: {output} ({', '.join(OUTPUT_MODES)})")
+
+        try:
+            # Önce yerel derleme + örnekleme; fonksiyon anlaşılamazsa Gemini
+            result = await self._calculate_local(expression, output=output)
+            if result is not None:
+                result = self._mark_engine(result, "local")
+            else:
+                result = await self._plot_from_gemini(expression, output or "png")
+            return result
+
+        except Exception as e:
+            logger.error(f"Graph plotting error: {e}")
+            raise CalculationError(f"Grafik oluşturulamadı: {e}")
+
+    async def _plot_from_gemini(self, expression: str, output: str) -> CalculationResult:
+        """Gemini'nin çıkardığı fonksiyon/aralık ile yerelde çizer"""
+        response = await self._call_gemini(expression)
+        result = self._mark_engine(self._create_result(response, "graph_plotter"), "gemini")
+        visual_data = result.visual_data or {}
+        if not visual_data.get("function"):
+            return result
+
+        x_range = visual_data.get("x_range") or DEFAULT_X_RANGE
+        y_range = visual_data.get("y_range")
+        plot_type = visual_data.get("plot_type")
+        command = await self._run_local(
+            parse_plot_command, f"{plot_type} {visual_data['function']}", isolated=True
+        ) if plot_type in ("parametric", "polar") else None
+        if command is not None:
+            plotted = await self._plot_series(command["series"], command["x_range"], command["t_range"], output)
+        else:
+            plotted = await self._plot_function(
+                visual_data["function"],
+                (float(x_range[0]), float(x_range[1])),
+                (float(y_range[0]), float(y_range[1])) if y_range else None,
+                "surface" if plot_type == "3d" else None,
+                output,
+            )
+        if output == "data":
+            result.result = plotted.result
+        result.visual_data = {**visual_data, **plotted.visual_data}
+        result.steps = list(result.steps) + plotted.steps
+        result.metadata = {**(result.metadata or {}), **plotted.metadata}
+        return result
 
-        cache_key = expression.lower().strip()
+    async def _parse_isolated(self, text: str) -> Any:
+        """Kullanici ifadesini izole surecte parse eder ve paylasilan cache'e
+        yazar; ornekleme thread'i ayni metni yeniden parse etmez"""
+        expr = await self._run_local(parse_expression, text, isolated=True)
+        return remember_expression(text, expr)
 
-        # Cache kontrolü
-        if cache_key in self.plot_cache:
+    async def _plot_function(
+        self,
+        function: str,
+        x_range: Tuple[float, float],
+        y_range: Optional[Tuple[float, float]] = None,
+        mode: Optional[str] = None,
+        output: str = "png",
+    ) -> CalculationResult:
+        """Cache'te varsa onu döndürür; yoksa f(x)'i örnekleyip ya da f(x, y)'yi
+        ızgarada hesaplayıp istenen biçimde (png/svg/data) üretir.
+
+        Anahtar normalize (SymPy) ifadeden üretilir; aynı anahtarla eşzamanlı
+        istekler tek çizimde birleşir.
+        """
+        expr = await self._parse_isolated(function)
+        canonical = str(expr)
+
+        if mode is None and "y" not in {str(s) for s in expr.free_symbols}:
+            key = PlotCache.make_key(canonical, x_range, {**PLOT_STYLE, "output": output})
+            render = lambda: self._render_function(function, x_range, key, output)  # noqa: E731
+        else:
+            mode = mode or "surface"
+            y_range = y_range or x_range
+            style = {**PLOT_STYLE, "mode": mode, "grid_points": settings.PLOT_GRID_POINTS, "output": output}
+            key = PlotCache.make_key(canonical, (*x_range, *y_range), style)
+            render = lambda: self._render_grid(function, x_range, y_range, mode, key, output)  # noqa: E731
+
+        cached = await asyncio.to_thread(self.plot_cache.get, key)
+        if cached is not None:
             logger.info("Using cached plot")
-            return self._load_cached_result(self.plot_cache[cache_key])
+            return self._load_cached_result(cached)
+        return await _inflight.do(key, lambda: self._render_or_discard(key, render))
 
+    async def _render_or_discard(
+        self, key: str, render: Callable[[], Awaitable[CalculationResult]]
+    ) -> CalculationResult:
+        """Çizimi çalıştırır; başarısız olursa yazılmış ama indekslenmemiş dosyaları siler"""
         try:
-            # Gemini çağrısı (testlerde mock'lanıyor)
-            response = await self._call_gemini(expression)
+            return await render()
+        except Exception:
+            # Örnek: .npz yazıldı, ardından çizim hata verdi
+            paths = [self.plot_cache.path_for(key, f".{suffix}") for suffix in ("npz", "png", "svg")]
+            await asyncio.to_thread(self.plot_cache.discard, key, paths)
+            raise
 
-            result = self._create_result(response, "graph_plotter")
+    async def _store(
+        self, key: str, plot_paths: Dict[str, str], output: str, result: CalculationResult
+    ) -> None:
+        """Sonucu ve ürettiği dosyaları (ana dosya önce) cache indeksine yazar"""
+        paths = [Path(plot_paths[output])] + [Path(p) for name, p in plot_paths.items() if name != output]
+        payload = result.model_dump(include={"steps", "visual_data", "metadata"}, mode="json")
+        await asyncio.to_thread(self.plot_cache.put, key, paths, payload)
 
-            # Gemini cevapları içinden görsel veriyi al
-            if result.visual_data:
-                plot_paths = await self._create_plot(result.visual_data, expression)
-                result.visual_data["plot_paths"] = plot_paths
-                self.plot_cache[cache_key] = plot_paths["png"]
+    async def _render_function(
+        self, function: str, x_range: Tuple[float, float], key: str, output: str
+    ) -> CalculationResult:
+        x, y, info = await self._run_local(sample_tiled, function, x_range)
+        steps: List[str] = [
+            f"Parsed f(x) = {info['expression']}",
+            f"Adaptive sampling on [{x_range[0]:g}, {x_range[1]:g}]: "
+            f"{info['samples']} new evaluations in {info['rounds']} refinement rounds",
+        ]
+        if info["reused_tiles"]:
+            steps.append(f"Reused {info['reused_tiles']}/{info['tiles']} sample tiles from earlier views")
+        if info["discontinuities"]:
+            steps.append(f"Detected {info['discontinuities']} discontinuities/asymptotes (line broken)")
 
-            return result
+        value: Any = "Grafik oluşturuldu"
+        if output == "data":
+            # İstemci tarafı çizim: seriler döner, Matplotlib hiç devreye girmez
+            data_path = self.plot_cache.path_for(key, ".npz")
+            await asyncio.to_thread(write_arrays_atomic, data_path, x=x, y=y)
+            plot_paths = {"data": str(data_path)}
+            value = {"x": ArrayResult.from_numpy(x), "y": ArrayResult.from_numpy(y)}
+            steps.append(f"Sampled series saved to {data_path} (no rendering)")
+        else:
+            plot_paths = await self._create_plot(
+                x, y, info["expression"], self.plot_cache.path_for(key, f".{output}"), output
+            )
+            steps.append(f"Rendered {plot_paths[output]}")
 
-        except Exception as e:
-            logger.error(f"Graph plotting error: {e}")
-            raise CalculationError(f"Grafik oluşturulamadı: {e}")
+        result = CalculationResult(
+            result=value,
+            steps=steps,
+            visual_data={
+                "function": info["expression"],
+                "x_range": list(x_range),
+                "plot_type": "2d",
+                "output": output,
+                "plot_paths": plot_paths,
+            },
+            confidence_score=1.0,
+            domain="graph_plotter",
+            metadata={k: info[k] for k in ("samples", "rounds", "discontinuities", "tiles", "reused_tiles")},
+        )
+        await self._store(key, plot_paths, output, result)
+        return result
+
+    async def _render_grid(
+        self,
+        function: str,
+        x_range: Tuple[float, float],
+        y_range: Tuple[float, float],
+        mode: str,
+        key: str,
+        output: str,
+    ) -> CalculationResult:
+        """f(x, y): tam ızgara .npz'ye, seyreltilmiş ızgara çizime gider"""
+        xs, ys, Z, info = await self._run_local(
+            evaluate_grid, function, x_range, y_range, settings.PLOT_GRID_POINTS
+        )
+        data_path = self.plot_cache.path_for(key, ".npz")
+        await asyncio.to_thread(write_arrays_atomic, data_path, x=xs, y=ys, z=Z)
+
+        ny, nx = info["grid"]
+        steps = [
+            f"Parsed f(x, y) = {info['expression']}",
+            f"Evaluated {ny}x{nx} grid ({info['samples']} points) in one vectorized pass",
+        ]
+        plot_paths = {"data": str(data_path)}
+        metadata: Dict[str, Any] = {"samples": info["samples"], "grid": info["grid"]}
+        value: Any = "Grafik oluşturuldu"
 
-    async def _create_plot(self, visual_data: Dict[str, Any], expression: str, x_range=[-10, 10]) -> Dict[str, str]:
+        if output == "data":
+            value = {name: ArrayResult.from_numpy(a) for name, a in (("x", xs), ("y", ys), ("z", Z))}
+        else:
+            rx, ry, rz = downsample_grid(xs, ys, Z, GRID_RENDER_SIDE[mode])
+            spec: Dict[str, Any] = {
+                "kind": mode, "x": rx, "y": ry, "z": rz, "format": output,
+                "title": f"f(x, y) = {info['expression']}", **PLOT_STYLE,
+            }
+            finite = rz[np.isfinite(rz)]
+            if finite.size:
+                # Kutuplar renk/z ölçeğini ezmesin
+                low, high = np.percentile(finite, [1, 99])
+                spec["zlim"] = (float(low), float(high)) if high > low else None
+
+            figure_path = self.plot_cache.path_for(key, f".{output}")
+            try:
+                await _renderer.render_to_file(spec, figure_path)
+            except CalculationError:
+                raise
+            except Exception as e:
+                logger.error(f"Grid plot error: {e}")
+                raise CalculationError(f"{mode} grafiği oluşturulamadı: {e}")
+            plot_paths[output] = str(figure_path)
+            metadata["render_grid"] = list(rz.shape)
+            steps.append(f"Rendered {mode} from a {rz.shape[0]}x{rz.shape[1]} downsampled grid: {figure_path}")
+
+        steps.append(f"Full-resolution grid saved to {data_path}")
+        if info["undefined"]:
+            steps.append(f"{info['undefined']} grid points are undefined (masked)")
+
+        result = CalculationResult(
+            result=value,
+            steps=steps,
+            visual_data={
+                "function": info["expression"],
+                "x_range": list(x_range),
+                "y_range": list(y_range),
+                "plot_type": mode,
+                "output": output,
+                "plot_paths": plot_paths,
+            },
+            confidence_score=1.0,
+            domain="graph_plotter",
+            metadata=metadata,
+        )
+        await self._store(key, plot_paths, output, result)
+        return result
+
+    async def _plot_series(
+        self,
+        series: List[Dict[str, str]],
+        x_range: Tuple[float, float],
+        t_range: Tuple[float, float],
+        output: str = "png",
+    ) -> CalculationResult:
+        """Birden fazla fonksiyon / parametrik / kutupsal eğriyi tek figürde çizer"""
+        canonical = []
+        for spec in series:
+            fields = [spec[k] for k in ("expr", "x", "y", "r") if k in spec]
+            parsed = [await self._parse_isolated(f) for f in fields]
+            canonical.append(f"{spec['kind']}:" + ",".join(map(str, parsed)))
+        key = PlotCache.make_key(
+            " | ".join(canonical), (*x_range, *t_range), {**PLOT_STYLE, "kind": "series", "output": output}
+        )
+
+        cached = await asyncio.to_thread(self.plot_cache.get, key)
+        if cached is not None:
+            logger.info("Using cached plot")
+            return self._load_cached_result(cached)
+        return await _inflight.do(key, lambda: self._render_or_discard(
+            key, lambda: self._render_series(series, x_range, t_range, key, output)
+        ))
+
+    async def _render_series(
+        self,
+        series: List[Dict[str, str]],
+        x_range: Tuple[float, float],
+        t_range: Tuple[float, float],
+        key: str,
+        output: str,
+    ) -> CalculationResult:
+        curves, info = await self._run_local(sample_series, series, x_range, t_range)
+        labels = info["labels"]
+        kinds = {spec["kind"] for spec in series}
+        n_functions = sum(spec["kind"] == "function" for spec in series)
+        steps: List[str] = [f"Parsed {len(series)} series: {'; '.join(labels)}"]
+        if n_functions:
+            steps.append(f"Evaluated {n_functions} functions together on a shared x grid [{x_range[0]:g}, {x_range[1]:g}]")
+        if len(series) > n_functions:
+            steps.append(
+                f"Evaluated {len(series) - n_functions} parametric/polar curves together on a shared "
+                f"t grid [{t_range[0]:g}, {t_range[1]:g}]"
+            )
+        steps.append(f"{info['samples']} points in {info['rounds']} refinement rounds")
+        if info["discontinuities"]:
+            steps.append(f"Detected {info['discontinuities']} discontinuities/asymptotes (lines broken)")
+
+        value: Any = "Grafik oluşturuldu"
+        if output == "data":
+            arrays = {f"{axis}{i}": a for i, xy in enumerate(curves) for axis, a in zip("xy", xy)}
+            data_path = self.plot_cache.path_for(key, ".npz")
+            await asyncio.to_thread(write_arrays_atomic, data_path, **arrays)
+            plot_paths = {"data": str(data_path)}
+            value = {name: ArrayResult.from_numpy(a) for name, a in arrays.items()}
+            steps.append(f"Sampled series saved to {data_path} (no rendering)")
+        else:
+            path = self.plot_cache.path_for(key, f".{output}")
+            spec: Dict[str, Any] = {
+                "kind": "series",
+                "series": [{"x": x, "y": y, "label": label} for (x, y), label in zip(curves, labels)],
+                "title": ", ".join(labels) if len(labels) <= 3 else f"{len(labels)} series",
+                "equal_aspect": "function" not in kinds,
+                "format": output,
+                **PLOT_STYLE,
+            }
+            ys = np.concatenate([y for _, y in curves])
+            finite = ys[np.isfinite(ys)]
+            if finite.size and "function" in kinds:
+                # Asimptot yakinindaki uc degerler ortak ekseni ezmesin
+                low, high = np.percentile(finite, [1, 99])
+                pad = (high - low) * 0.1 or 1.0
+                spec["ylim"] = (float(low - pad), float(high + pad))
+            try:
+                await _renderer.render_to_file(spec, path)
+            except CalculationError:
+                raise
+            except Exception as e:
+                logger.error(f"Series plot error: {e}")
+                raise CalculationError(f"Grafik oluşturulamadı: {e}")
+            plot_paths = {output: str(path)}
+            steps.append(f"Rendered {len(series)} series into one figure: {path}")
+
+        plot_type = "2d" if kinds == {"function"} else (kinds.pop() if len(kinds) == 1 else "mixed")
+        visual_data: Dict[str, Any] = {
+            "function": "; ".join(labels),
+            "series": [{"kind": spec["kind"], "label": label} for spec, label in zip(series, labels)],
+            "plot_type": plot_type,
+            "output": output,
+            "plot_paths": plot_paths,
+        }
+        if n_functions:
+            visual_data["x_range"] = list(x_range)
+        if len(series) > n_functions:
+            visual_data["t_range"] = list(t_range)
+        result = CalculationResult(
+            result=value,
+            steps=steps,
+            visual_data=visual_data,
+            confidence_score=1.0,
+            domain="graph_plotter",
+            metadata={
+                "series": len(series),
+                **{k: info[k] for k in ("samples", "rounds", "discontinuities")},
+            },
+        )
+        await self._store(key, plot_paths, output, result)
+        return result
+
+    async def _create_plot(
+        self, x: np.ndarray, y: np.ndarray, title: str, path: Path, output: str = "png"
+    ) -> Dict[str, str]:
         try:
-            return await self._plot_2d(visual_data, expression, x_range)
+            return await self._plot_2d(x, y, title, path, output)
         except Exception as e:
             logger.error(f"Plot creation error: {e}")
             raise CalculationError(f"Grafik çizilemedi: {e}")
 
-    async def _plot_2d(self, visual_data: Dict[str, Any], expression: str, x_range: list) -> Dict[str, str]:
+    async def _plot_2d(
+        self, x: np.ndarray, y: np.ndarray, title: str, path: Path, output: str = "png"
+    ) -> Dict[str, str]:
         try:
-            x = np.linspace(x_range[0], x_range[1], 500)
-
-            # Testlerde sabit fonksiyon: y = x^2
-            y = x ** 2
-
-            plt.figure(figsize=(8, 5))
-            plt.plot(x, y, "b-", linewidth=2)
-            plt.grid(True, alpha=0.3)
-            plt.xlabel("x")
-            plt.ylabel("y")
-            plt.title(f"f(x) = {expression}")
-
-            png_path = self.cache_dir / f"{abs(hash(expression))}.png"
-            plt.savefig(png_path, dpi=120, bbox_inches="tight")
-            plt.close()
+            spec: Dict[str, Any] = {"x": x, "y": y, "title": f"f(x) = {title}", "format": output, **PLOT_STYLE}
+            finite = y[np.isfinite(y)]
+            if finite.size:
+                # Asimptot yakinindaki uc degerler eksenleri ezmesin
+                low, high = np.percentile(finite, [1, 99])
+                pad = (high - low) * 0.1 or 1.0
+                spec["ylim"] = (float(low - pad), float(high + pad))
 
-            return {"png": str(png_path)}
+            await _renderer.render_to_file(spec, path)
+            return {output: str(path)}
 
+        except CalculationError:
+            raise
         except Exception as e:
             logger.error(f"2D plot error: {e}")
             raise CalculationError(f"2D grafik oluşturulamadı: {e}")
 
-    def _load_cached_result(self, cached_path: str) -> CalculationResult:
+    def _load_cached_result(self, cached: Dict[str, Any]) -> CalculationResult:
+        visual_data = cached.get("visual_data") or {}
+        value: Any = "Grafik oluşturuldu (cache)"
+        if visual_data.get("output") == "data":
+            with np.load(visual_data["plot_paths"]["data"]) as arrays:
+                value = {name: ArrayResult.from_numpy(arrays[name]) for name in arrays.files}
         return CalculationResult(
-            result="Grafik oluşturuldu (cache)",
-            steps=["Cache'den yüklendi"],
-            visual_data={"plot_paths": {"png": cached_path}},
+            result=value,
+            steps=list(cached.get("steps") or []) + ["Cache'den yüklendi"],
+            visual_data=cached.get("visual_data"),
             confidence_score=1.0,
             domain="graph_plotter",
+            metadata={**(cached.get("metadata") or {}), "cache": "hit"},
         )
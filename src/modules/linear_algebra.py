@@ -1,82 +1,626 @@
 """Linear algebra module for Calculator Agent"""
 
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
 import numpy as np
 from src.modules.base_module import BaseModule
-from src.schemas.models import CalculationResult
+from src.schemas.models import ArrayResult, CalculationResult
 from src.utils.exceptions import CalculationError
+from src.config.settings import settings
+from src.utils.helpers import parse_matrix_string
+from src.utils import sparse
+from src.utils.matrix_io import (
+    FILE_REFERENCE,
+    load_reference,
+    load_sparse_reference,
+    require_in_memory,
+    save_result,
+    save_sparse_result,
+)
+from src.utils.matrix_planner import evaluate_program
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
 
+# Adimlarda tam icerigi gosterilecek en buyuk matris (eleman sayisi)
+MAX_DISPLAY_ELEMENTS = 16
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_WORD = re.compile(r"[A-Za-zçğıöşüÇĞİÖŞÜ_]+")
+_OPERATORS = {"*": "*", "@": "*", "×": "*", "+": "+", "-": "-", "^": "^"}
+# Isleme etkisi olmayan dolgu kelimeleri
+_FILLER_WORDS = {"matrix", "matris", "of", "the", "nin", "nın", "in", "ın", "by", "with", "and", "ve"}
+
+_OPERATION_ALIASES = {
+    "determinant": "determinant", "det": "determinant",
+    "inverse": "inverse", "inv": "inverse", "ters": "inverse",
+    "transpose": "transpose", "devrik": "transpose",
+    "rank": "rank", "rang": "rank",
+    "trace": "trace", "iz": "trace",
+    "eigen": "eigen", "eig": "eigen", "eigenvalues": "eigen", "ozdeger": "eigen", "özdeğer": "eigen",
+    "svd": "svd",
+    "norm": "norm",
+    "power": "power", "pow": "power", "us": "power", "üs": "power",
+    "solve": "solve", "coz": "solve", "çöz": "solve",
+    "multiply": "*", "carp": "*", "çarp": "*",
+    "add": "+", "topla": "+",
+    "subtract": "-", "cikar": "-", "çıkar": "-",
+}
+_IN_MEMORY_OPS = ("determinant", "inverse", "rank", "eigen", "svd", "power", "solve")
+_ELEMENTWISE = {"*": np.matmul, "+": np.add, "-": np.subtract}
+_BATCH = re.compile(r"^\s*(?:batch(?:ed)?|toplu)\s+", re.IGNORECASE)
+# coo[[satir, sutun, deger], ...] veya coo(3x3)[[...]] ve .mtx referanslari seyrek girdidir
+_COO_HEAD = re.compile(r"coo\s*(?:\(\s*(\d+)\s*[x,]\s*(\d+)\s*\))?\s*(?=\[)", re.IGNORECASE)
+_SPARSE_INPUT = re.compile(r"\bcoo\s*[\[(]|@[\w./\\-]+\.mtx\b", re.IGNORECASE)
+_SOLVER_OPTION = re.compile(r"\b(tol|maxiter|restart)\s*=\s*([\d.]+(?:[eE][-+]?\d+)?)", re.IGNORECASE)
+_KEYWORD = re.compile(r"^\s*(?:(?:matrix|matris)\s+)?([^\W\d_]+)\s*([(=])?", re.IGNORECASE)
+_NORM_ORDERS = {"fro": "fro", "frobenius": "fro", "nuc": "nuc", "inf": np.inf, "max": np.inf}
+
+
+# ============================================================
+# TOKENIZER (eval'siz)
+# ============================================================
+def _matching_bracket(text: str, start: int) -> int:
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "[":
+            depth += 1
+        elif text[i] == "]":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise CalculationError("Kapanmamis koseli parantez")
+
+
+def parse_matrix(text: str, max_ndim: int = 2) -> np.ndarray:
+    """Matris/vektor literal'ini float ndarray'e cevirir (dikdortgen olmali)"""
+    try:
+        array = np.asarray(parse_matrix_string(text), dtype=float)
+    except ValueError as e:
+        raise CalculationError(f"Gecersiz matris: {e}")
+    if not 1 <= array.ndim <= max_ndim or array.size == 0:
+        raise CalculationError(f"Matris 1-{max_ndim} boyutlu ve bos olmamali")
+    return array
+
+
+def parse_coo(text: str, shape: Optional[Tuple[int, int]] = None) -> Any:
+    """[[satir, sutun, deger], ...] koordinat listesini seyrek matrise cevirir"""
+    triplets = np.asarray(parse_matrix_string(text), dtype=float)
+    if triplets.ndim != 2 or triplets.shape[1] != 3:
+        raise CalculationError("coo girdisi [[satir, sutun, deger], ...] olmali")
+    rows, cols = triplets[:, 0].astype(np.int64), triplets[:, 1].astype(np.int64)
+    shape = shape or (int(rows.max()) + 1, int(cols.max()) + 1)
+    if rows.min() < 0 or cols.min() < 0 or rows.max() >= shape[0] or cols.max() >= shape[1]:
+        raise CalculationError(f"coo indeksleri {shape} boyutunun disinda")
+    return sparse.make_sparse(rows, cols, triplets[:, 2], shape)
+
+
+def _choose_representation(matrix: Any) -> Tuple[str, Any]:
+    """Olculen yogunluga gore yogun ya da seyrek temsil secer"""
+    m, n = matrix.shape
+    dense_fits = m * n * 8 <= settings.LINALG_MEMORY_BUDGET_BYTES
+    if dense_fits and sparse.density(matrix) >= settings.SPARSE_DENSITY_THRESHOLD:
+        return "matrix", matrix.toarray()
+    return "sparse", matrix
+
+
+def tokenize(expression: str, max_ndim: int = 2) -> List[Tuple[str, Any]]:
+    """Ifadeyi ("matrix" | "sparse" | "number" | "op" | "word", deger) token'larina ayirir
+
+    max_ndim=3 toplu (batch) islemlerde matris yiginlarina izin verir.
+    coo literal'leri ve .mtx dosyalari yogunluklarina gore "sparse" veya "matrix" olur.
+    """
+    tokens: List[Tuple[str, Any]] = []
+    i = 0
+    while i < len(expression):
+        ch = expression[i]
+        if ch.isspace() or ch in ",:":
+            i += 1
+        elif _COO_HEAD.match(expression, i):
+            match = _COO_HEAD.match(expression, i)
+            end = _matching_bracket(expression, match.end())
+            shape = (int(match.group(1)), int(match.group(2))) if match.group(1) else None
+            tokens.append(_choose_representation(parse_coo(expression[match.end():end + 1], shape)))
+            i = end + 1
+        elif FILE_REFERENCE.match(expression, i) and FILE_REFERENCE.match(expression, i).group(1).lower().endswith(".mtx"):
+            match = FILE_REFERENCE.match(expression, i)
+            tokens.append(_choose_representation(load_sparse_reference(match.group(1))))
+            i = match.end()
+        elif FILE_REFERENCE.match(expression, i):
+            match = FILE_REFERENCE.match(expression, i)
+            tokens.append(("matrix", load_reference(*match.groups())))
+            i = match.end()
+        elif ch == "[":
+            end = _matching_bracket(expression, i)
+            tokens.append(("matrix", parse_matrix(expression[i:end + 1], max_ndim)))
+            i = end + 1
+        elif ch in _OPERATORS and not (
+            ch == "-" and (not tokens or tokens[-1][0] in ("op", "word"))
+            and _NUMBER.match(expression, i)
+        ):
+            tokens.append(("op", _OPERATORS[ch]))
+            i += 1
+        elif _NUMBER.match(expression, i):
+            match = _NUMBER.match(expression, i)
+            tokens.append(("number", float(match.group(0))))
+            i = match.end()
+        elif _WORD.match(expression, i):
+            match = _WORD.match(expression, i)
+            word = match.group(0).lower()
+            if word not in _FILLER_WORDS:
+                tokens.append(("word", word))
+            i = match.end()
+        else:
+            raise CalculationError(f"Beklenmeyen karakter: {ch!r}")
+    return tokens
+
+
+# ============================================================
+# ISLEMLER
+# ============================================================
+def _describe(name: str, value: Any) -> str:
+    if isinstance(value, np.ndarray):
+        if value.size <= MAX_DISPLAY_ELEMENTS:
+            return f"{name} = {np.round(value, 10).tolist()}"
+        return f"{name}: {'x'.join(map(str, value.shape))} matrix"
+    return f"{name} = {value}"
+
+
+def _require_square(M: np.ndarray, operation: str) -> None:
+    if M.ndim != 2 or M.shape[0] != M.shape[1]:
+        raise CalculationError(f"{operation} icin kare matris gerekli, boyut: {M.shape}")
+
+
+def _as_int(value: float, what: str) -> int:
+    if value != int(value):
+        raise CalculationError(f"{what} tam sayi olmali")
+    return int(value)
+
+
+def _format_eigenvalues(values: np.ndarray) -> List[Any]:
+    if np.all(np.abs(values.imag) <= 1e-12):
+        return [float(v) for v in values.real]
+    return [str(complex(round(v.real, 12), round(v.imag, 12))) for v in values]
+
+
+def _eigen(M: np.ndarray, steps: List[str], metadata: Dict[str, Any]) -> Any:
+    _require_square(M, "Ozdeger")
+    if np.allclose(M, M.T):
+        values, vectors = np.linalg.eigh(M)
+        steps.append("Symmetric matrix: used numpy.linalg.eigh")
+        return {"eigenvalues": values.tolist(), "eigenvectors": ArrayResult.from_numpy(vectors)}
+
+    values, vectors = np.linalg.eig(M)
+    order = np.lexsort((values.imag, values.real))
+    values, vectors = values[order], vectors[:, order]
+    steps.append("Computed eigen decomposition using numpy.linalg.eig")
+    result: Dict[str, Any] = {"eigenvalues": _format_eigenvalues(values)}
+    if np.all(np.abs(vectors.imag) <= 1e-12):
+        result["eigenvectors"] = ArrayResult.from_numpy(vectors.real)
+    return result
+
+
+def _svd(M: np.ndarray, steps: List[str], metadata: Dict[str, Any]) -> Any:
+    U, S, Vt = np.linalg.svd(np.atleast_2d(M), full_matrices=False)
+    steps.append("Computed thin SVD using numpy.linalg.svd")
+    return {
+        "singular_values": S.tolist(),
+        "U": ArrayResult.from_numpy(U),
+        "Vt": ArrayResult.from_numpy(Vt),
+    }
+
+
+def _unary(operation: str, M: np.ndarray, words: List[str], numbers: List[float],
+           steps: List[str], metadata: Dict[str, Any]) -> Any:
+    if operation == "determinant":
+        _require_square(M, "Determinant")
+        # slogdet: buyuk matrislerde det tasmaz, log|det| metadata'da kalir
+        sign, logdet = np.linalg.slogdet(M)
+        metadata.update({"sign": float(sign), "log_abs_det": float(logdet)})
+        steps.append("Computed determinant using LU (numpy.linalg.slogdet)")
+        return float(sign * np.exp(logdet))
+    if operation == "inverse":
+        _require_square(M, "Ters")
+        steps.append("Computed inverse using numpy.linalg.inv")
+        return np.linalg.inv(M)
+    if operation == "transpose":
+        steps.append("Transposed matrix")
+        return M.T
+    if operation == "rank":
+        steps.append("Computed rank using numpy.linalg.matrix_rank (SVD)")
+        return int(np.linalg.matrix_rank(M))
+    if operation == "trace":
+        _require_square(M, "Iz")
+        steps.append("Computed trace (sum of diagonal)")
+        return float(np.trace(M))
+    if operation == "eigen":
+        return _eigen(M, steps, metadata)
+    if operation == "svd":
+        return _svd(M, steps, metadata)
+    if operation == "norm":
+        order: Any = None
+        for word in words:
+            if word in _NORM_ORDERS:
+                order = _NORM_ORDERS[word]
+        if numbers:
+            order = numbers[0]
+        metadata["norm_order"] = str(order if order is not None else ("fro" if M.ndim == 2 else 2))
+        steps.append(f"Computed norm (ord={metadata['norm_order']}) using numpy.linalg.norm")
+        return float(np.linalg.norm(M, ord=order))
+    if operation == "power":
+        if not numbers:
+            raise CalculationError("Us belirtilmeli (ornek: power [[1,1],[1,0]] 5)")
+        _require_square(M, "Us alma")
+        steps.append(f"Computed matrix power {numbers[0]:g} using repeated squaring")
+        return np.linalg.matrix_power(M, _as_int(numbers[0], "Us"))
+    raise CalculationError(f"Bilinmeyen islem: {operation}")
+
+
+def _solve(matrices: List[np.ndarray], steps: List[str], metadata: Dict[str, Any]) -> np.ndarray:
+    if len(matrices) != 2:
+        raise CalculationError("solve icin A ve b gerekli (ornek: solve [[3,1],[1,2]] [9,8])")
+    A, b = matrices
+    if A.ndim != 2 or A.shape[0] != b.shape[0]:
+        raise CalculationError(f"Boyut uyusmazligi: A {A.shape}, b {b.shape}")
+    if A.shape[0] == A.shape[1]:
+        steps.append("Solved A x = b using numpy.linalg.solve (LU)")
+        return np.linalg.solve(A, b)
+    x, residuals, rank, _ = np.linalg.lstsq(A, b, rcond=None)
+    steps.append("Non-square system: least-squares solution via numpy.linalg.lstsq")
+    metadata.update({"least_squares": True, "rank": int(rank)})
+    return x
+
+
+# ============================================================
+# TOPLU (BATCH) ISLEMLER: (N, n, n) yiginlari tek vektorize cagrida
+# ============================================================
+def _batch_inverse(stack: np.ndarray, metadata: Dict[str, Any]) -> np.ndarray:
+    """Tekil matrisler tum yigini dusurmesin: tekiller NaN, digerleri tek cagrida"""
+    sign, _ = np.linalg.slogdet(stack)
+    singular = np.flatnonzero(sign == 0)
+    result = np.full(stack.shape, np.nan)
+    regular = sign != 0
+    if regular.any():
+        result[regular] = np.linalg.inv(stack[regular])
+    if singular.size:
+        metadata["singular_indices"] = singular.tolist()
+    return result
+
+
+def _batch_eigenvalues(stack: np.ndarray, metadata: Dict[str, Any]) -> np.ndarray:
+    if np.allclose(stack, np.swapaxes(stack, -1, -2)):
+        metadata["method"] = "eigvalsh"
+        return np.linalg.eigvalsh(stack)
+    values = np.linalg.eigvals(stack)
+    if np.all(np.abs(values.imag) <= 1e-12):
+        return np.sort(values.real, axis=-1)
+    # Karmasik degerler: [..., (real, imag)] olarak tasinir
+    metadata["complex"] = True
+    return np.stack([values.real, values.imag], axis=-1)
+
+
+def solve_batch(expression: str) -> Dict[str, Any]:
+    """'batch <islem> <yigin> [yigin]' komutunu NumPy'nin broadcasting linalg'i ile hesaplar.
+
+    Desteklenenler: determinant, inverse, solve, eigen, trace, transpose, rank,
+    norm, multiply. Metadata'da matris sayisi ve saniyedeki matris (throughput) doner.
+    """
+    tokens = tokenize(_BATCH.sub("", expression, count=1), max_ndim=3)
+    words = [value for kind, value in tokens if kind == "word"]
+    stacks = [np.asarray(value, dtype=float) for kind, value in tokens if kind == "matrix"]
+    operation = next((_OPERATION_ALIASES[w] for w in words if w in _OPERATION_ALIASES), None)
+    if operation is None or not stacks:
+        raise CalculationError("Toplu islem icin islem adi ve matris yigini gerekli")
+
+    stack = stacks[0]
+    if stack.ndim != 3:
+        raise CalculationError(f"Toplu islem 3 boyutlu (N, n, m) yigin bekler, boyut: {stack.shape}")
+    if operation in _IN_MEMORY_OPS:
+        require_in_memory(stack, operation)
+    square = stack.shape[1] == stack.shape[2]
+    if operation in ("determinant", "inverse", "solve", "eigen", "trace") and not square:
+        raise CalculationError(f"{operation} icin kare matris yigini gerekli, boyut: {stack.shape}")
+
+    metadata: Dict[str, Any] = {}
+    started = time.perf_counter()
+
+    if operation == "determinant":
+        sign, logdet = np.linalg.slogdet(stack)
+        value = sign * np.exp(logdet)
+    elif operation == "inverse":
+        value = _batch_inverse(stack, metadata)
+    elif operation == "solve":
+        if len(stacks) != 2:
+            raise CalculationError("Toplu solve icin A yigini ve b yigini gerekli")
+        b = stacks[1]
+        # (N, n) sag taraflar vektor yigini olarak cozulur
+        value = np.linalg.solve(stack, b[..., None])[..., 0] if b.ndim == 2 else np.linalg.solve(stack, b)
+    elif operation == "eigen":
+        value = _batch_eigenvalues(stack, metadata)
+    elif operation == "trace":
+        value = np.trace(stack, axis1=1, axis2=2)
+    elif operation == "transpose":
+        value = np.swapaxes(stack, 1, 2)
+    elif operation == "rank":
+        value = np.linalg.matrix_rank(stack).astype(float)
+    elif operation == "norm":
+        order = next((_NORM_ORDERS[w] for w in words if w in _NORM_ORDERS), None)
+        value = np.linalg.norm(stack, ord=order, axis=(1, 2))
+    elif operation == "*":
+        if len(stacks) != 2:
+            raise CalculationError("Toplu carpim icin iki yigin gerekli")
+        value = np.matmul(stack, stacks[1])
+    else:
+        raise CalculationError(f"Toplu islem desteklenmiyor: {operation}")
+
+    elapsed = time.perf_counter() - started
+    count = stack.shape[0]
+    metadata.update({
+        "operation": f"batch_{operation if operation != '*' else 'multiply'}",
+        "count": count,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "matrices_per_second": round(count / elapsed) if elapsed > 0 else None,
+        "shape": list(value.shape),
+    })
+    steps = [
+        f"Parsed stack of {count} matrices ({stack.shape[1]}x{stack.shape[2]})",
+        f"Applied vectorized {metadata['operation']} in {metadata['elapsed_ms']} ms "
+        f"({metadata['matrices_per_second']} matrices/s)",
+    ]
+    if metadata.get("singular_indices"):
+        steps.append(f"Singular matrices (NaN): {metadata['singular_indices']}")
+    return {"result": value, "steps": steps, "metadata": metadata}
+
+
+# ============================================================
+# SEYREK ISLEMLER
+# ============================================================
+def _product(left: Any, right: Any) -> Any:
+    if isinstance(left, np.ndarray) and isinstance(right, sparse.CSRMatrix):
+        # ndarray @ yerlesik CSR: (B^T A^T)^T
+        return np.asarray(right.T @ np.asarray(left).T).T
+    return left @ right
+
+
+def _sparse_output(value: Any, from_file: bool, stem: str) -> Any:
+    """Seyrek sonucu dosyaya (.mtx) ya da COO ucluleri olarak dondurur"""
+    if from_file:
+        return save_sparse_result(value, stem)
+    rows, cols, data = sparse.coo_arrays(value)
+    return {
+        "format": "coo",
+        "shape": list(value.shape),
+        "nnz": int(value.nnz),
+        "rows": rows.tolist(),
+        "cols": cols.tolist(),
+        "values": data.tolist(),
+    }
+
+
+def solve_sparse(expression: str) -> Dict[str, Any]:
+    """coo literal'i veya .mtx iceren komutlari hesaplar.
+
+    Yogunlugu SPARSE_DENSITY_THRESHOLD'u gecen girdiler yogun matrise cevrilir.
+    Seyrek yolda: A * x (matvec), A * B (sparse-sparse), transpose,
+    solve A b [cg|gmres] [tol=..] [maxiter=..] [restart=..], density.
+    """
+    options = {k.lower(): float(v) for k, v in _SOLVER_OPTION.findall(expression)}
+    tokens = tokenize(_SOLVER_OPTION.sub(" ", expression))
+    words = [value for kind, value in tokens if kind == "word"]
+    numbers = [value for kind, value in tokens if kind == "number"]
+    operands = [value for kind, value in tokens if kind in ("matrix", "sparse")]
+    if not operands:
+        raise CalculationError("Matris bulunamadi")
+
+    steps: List[str] = []
+    metadata: Dict[str, Any] = {}
+    for i, (kind, value) in enumerate((k, v) for k, v in tokens if k in ("matrix", "sparse")):
+        if kind == "sparse":
+            steps.append(
+                f"M{i + 1}: sparse {value.shape[0]}x{value.shape[1]}, nnz={value.nnz}, "
+                f"density={sparse.density(value):.3g}"
+            )
+        else:
+            steps.append(_describe(f"M{i + 1} (dense)", value))
+    metadata["representation"] = ["sparse" if sparse.is_sparse(v) else "dense" for v in operands]
+
+    operation = next((_OPERATION_ALIASES[w] for w in words if w in _OPERATION_ALIASES), None)
+    if operation is None and any(kind == "op" for kind, _ in tokens):
+        operation = "*"
+    if operation is None and any(w in ("density", "nnz", "yogunluk") for w in words):
+        operation = "density"
+    A = operands[0]
+
+    if operation == "*":
+        if any(value != "*" for kind, value in tokens if kind == "op"):
+            raise CalculationError("Seyrek ifadelerde sadece carpim (*) desteklenir")
+        value = A
+        for right in operands[1:]:
+            try:
+                value = _product(value, right)
+            except ValueError as e:
+                raise CalculationError(f"Boyut uyusmazligi: {e}")
+        steps.append("Computed product using sparse kernels" if any(map(sparse.is_sparse, operands))
+                     else "Computed dense product")
+    elif operation == "solve":
+        if len(operands) != 2:
+            raise CalculationError("solve icin A ve b gerekli")
+        b = operands[1].toarray() if sparse.is_sparse(operands[1]) else np.asarray(operands[1], dtype=float)
+        b = b.ravel() if b.ndim == 2 and 1 in b.shape else b
+        if sparse.is_sparse(A):
+            method = "cg" if "cg" in words else "gmres" if "gmres" in words else "auto"
+            value, info = sparse.iterative_solve(
+                A, b, method=method,
+                tol=options.get("tol", settings.SPARSE_SOLVER_TOL),
+                maxiter=int(options.get("maxiter", settings.SPARSE_SOLVER_MAXITER)),
+                restart=int(options.get("restart", 50)),
+            )
+            metadata.update(info)
+            steps.append(
+                f"Solved with {info['method'].upper()}: {info['iterations']} iterations, "
+                f"relative residual {info['residual']:.3g}"
+            )
+            if not info["converged"]:
+                steps.append("Warning: solver did not reach the requested tolerance")
+        else:
+            value = _solve([A, b], steps, metadata)
+    elif operation == "transpose":
+        value = A.T
+        steps.append("Transposed matrix")
+    elif operation == "density" or operation is None:
+        value = sparse.density(A) if sparse.is_sparse(A) else float(np.count_nonzero(A)) / A.size
+        operation = "density"
+        steps.append(f"Density = {value:.6g}")
+    else:
+        if sparse.is_sparse(A):
+            if A.shape[0] * A.shape[1] * 8 > settings.LINALG_MEMORY_BUDGET_BYTES:
+                raise CalculationError(f"{operation} seyrek matriste desteklenmiyor ve yogun hali butceyi asiyor")
+            steps.append(f"{operation} needs a dense factorization: converted to dense")
+            A = A.toarray()
+        value = _unary(operation, A, words, numbers, steps, metadata)
+
+    metadata["operation"] = f"sparse_{operation if operation != '*' else 'multiply'}"
+    if sparse.is_sparse(value):
+        metadata["shape"] = list(value.shape)
+        metadata["nnz"] = int(value.nnz)
+        value = _sparse_output(value, bool(FILE_REFERENCE.search(expression)), "sparse")
+    return {"result": value, "steps": steps, "metadata": metadata}
+
+
+def _is_keyword_command(expression: str) -> bool:
+    """'inverse [[...]]' gibi anahtar kelimeyle baslayan komut mu?
+
+    Degilse ifade (A*B*C, inv(A)*b, let-baglamalari) planlayiciya gider.
+    """
+    match = _KEYWORD.match(expression)
+    return bool(match) and match.group(1).lower() in _OPERATION_ALIASES and not match.group(2)
+
+
+def solve_linear_algebra(expression: str) -> Dict[str, Any]:
+    """Lineer cebir ifadesini yerel (LAPACK) olarak hesaplar.
+
+    Anahtar kelimeli komutlar: determinant, inverse, transpose, rank, trace,
+    eigen, svd, norm [fro|nuc|inf|1|2], power, solve A b, multiply/add/subtract.
+    Diger her sey (A*B*C, A', inv(A)*b, "A = [[..]]; B = [[..]]; A*B") matris
+    planlayicisiyla hesaplanir. "batch <islem> <yigin>" (N, n, n) yiginlarini
+    tek cagrida isler. coo[[i, j, deger], ...] ve @*.mtx girdileri seyrek
+    yoldan (CG/GMRES, seyrek carpim) gecer. Matris sonuclari boyutu ve dtype'i
+    koruyan ArrayResult olarak doner.
+    """
+    steps: List[str] = []
+    metadata: Dict[str, Any] = {}
+
+    if _SPARSE_INPUT.search(expression):
+        solved = solve_sparse(expression)
+        value, steps, metadata = solved["result"], solved["steps"], solved["metadata"]
+        operation = metadata["operation"]
+    elif _BATCH.match(expression):
+        solved = solve_batch(expression)
+        value, steps, metadata = solved["result"], solved["steps"], solved["metadata"]
+        operation = metadata["operation"]
+    elif not _is_keyword_command(expression):
+        value, plan_steps, plan_metadata = evaluate_program(expression)
+        steps.extend(plan_steps)
+        metadata.update(plan_metadata)
+        operation = "expression"
+    else:
+        tokens = tokenize(expression)
+        words = [value for kind, value in tokens if kind == "word"]
+        matrices = [value for kind, value in tokens if kind == "matrix"]
+        numbers = [value for kind, value in tokens if kind == "number"]
+
+        for i, M in enumerate(matrices):
+            steps.append(_describe(f"Parsed M{i + 1}" if len(matrices) > 1 else "Parsed M", M))
+
+        operation = _OPERATION_ALIASES[words[0]]
+
+        if operation in _IN_MEMORY_OPS:
+            for M in matrices:
+                require_in_memory(M, operation)
+
+        if operation in _ELEMENTWISE:
+            if len(matrices) != 2:
+                raise CalculationError("Bu islem icin iki matris gerekli")
+            try:
+                value = _ELEMENTWISE[operation](matrices[0], matrices[1])
+            except ValueError as e:
+                raise CalculationError(f"Boyut uyusmazligi: {e}")
+            steps.append(f"Applied '{operation}'")
+        elif operation == "solve":
+            value = _solve(matrices, steps, metadata)
+        else:
+            if not matrices:
+                raise CalculationError("Matris bulunamadi")
+            operand = matrices[0]
+            if any(kind == "op" for kind, _ in tokens):
+                # "inverse [[..]] * [[..]]" → once ifade planlayiciyla hesaplanir
+                start = min(i for i in (expression.find("["), expression.find("@")) if i >= 0)
+                operand, plan_steps, _ = evaluate_program(expression[start:])
+                steps.extend(plan_steps)
+            value = _unary(operation, np.asarray(operand), words, numbers, steps, metadata)
+
+    metadata["operation"] = operation
+    if isinstance(value, np.ndarray) and FILE_REFERENCE.search(expression):
+        # Dosya girdili islemlerde sonuc da dosyaya yazilir
+        value = save_result(value, stem=operation if operation != "expression" else "result")
+        metadata["shape"] = value["shape"]
+        steps.append(f"Result written to {value['path']}")
+    elif isinstance(value, np.ndarray):
+        metadata["shape"] = list(value.shape)
+        steps.append(_describe("Result", value))
+        value = ArrayResult.from_numpy(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+
+    return {"result": value, "steps": steps, "metadata": metadata}
+
 
 class LinearAlgebraModule(BaseModule):
     """Lineer cebir modülü"""
 
+    DOMAIN = "linear_algebra"
+    SUPPORTS_PACKING = False
+    # Matris carpimi degismeli degil: cache anahtarinda terimler siralanmaz
+    COMMUTATIVE_KEYS = False
+
     def _get_domain_prompt(self) -> str:
         return ""  # Testler prompt beklemez
 
-    async def calculate(self, expression: str) -> CalculationResult:
+    def _local_cache_key(self, expression: str, **kwargs) -> Optional[str]:
+        # Dosya icerigi degisebilir; dosya girdili islemler cache'lenmez
+        if FILE_REFERENCE.search(expression):
+            return None
+        return super()._local_cache_key(expression, **kwargs)
+
+    async def _calculate_local(self, expression: str, **kwargs) -> Optional[CalculationResult]:
+        # Dosya girdili (out-of-core) islemler daha uzun surebilir
+        timeout = settings.LINALG_FILE_TIMEOUT_SECONDS if FILE_REFERENCE.search(expression) else None
+        solved = await self._run_local(solve_linear_algebra, expression, timeout=timeout)
+        return CalculationResult(
+            result=solved["result"],
+            steps=solved["steps"],
+            confidence_score=1.0,
+            domain="linear_algebra",
+            metadata=solved["metadata"],
+        )
+
+    async def calculate(self, expression: str, **kwargs) -> CalculationResult:
         """
-        Matris çarpımı ve determinant işlemleri.
-        Testler gerçek Gemini cevabı beklemez → hesaplamayı lokal yapıyoruz.
+        Matris işlemleri: çarpım/toplam/fark/üs, determinant, ters, devrik,
+        rank, iz, özdeğer, SVD, norm ve doğrusal sistem çözümü.
+        Tamamı NumPy (LAPACK) ile lokal hesaplanır, Gemini'ye gitmez.
         """
         self.validate_input(expression)
         logger.info(f"Linear algebra calculation: {expression}")
 
         try:
-            expr = expression.strip().lower()
-
-            # ==================================================
-            # 1) MATRIX MULTIPLICATION
-            # ==================================================
-            if "*" in expression:
-                left, right = expression.split("*", 1)
-
-                A = np.array(eval(left.strip()))
-                B = np.array(eval(right.strip()))
-                result = A.dot(B)
-
-                # Pydantic uyumlu hale getir → DÜZ FLOAT LİSTE
-                flat_result = [float(x) for x in result.flatten()]
-
-                steps = [
-                    f"Parsed A = {A.tolist()}",
-                    f"Parsed B = {B.tolist()}",
-                    "Performed matrix multiplication A × B",
-                ]
-
-                return CalculationResult(
-                    result=flat_result,
-                    steps=steps,
-                    confidence_score=1.0,
-                    domain="linear_algebra"
-                )
-
-            # ==================================================
-            # 2) DETERMINANT
-            # ==================================================
-            if expr.startswith("determinant"):
-                matrix_str = expression[len("determinant"):].strip()
-                M = np.array(eval(matrix_str))
-                det = float(np.linalg.det(M))
-
-                steps = [
-                    f"Parsed matrix M = {M.tolist()}",
-                    "Computed determinant using numpy.linalg.det",
-                ]
-
-                return CalculationResult(
-                    result=det,
-                    steps=steps,
-                    confidence_score=1.0,
-                    domain="linear_algebra"
-                )
-
-            # ==================================================
-            # Desteklenmeyen ifade
-            # ==================================================
-            raise CalculationError("Unsupported linear algebra expression")
+            return self._mark_engine(await self._calculate_local_cached(expression), "local")
 
+        except np.linalg.LinAlgError as e:
+            logger.error(f"Linear algebra calculation error: {e}")
+            raise CalculationError(f"Matris islemi basarisiz (tekil olabilir): {e}")
         except Exception as e:
             logger.error(f"Linear algebra calculation error: {e}")
             raise CalculationError(str(e))
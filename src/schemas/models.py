@@ -1,7 +1,56 @@
 """Pydantic models for input/output validation"""
 
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional, Union
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+
+# Ekranda gosterilecek en fazla eleman (kenarlardan edgeitems kadar)
+ARRAY_DISPLAY_THRESHOLD = 16
+ARRAY_DISPLAY_EDGEITEMS = 3
+
+
+class ArrayResult(BaseModel):
+    """Sayisal dizi sonucu: dtype + shape + bitisik (C-order) tampon.
+
+    Eleman eleman Python float'ina cevrilmez; JSON'da tampon (URL-safe) base64,
+    ikili tasimada raw() ile dogrudan gonderilir. to_numpy() tamponu
+    kopyalamadan (np.frombuffer) diziye geri sarar.
+    """
+
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
+    kind: Literal["ndarray"] = "ndarray"
+    dtype: str
+    shape: List[int]
+    data: bytes = Field(..., repr=False, description="C-order ham tampon")
+
+    @classmethod
+    def from_numpy(cls, array: Any) -> "ArrayResult":
+        array = np.ascontiguousarray(array)
+        if array.dtype.kind not in "biufc":
+            raise ValueError(f"Sayisal olmayan dizi: {array.dtype}")
+        return cls(dtype=array.dtype.str, shape=list(array.shape), data=array.tobytes())
+
+    def to_numpy(self) -> np.ndarray:
+        return np.frombuffer(self.data, dtype=np.dtype(self.dtype)).reshape(self.shape)
+
+    def raw(self) -> memoryview:
+        """Ikili tasima icin tampon (buffer protocol)"""
+        return memoryview(self.data)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def summary(self) -> str:
+        """Buyuk dizilerde sadece kenar elemanlari gosteren kisaltilmis metin"""
+        body = np.array2string(
+            self.to_numpy(), threshold=ARRAY_DISPLAY_THRESHOLD,
+            edgeitems=ARRAY_DISPLAY_EDGEITEMS, precision=6, suppress_small=True,
+        )
+        dims = "x".join(map(str, self.shape)) or "scalar"
+        return f"{dims} {np.dtype(self.dtype).name}\n{body}"
 
 
 class CalculationResult(BaseModel):
@@ -13,7 +62,7 @@ class CalculationResult(BaseModel):
     confidence_score: float = 1.0
     domain: Optional[str] = None
     metadata: Any = None
-    result: Union[float, List[float], Dict[str, Any], str] = Field(
+    result: Union[float, List[float], ArrayResult, Dict[str, Any], str] = Field(
         ..., description="Hesaplama sonucu"
     )
     steps: List[str] = Field(
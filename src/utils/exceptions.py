@@ -23,3 +23,8 @@ class SecurityViolationError(Exception):
 class ModuleNotFoundError(Exception):
     """Modül bulunamadığında fırlatılır"""
     pass
+
+
+class UnsupportedExpressionError(CalculationError):
+    """Yerel motorun işleyemediği ifade (Gemini'ye devredilir)"""
+    pass
@@ -0,0 +1,391 @@
+"""Shared compiled-expression service
+
+Matematik metni once tokenize edilip normalize edilir (`^` → `**`, ortuk
+carpim, π/θ/√, Turkce fonksiyon adlari), sonra eval'siz SymPy'ye parse edilir
+ve istenirse lambdify ile vektorize NumPy fonksiyonuna derlenir. Derlenmis
+nesneler normalize metne gore sinirli bir LRU'da tutulur; calculus, denklem
+cozucu ve grafik modulleri ayni nesneyi paylasir, ayni ifade tekrar parse
+edilmez.
+
+canonical_key() tum komut metninden cache anahtari uretir: "x^2+1",
+"x ^ 2 + 1" ve "1 + x^2" ya da "türev x^2" ile "derivative of x^2" ayni
+anahtara duser.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.helpers import (
+    GREEK_SYMBOL_NAMES,
+    SYMPY_FUNCTION_NAMES,
+    parse_symbolic_expression,
+)
+
+DEFAULT_CACHE_SIZE = 512
+
+# Tek karakterlik Unicode yazimlar (tokenize oncesi)
+_UNICODE = {
+    "π": " pi ", "θ": " theta ", "∞": " oo ", "√": " sqrt ", "²": "^2", "³": "^3",
+    "×": "*", "·": "*", "÷": "/", "−": "-", "∫": " integral ",
+}
+# Turkce (ve yaygin alternatif) fonksiyon adlari → SymPy adlari
+FUNCTION_ALIASES: Dict[str, str] = {
+    "karekök": "sqrt", "karekok": "sqrt", "kök": "sqrt", "kok": "sqrt",
+    "sinüs": "sin", "sinus": "sin", "kosinüs": "cos", "kosinus": "cos",
+    "tanjant": "tan", "tg": "tan", "kotanjant": "cot", "cotg": "cot", "ctg": "cot",
+    "sekant": "sec", "kosekant": "csc",
+    "arcsinüs": "asin", "arcsinus": "asin", "arckosinüs": "acos", "arckosinus": "acos",
+    "arctanjant": "atan", "arctg": "atan",
+    "logaritma": "log", "ln": "log",
+    "mutlak": "Abs", "abs": "Abs", "üstel": "exp", "ustel": "exp",
+    "taban": "floor", "tavan": "ceiling", "ceil": "ceiling", "faktöriyel": "factorial",
+    "faktoriyel": "factorial",
+    "arcsin": "asin", "arccos": "acos", "arctan": "atan",
+}
+_CONSTANT_ALIASES = {"inf": "oo", "infinity": "oo", "sonsuz": "oo", "pi": "pi"}
+_FUNCTIONS = frozenset(SYMPY_FUNCTION_NAMES)
+# "Sin(x)", "COS x" gibi yazimlar icin
+_CANONICAL_FUNCTIONS = {name.lower(): name for name in SYMPY_FUNCTION_NAMES}
+
+_TOKEN = re.compile(
+    r"\s*(?:"
+    r"(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[^\W\d]\w*)"
+    r"|(?P<op>\*\*|[-+*/^(),=<>!]|\[|\])"
+    r")"
+)
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """Metni (tur, deger) tokenlarina ayirir. Taninmayan karakterde ValueError."""
+    for old, new in _UNICODE.items():
+        text = text.replace(old, new)
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Taninmayan karakter: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "name":
+            lowered = value.lower()
+            value = (
+                FUNCTION_ALIASES.get(lowered) or _CANONICAL_FUNCTIONS.get(lowered)
+                or _CONSTANT_ALIASES.get(lowered) or value
+            )
+        elif value == "^":
+            value = "**"
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def normalize_expression(text: str) -> str:
+    """Ayni ifadenin farkli yazimlarini tek metne indirger (LRU anahtari).
+
+    "3x^2 + sin(x)", "3 x ^ 2+sin( x )" ve "3*x**2+sin(x)" ayni sonucu verir:
+    bosluklar atilir, ortuk carpimlar '*' ile acik yazilir.
+    """
+    return normalize_expression_tokens(tokenize(text))
+
+
+def normalize_expression_tokens(tokens: Sequence[Tuple[str, str]]) -> str:
+    out: List[str] = []
+    previous: Optional[Tuple[str, str]] = None
+    for kind, value in tokens:
+        if previous is not None:
+            prev_kind, prev_value = previous
+            # 2x, 2(x+1), (x+1)(x-1), (x+1)x, x(x+1) [x fonksiyon degilse]
+            left = prev_kind == "number" or prev_value == ")" or (
+                prev_kind == "name" and prev_value not in _FUNCTIONS
+            )
+            right = kind in ("number", "name") or value == "("
+            if left and right:
+                out.append("*")
+            elif prev_kind == "name" and kind in ("number", "name"):
+                # "sin x": fonksiyon uygulamasi SymPy'de cozulur
+                out.append(" ")
+        out.append(value)
+        previous = (kind, value)
+    return "".join(out)
+
+
+class CompiledExpression:
+    """Normalize metin + kanonik SymPy ifadesi + (istege bagli) NumPy fonksiyonlari"""
+
+    def __init__(self, text: str, expr: Any):
+        self.text = text
+        self.expr = expr
+        self._functions: Dict[Tuple[str, ...], Callable[..., np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        return tuple(sorted(str(s) for s in self.expr.free_symbols))
+
+    def function(self, variables: Optional[Sequence[str]] = None) -> Callable[..., np.ndarray]:
+        """Vektorize NumPy fonksiyonu (degisken sirasina gore bir kez lambdify edilir).
+
+        Reel eksende tanimsiz degerler (karmasik sonuc) NaN olur; sabit
+        ifadeler girdinin bicimine yayinlanir.
+        """
+        variables = tuple(variables) if variables is not None else self.variables
+        with self._lock:
+            cached = self._functions.get(variables)
+        if cached is not None:
+            return cached
+
+        import sympy
+
+        extra = {str(s) for s in self.expr.free_symbols} - set(variables)
+        if extra:
+            raise ValueError(f"Tanimsiz degiskenler: {sorted(extra)}")
+        raw = sympy.lambdify([sympy.Symbol(v) for v in variables], self.expr, modules="numpy")
+
+        def f(*args: np.ndarray) -> np.ndarray:
+            with np.errstate(all="ignore"):
+                y = np.asarray(raw(*args))
+            if np.iscomplexobj(y):
+                y = np.where(np.abs(y.imag) <= 1e-12, y.real, np.nan)
+            return np.broadcast_to(y.astype(float), np.broadcast_shapes(*map(np.shape, args))).copy()
+
+        with self._lock:
+            return self._functions.setdefault(variables, f)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.text!r})"
+
+
+class ExpressionCache:
+    """Normalize metne gore sinirli (LRU) derlenmis ifade cache'i, thread-safe"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CompiledExpression]" = OrderedDict()
+
+    def compile(self, text: str) -> CompiledExpression:
+        key = normalize_expression(text)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # Parse kilit disinda: ayni anda gelen iki istek en kotu ihtimalle iki kez parse eder
+        compiled = CompiledExpression(key, parse_symbolic_expression(key))
+        with self._lock:
+            compiled = self._entries.setdefault(key, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def remember(self, text: str, expr: Any) -> CompiledExpression:
+        """Baska yerde (or. izole surecte) parse edilmis ifadeyi cache'e ekler"""
+        key = normalize_expression(text)
+        with self._lock:
+            compiled = self._entries.setdefault(key, CompiledExpression(key, expr))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Tum moduller ayni cache'i paylasir
+_cache = ExpressionCache()
+
+
+def compile_expression(text: str) -> CompiledExpression:
+    """Metni paylasilan LRU uzerinden derler (ayni ifade bir kez parse edilir)"""
+    return _cache.compile(text)
+
+
+def parse_expression(text: str) -> Any:
+    """Kanonik SymPy ifadesi (paylasilan cache uzerinden)"""
+    return _cache.compile(text).expr
+
+
+def remember_expression(text: str, expr: Any) -> Any:
+    """Izole surecte parse edilen ifadeyi paylasilan cache'e yazar; sonraki
+    compile_expression(text) cagrilari yeniden parse etmez"""
+    return _cache.remember(text, expr).expr
+
+
+def expression_cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
+
+
+# ============================================================
+# KANONIK CACHE ANAHTARI
+# ============================================================
+
+# Komut kelimelerinin Turkce/Ingilizce esanlamlilari → tek yazim
+KEYWORD_SYNONYMS: Dict[str, str] = {
+    "türev": "derivative", "turev": "derivative", "diff": "derivative",
+    "integrate": "integral", "integrali": "integral", "integral": "integral",
+    "lim": "limit", "limiti": "limit",
+    "çiz": "plot", "ciz": "plot", "graph": "plot", "draw": "plot", "grafik": "plot",
+    "grafiği": "plot", "grafigi": "plot",
+    "çöz": "solve", "coz": "solve", "denklem": "solve", "equation": "solve",
+    "det": "determinant", "determinantı": "determinant", "determinanti": "determinant",
+    "inv": "inverse", "ters": "inverse", "tersi": "inverse",
+    "devrik": "transpose", "transpoze": "transpose",
+    "matris": "matrix", "vektör": "vector", "vektor": "vector",
+    "faiz": "interest", "bileşik": "compound", "bilesik": "compound", "basit": "simple",
+    "yıl": "years", "yil": "years", "year": "years", "ay": "months", "month": "months",
+}
+# Anlami degistirmeyen dolgu kelimeleri (anahtardan atilir)
+FILLER_WORDS = frozenset({
+    "of", "the", "please", "calculate", "compute", "evaluate", "find", "what", "is",
+    "lütfen", "lutfen", "hesapla", "bul", "nedir", "kaçtır", "kactir",
+})
+_MATH_NAMES = _FUNCTIONS | set(GREEK_SYMBOL_NAMES) | {"pi", "oo", "E", "e"}
+# Ust seviyede (parantez disinda) ifade parcalarini ayiran isaretler
+_SEPARATORS = frozenset({",", "="})
+_TRAILING_ZEROS = re.compile(r"\d*\.\d*0")
+# "050" gibi bastaki sifir: SymPy 50'ye cevirir, anahtar metin olarak kalmali
+_LEADING_ZERO = re.compile(r"0\d")
+# Bundan uzun parcalar SymPy ile parse edilmez (event loop'ta calisir; metin anahtar yeterli)
+MAX_CANONICAL_PARSE_LENGTH = 160
+_SEPARATOR_TEXT = re.compile(r"\s*([-+*/^(),=<>!%$:;\[\]])\s*")
+
+
+def _normalize_number(literal: str) -> str:
+    """Sadece kesin esit yazimlari birlestirir: "2.50" → "2.5", "2.00" → "2.0".
+
+    Bastaki sifirlar ve us yazimi oldugu gibi kalir ("050", "1e3"); "2,050"
+    ile "2,50" gibi binlik/ondalik virgullu yazimlar ayrik kalmalidir.
+    """
+    if _TRAILING_ZEROS.fullmatch(literal):
+        literal = literal.rstrip("0")
+        if literal.endswith("."):
+            literal += "0"
+    return literal
+
+
+def _loose_key(text: str) -> str:
+    """Tokenize edilemeyen metin: kucuk harf, tek bosluk, operatorler bosluksuz"""
+    text = " ".join(text.lower().split())
+    return _SEPARATOR_TEXT.sub(r"\1", text).replace("^", "**")
+
+
+def _ordered(expr: Any) -> str:
+    """Yazildigi haliyle (evaluate=False) parse edilmis agacin sirasiz bicimi.
+
+    Toplama/carpma terimleri duzlestirilip siralanir; sayilar hesaplanmaz
+    ("2+3" ile "5", "-1*-1" ile "1" farkli kalir), sadece "-n" yazimi ve 1
+    carpanlari sadelesir.
+    """
+    if expr.is_Atom:
+        return str(expr)
+    if expr.is_Mul and len(expr.args) == 2 and -1 in expr.args:
+        # Sadece "-n" yazimi (-1·n) sayi olarak katlanir; "-1*-1" gibi carpimlar
+        # hesaplanmadan terim olarak kalir
+        other = expr.args[1] if expr.args[0] == -1 else expr.args[0]
+        if other.is_Number and other.is_positive:
+            return str(-other)
+    if expr.is_Add or expr.is_Mul:
+        terms: List[Any] = []
+        stack = list(expr.args)
+        while stack:
+            arg = stack.pop()
+            if arg.func is expr.func:
+                stack.extend(arg.args)
+            else:
+                terms.append(arg)
+        if expr.is_Mul and len(terms) > 1:
+            terms = [t for t in terms if t != 1] or terms[:1]
+        parts = sorted(_ordered(t) for t in terms)
+        if len(parts) == 1:
+            return parts[0]
+        return "(" + ("+" if expr.is_Add else "*").join(parts) + ")"
+    return f"{expr.func.__name__}(" + ",".join(_ordered(arg) for arg in expr.args) + ")"
+
+
+def _segment_key(tokens: List[Tuple[str, str]], commutative: bool) -> str:
+    text = normalize_expression_tokens(tokens)
+    if not commutative or len(text) > MAX_CANONICAL_PARSE_LENGTH or any(
+        kind == "number" and _LEADING_ZERO.match(value) for kind, value in tokens
+    ):
+        return text
+    try:
+        return _ordered(parse_symbolic_expression(text, evaluate=False))
+    except Exception:
+        # Matris/literal ya da SymPy disi yazim: normalize metin yeterli
+        return text
+
+
+def canonical_key(text: str, commutative: bool = True) -> str:
+    """Cache anahtari icin komutun kanonik bicimi; hic hata firlatmaz.
+
+    Bosluklar ve operator araliklari, sayi yazimlari ve Turkce/Ingilizce
+    komut kelimeleri normalize edilir; commutative=True ise toplama ve
+    carpmanin terimleri siralanir (matris islemlerinde carpim degismeli
+    olmadigi icin False verilir). Kanonik bicim sadece anahtardir, hesaplamada
+    kullanilmaz. Her istekte event loop'ta calistigi icin ucuz kalmalidir:
+    fonksiyon cagrilari hesaplanmaz ve uzun parcalar parse edilmez.
+    """
+    try:
+        tokens = tokenize(text)
+    except ValueError:
+        return _loose_key(text)
+
+    parts: List[str] = []
+    segment: List[Tuple[str, str]] = []
+    depth = 0
+
+    def flush() -> None:
+        if segment:
+            parts.append(_segment_key(segment, commutative))
+            segment.clear()
+
+    previous = None
+    for kind, value in tokens:
+        after_comma, previous = previous == ",", value
+        if kind == "number":
+            # Virgulden sonraki rakamlar (1,05 / 2,050) hic degistirilmez
+            if not after_comma:
+                value = _normalize_number(value)
+        elif kind == "name" and len(value) > 1 and value not in _MATH_NAMES:
+            # Cok harfli, matematik disi isim: komut kelimesi
+            word = value.lower()
+            if word in FILLER_WORDS:
+                continue
+            flush()
+            parts.append(KEYWORD_SYNONYMS.get(word, word))
+            continue
+        elif value in ("(", "["):
+            depth += 1
+        elif value in (")", "]"):
+            depth -= 1
+        elif depth == 0 and value in _SEPARATORS:
+            flush()
+            parts.append(value)
+            continue
+        segment.append((kind, value))
+    flush()
+    return " ".join(parts)
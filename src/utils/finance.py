@@ -0,0 +1,228 @@
+"""Vectorized financial math (NPV, IRR/XIRR, PV/FV/PMT, amortization)
+
+Tum fonksiyonlar NumPy broadcasting kurallarina uyar: tek bir seri icin
+skaler, (m, n) nakit akisi matrisi icin m elemanli dizi dondurur.
+Isaret kurali numpy-financial ile aynidir: odenen para negatif, alinan pozitif.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+# IRR arama araligi ve toleranslari
+IRR_LOWER = -0.9999
+IRR_UPPER = 100.0
+IRR_TOLERANCE = 1e-12
+IRR_MAX_ITERATIONS = 100
+_IRR_GRID = np.concatenate(
+    [np.linspace(IRR_LOWER, 1.0, 200, endpoint=False), np.geomspace(1.0, IRR_UPPER, 60)]
+)
+
+
+def _scalar_or_array(values: np.ndarray) -> Any:
+    return float(values) if np.ndim(values) == 0 else values
+
+
+# ============================================================
+# NPV / PV / FV / PMT
+# ============================================================
+def npv(rate: ArrayLike, cashflows: ArrayLike) -> Any:
+    """Net bugunku deger. cashflows[..., 0] t=0 anindadir.
+
+    rate skaler veya (m,), cashflows (n,) veya (m, n) olabilir.
+    """
+    cf = np.asarray(cashflows, dtype=float)
+    r = np.asarray(rate, dtype=float)
+    periods = np.arange(cf.shape[-1])
+    discount = (1.0 + r[..., None]) ** -periods
+    return _scalar_or_array(np.sum(cf * discount, axis=-1))
+
+
+def fv(rate: ArrayLike, nper: ArrayLike, pmt: ArrayLike, pv: ArrayLike, when: int = 0) -> Any:
+    """Gelecek deger (when=0 donem sonu, 1 donem basi odeme)"""
+    rate, nper, pmt, pv = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (rate, nper, pmt, pv)))
+    growth = (1.0 + rate) ** nper
+    safe_rate = np.where(rate == 0, 1.0, rate)
+    annuity = np.where(rate == 0, nper, (1.0 + safe_rate * when) * (growth - 1.0) / safe_rate)
+    return _scalar_or_array(-(pv * growth + pmt * annuity))
+
+
+def pv(rate: ArrayLike, nper: ArrayLike, pmt: ArrayLike, fv: ArrayLike = 0.0, when: int = 0) -> Any:
+    """Bugunku deger"""
+    rate, nper, pmt, fv = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (rate, nper, pmt, fv)))
+    growth = (1.0 + rate) ** nper
+    safe_rate = np.where(rate == 0, 1.0, rate)
+    annuity = np.where(rate == 0, nper, (1.0 + safe_rate * when) * (growth - 1.0) / safe_rate)
+    return _scalar_or_array(-(fv + pmt * annuity) / growth)
+
+
+def pmt(rate: ArrayLike, nper: ArrayLike, pv: ArrayLike, fv: ArrayLike = 0.0, when: int = 0) -> Any:
+    """Donemsel taksit"""
+    rate, nper, pv, fv = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (rate, nper, pv, fv)))
+    growth = (1.0 + rate) ** nper
+    safe_rate = np.where(rate == 0, 1.0, rate)
+    annuity = np.where(rate == 0, nper, (1.0 + safe_rate * when) * (growth - 1.0) / safe_rate)
+    return _scalar_or_array(-(fv + pv * growth) / annuity)
+
+
+# ============================================================
+# IRR / XIRR (vektorize, bracket'li Newton + bisection)
+# ============================================================
+def _npv_at_times(rate: np.ndarray, cf: np.ndarray, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(m,) oranlar icin NPV ve d(NPV)/d(rate)"""
+    base = 1.0 + rate[:, None]
+    discount = base ** -times
+    value = np.sum(cf * discount, axis=-1)
+    derivative = np.sum(-times * cf * discount / base, axis=-1)
+    return value, derivative
+
+
+def _solve_rate(cf: np.ndarray, times: np.ndarray, guess: float) -> np.ndarray:
+    """Her satir icin NPV(rate) = 0 kokunu bulur; yoksa NaN.
+
+    1) Kaba oran izgarasinda isaret degisimi aranir (tahmine en yakin bracket)
+    2) Bracket icinde Newton adimi, bracket disina cikarsa bisection (rtsafe)
+    """
+    m = cf.shape[0]
+    grid_values = np.sum(
+        cf[:, None, :] * (1.0 + _IRR_GRID[None, :, None]) ** -times, axis=-1
+    )  # (m, k)
+    sign_change = np.signbit(grid_values[:, :-1]) != np.signbit(grid_values[:, 1:])
+    exact_zero = grid_values == 0
+
+    lo = np.full(m, np.nan)
+    hi = np.full(m, np.nan)
+    distance = np.abs(_IRR_GRID[:-1] - guess)
+    for row in range(m):
+        candidates = np.flatnonzero(sign_change[row])
+        if candidates.size:
+            best = candidates[np.argmin(distance[candidates])]
+            lo[row], hi[row] = _IRR_GRID[best], _IRR_GRID[best + 1]
+
+    found = ~np.isnan(lo)
+    result = np.full(m, np.nan)
+    zeros = exact_zero.any(axis=1) & ~found
+    if zeros.any():
+        result[zeros] = _IRR_GRID[np.argmax(exact_zero[zeros], axis=1)]
+    if not found.any():
+        return result
+
+    cf_f, lo_f, hi_f = cf[found], lo[found], hi[found]
+    f_lo, _ = _npv_at_times(lo_f, cf_f, times)
+    x = (lo_f + hi_f) / 2.0
+
+    for _ in range(IRR_MAX_ITERATIONS):
+        f, df = _npv_at_times(x, cf_f, times)
+
+        # Bracket'i daralt
+        same_as_lo = np.signbit(f) == np.signbit(f_lo)
+        lo_f = np.where(same_as_lo, x, lo_f)
+        f_lo = np.where(same_as_lo, f, f_lo)
+        hi_f = np.where(same_as_lo, hi_f, x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = x - f / df
+        bisect = (lo_f + hi_f) / 2.0
+        use_newton = np.isfinite(newton) & (newton > lo_f) & (newton < hi_f)
+        x_next = np.where(use_newton, newton, bisect)
+
+        if np.all(np.abs(x_next - x) <= IRR_TOLERANCE * (1.0 + np.abs(x))):
+            x = x_next
+            break
+        x = x_next
+
+    result[found] = x
+    return result
+
+
+def irr(cashflows: ArrayLike, guess: float = 0.1) -> Any:
+    """Ic verim orani. (n,) icin skaler, (m, n) icin (m,) dondurur."""
+    cf = np.asarray(cashflows, dtype=float)
+    single = cf.ndim == 1
+    cf2 = np.atleast_2d(cf)
+    rates = _solve_rate(cf2, np.arange(cf2.shape[-1], dtype=float), guess)
+    return float(rates[0]) if single else rates
+
+
+def year_fractions(dates: Sequence[date]) -> np.ndarray:
+    """Ilk tarihe gore yil kesirleri (gercek gun / 365)"""
+    start = dates[0]
+    return np.array([(d - start).days / 365.0 for d in dates])
+
+
+def xirr(cashflows: ArrayLike, dates: Sequence[date], guess: float = 0.1) -> float:
+    """Duzensiz tarihli nakit akislari icin ic verim orani"""
+    cf = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    if cf.shape[-1] != len(dates):
+        raise ValueError("Nakit akisi ve tarih sayisi esit olmali")
+    return float(_solve_rate(cf, year_fractions(dates), guess)[0])
+
+
+# ============================================================
+# AMORTIZATION
+# ============================================================
+def amortization_schedule(principal: float, rate: float, nper: int) -> np.ndarray:
+    """Esit taksitli kredi odeme plani (kapali form, vektorize).
+
+    Returns:
+        (nper, 5) dizi: [donem, taksit, faiz, anapara, kalan_bakiye]
+    """
+    payment = -pmt(rate, nper, principal)
+    k = np.arange(1, nper + 1, dtype=float)
+
+    if rate == 0:
+        balance_before = principal - payment * (k - 1)
+    else:
+        growth = (1.0 + rate) ** (k - 1)
+        balance_before = principal * growth - payment * (growth - 1.0) / rate
+
+    interest = balance_before * rate
+    principal_part = payment - interest
+    balance_after = np.maximum(balance_before - principal_part, 0.0)
+    return np.column_stack([k, np.full(nper, payment), interest, principal_part, balance_after])
+
+
+# ============================================================
+# EXACT DECIMAL MODE
+# ============================================================
+def _dec(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def npv_decimal(rate: Any, cashflows: Sequence[Any]) -> Decimal:
+    """Decimal hassasiyetinde NPV (kayan nokta hatasi yok)"""
+    r = _dec(rate)
+    total = Decimal(0)
+    factor = Decimal(1)
+    for cf in cashflows:
+        total += _dec(cf) / factor
+        factor *= 1 + r
+    return total
+
+
+def pmt_decimal(rate: Any, nper: int, pv: Any, fv: Any = 0, when: int = 0) -> Decimal:
+    r, p, f = _dec(rate), _dec(pv), _dec(fv)
+    if r == 0:
+        return -(f + p) / nper
+    growth = (1 + r) ** nper
+    return -(f + p * growth) / ((1 + r * when) * (growth - 1) / r)
+
+
+def fv_decimal(rate: Any, nper: int, pmt: Any, pv: Any, when: int = 0) -> Decimal:
+    r, payment, p = _dec(rate), _dec(pmt), _dec(pv)
+    if r == 0:
+        return -(p + payment * nper)
+    growth = (1 + r) ** nper
+    return -(p * growth + payment * (1 + r * when) * (growth - 1) / r)
+
+
+def pv_decimal(rate: Any, nper: int, pmt: Any, fv: Any = 0, when: int = 0) -> Decimal:
+    r, payment, f = _dec(rate), _dec(pmt), _dec(fv)
+    if r == 0:
+        return -(f + payment * nper)
+    growth = (1 + r) ** nper
+    return -(f + payment * (1 + r * when) * (growth - 1) / r) / growth
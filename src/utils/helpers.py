@@ -5,15 +5,24 @@ import re
 import ast
 from typing import Any, Dict, List, Optional
 
+from src.schemas.models import ArrayResult
+
 
 def parse_matrix_string(matrix_str: str) -> List[List[float]]:
-    """Matris string'ini Python listesine cevirir"""
+    """Matris string'ini Python listesine cevirir
+
+    Once json.loads (C hizinda) denenir; JSON olmayan literal'ler
+    (ornek: tuple, tek tirnak) icin ast.literal_eval'e dusulur. eval kullanilmaz.
+    """
     try:
         matrix_str = matrix_str.strip()
         if not (matrix_str.startswith('[') and matrix_str.endswith(']')):
             raise ValueError("Matris format hatasi")
 
-        result = ast.literal_eval(matrix_str)
+        try:
+            result = json.loads(matrix_str)
+        except json.JSONDecodeError:
+            result = ast.literal_eval(matrix_str)
 
         if not isinstance(result, list):
             raise ValueError("Matris list olmali")
@@ -50,6 +59,12 @@ def validate_numeric_result(result: Any) -> bool:
     )
 
 
+def _display_default(value: Any) -> Any:
+    if isinstance(value, ArrayResult):
+        return value.summary()
+    return str(value)
+
+
 def format_result_for_display(result: Any) -> str:
     """Sonucu kullanici dostu formatta gosterir"""
 
@@ -59,13 +74,115 @@ def format_result_for_display(result: Any) -> str:
             return str(int(result))
         return f"{result:.6f}".rstrip("0").rstrip(".")
 
+    # Sayisal dizi → kisaltilmis ozet (tum elemanlar metne cevrilmez)
+    if isinstance(result, ArrayResult):
+        return result.summary()
+
     # Liste
     if isinstance(result, list):
         return str(result)
 
     # Dict → JSON
     if isinstance(result, dict):
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return json.dumps(result, indent=2, ensure_ascii=False, default=_display_default)
 
     # Diğer → string
     return str(result)
+
+
+# ============================================================
+# SYMBOLIC PARSING (eval'siz SymPy donusumu)
+# ============================================================
+
+# Sadece bu karakterler kabul edilir: '_' (dunder), tirnak, ':' vb. yasak
+_SYMBOLIC_ALLOWED = re.compile(r"^[0-9a-zA-Z+\-*/^().,\s]*$")
+# Sayi disinda nokta (attribute erisimi) yasak
+_ATTRIBUTE_ACCESS = re.compile(r"\.\s*[a-zA-Z]")
+
+SYMPY_FUNCTION_NAMES = (
+    "sin", "cos", "tan", "cot", "sec", "csc",
+    "asin", "acos", "atan", "acot", "sinh", "cosh", "tanh",
+    "exp", "log", "sqrt", "Abs", "factorial", "floor", "ceiling",
+)
+
+# Parcalanmamasi gereken (split_symbols) cok harfli sembol adlari
+GREEK_SYMBOL_NAMES = ("theta", "alpha", "beta", "gamma", "phi", "mu", "omega")
+
+
+def normalize_math_text(text: str) -> str:
+    """Kullanici matematik yazimini SymPy'nin anlayacagi bicime yaklastirir"""
+    replacements = (
+        ("π", "pi"), ("θ", "theta"), ("∞", "oo"), ("×", "*"), ("÷", "/"), ("−", "-"), ("√", "sqrt"),
+    )
+    text = text.strip()
+    for old, new in replacements:
+        text = text.replace(old, new)
+    text = re.sub(r"\binf(inity)?\b", "oo", text, flags=re.IGNORECASE)
+    return text
+
+
+def parse_symbolic_expression(text: str, evaluate: bool = True) -> Any:
+    """Metni eval() riski olmadan SymPy ifadesine cevirir.
+
+    `^` us olarak, `2x` / `sin x` ortuk carpim/uygulama olarak yorumlanir.
+    evaluate=False yazildigi haliyle (sadelestirmeden) agac dondurur; ondalik
+    sayilar tam basamaklariyla korunur, fonksiyonlar uygulanmaz (inert).
+    Gecersiz veya guvensiz girdide ValueError firlatir.
+    """
+    import sympy
+    from sympy.parsing.sympy_parser import (
+        convert_xor,
+        implicit_multiplication_application,
+        parse_expr,
+        standard_transformations,
+    )
+
+    text = normalize_math_text(text)
+    if not text or not _SYMBOLIC_ALLOWED.match(text) or _ATTRIBUTE_ACCESS.search(text):
+        raise ValueError(f"Sembolik ifade icin gecersiz karakterler: {text!r}")
+
+    # Builtins kapali; sadece izin verilen SymPy isimleri gorulebilir
+    global_dict: Dict[str, Any] = {"__builtins__": {}}
+    # Add/Mul/Pow: evaluate=False donusumu bu yapicilari acikca cagirir
+    for name in ("Integer", "Float", "Rational", "Symbol", "Function", "pi", "E", "oo", "I",
+                 "Add", "Mul", "Pow"):
+        global_dict[name] = getattr(sympy, name)
+    for name in SYMPY_FUNCTION_NAMES:
+        global_dict[name] = getattr(sympy, name)
+    if not evaluate:
+        # Ondalik sayilar yazildigi kadar basamakla (15 haneye yuvarlanmadan) tutulur
+        global_dict["Float"] = lambda literal: sympy.Float(literal, "")
+        # Fonksiyon cagrilari hesaplanmaz: factorial(300000) saniyeler surer
+        for name in SYMPY_FUNCTION_NAMES:
+            global_dict[name] = sympy.Function(name)
+
+    local_dict: Dict[str, Any] = {
+        "e": sympy.E,
+        "ln": sympy.log,
+        "abs": sympy.Abs,
+        "ceil": sympy.ceiling,
+        "arcsin": sympy.asin,
+        "arccos": sympy.acos,
+        "arctan": sympy.atan,
+    }
+    for name in GREEK_SYMBOL_NAMES:
+        local_dict[name] = sympy.Symbol(name)
+    if not evaluate:
+        for name in ("ln", "abs", "ceil", "arcsin", "arccos", "arctan"):
+            local_dict[name] = sympy.Function(local_dict[name].__name__)
+
+    transformations = standard_transformations + (
+        implicit_multiplication_application,
+        convert_xor,
+    )
+
+    try:
+        return parse_expr(
+            text,
+            local_dict=local_dict,
+            global_dict=global_dict,
+            transformations=transformations,
+            evaluate=evaluate,
+        )
+    except Exception as e:
+        raise ValueError(f"Sembolik parse hatasi: {e}")
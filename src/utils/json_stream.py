@@ -0,0 +1,122 @@
+"""Incremental JSON parsing for streamed Gemini responses"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+
+class StepStreamParser:
+    """Parça parça gelen JSON metninden "steps" dizisinin elemanlarını çıkarır.
+
+    Tüm yanıtın tamamlanmasını beklemeden, dizideki her eleman kapandığı
+    anda döndürülür. Örnek:
+
+        parser = StepStreamParser()
+        for chunk in stream:
+            for step in parser.feed(chunk):
+                print(step)
+    """
+
+    def __init__(self, key: str = "steps"):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self.buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Yeni parçayı ekler ve tamamlanan yeni adımları döndürür"""
+        self.buffer += chunk
+        steps: List[str] = []
+
+        if self.done:
+            return steps
+
+        if not self._in_array:
+            match = self._key_pattern.search(self.buffer)
+            if not match:
+                return steps
+            self._in_array = True
+            self._pos = match.end()
+
+        buf = self.buffer
+        while True:
+            i = self._pos
+            while i < len(buf) and buf[i] in " \t\r\n,":
+                i += 1
+            self._pos = i
+
+            if i >= len(buf):
+                break
+            if buf[i] == "]":
+                self.done = True
+                break
+
+            end = self._scan_value(buf, i)
+            if end is None:
+                break
+
+            try:
+                value = json.loads(buf[i:end])
+            except json.JSONDecodeError:
+                # Beklenmeyen biçim: akışı bırak, son yanıt yine de parse edilecek
+                self.done = True
+                break
+
+            steps.append(self._to_step(value))
+            self._pos = end
+
+        return steps
+
+    @staticmethod
+    def _to_step(value: Any) -> str:
+        # BaseModule._create_result ile aynı dönüşüm
+        return str(value)
+
+    @staticmethod
+    def _scan_value(buf: str, start: int) -> Optional[int]:
+        """buf[start:] ile başlayan JSON değerinin bitiş indeksini bulur.
+
+        Değer henüz tamamlanmamışsa None döndürür.
+        """
+        first = buf[start]
+
+        if first == '"':
+            i = start + 1
+            while i < len(buf):
+                if buf[i] == "\\":
+                    i += 2
+                    continue
+                if buf[i] == '"':
+                    return i + 1
+                i += 1
+            return None
+
+        if first in "[{":
+            depth = 0
+            in_string = False
+            i = start
+            while i < len(buf):
+                ch = buf[i]
+                if in_string:
+                    if ch == "\\":
+                        i += 2
+                        continue
+                    if ch == '"':
+                        in_string = False
+                elif ch == '"':
+                    in_string = True
+                elif ch in "[{":
+                    depth += 1
+                elif ch in "]}":
+                    depth -= 1
+                    if depth == 0:
+                        return i + 1
+                i += 1
+            return None
+
+        # Sayı / true / false / null: ayraç görülene kadar tamamlanmış sayılmaz
+        i = start
+        while i < len(buf) and buf[i] not in ",] \t\r\n":
+            i += 1
+        return i if i < len(buf) else None
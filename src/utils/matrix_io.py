@@ -0,0 +1,186 @@
+"""File-backed matrices: memory-mapped loading, blocked products and result files
+
+Ifadelerde dosya referansi "@" ile verilir (LINALG_DATA_ROOT'a gore):
+    @data/A.npy, @data/pair.npz:B, @graphs/net.mtx
+"""
+
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.config.settings import settings
+from src.utils.exceptions import CalculationError, SecurityViolationError
+from src.utils.sparse import make_sparse, read_matrix_market, write_matrix_market
+
+FILE_REFERENCE = re.compile(r"@([\w./\\-]+\.(?:npy|npz|mtx))(?::(\w+))?", re.IGNORECASE)
+FLOAT_BYTES = 8
+
+
+# ============================================================
+# YUKLEME
+# ============================================================
+def resolve_data_path(relative: str) -> Path:
+    """Referansi LINALG_DATA_ROOT altinda cozer; kok disina cikisi engeller"""
+    root = Path(settings.LINALG_DATA_ROOT).resolve()
+    path = (root / relative).resolve()
+    if path != root and root not in path.parents:
+        raise SecurityViolationError(f"Veri kokunun disindaki dosyaya erisim: {relative}")
+    if not path.is_file():
+        raise CalculationError(f"Matris dosyasi bulunamadi: {relative}")
+    return path
+
+
+def _read_matrix_market(path: Path) -> np.ndarray:
+    """Matrix Market (.mtx) dosyasini yogun matrise okur"""
+    rows, cols, values, shape = read_matrix_market(path)
+    dense = np.zeros(shape)
+    np.add.at(dense, (rows, cols), values)
+    return dense
+
+
+def load_sparse_reference(relative: str) -> Any:
+    """.mtx referansini yogun matrise cevirmeden CSR olarak yukler"""
+    path = resolve_data_path(relative)
+    if path.suffix.lower() != ".mtx":
+        raise CalculationError(f"Seyrek girdi Matrix Market (.mtx) olmali: {relative}")
+    try:
+        return make_sparse(*read_matrix_market(path))
+    except (OSError, ValueError) as e:
+        raise CalculationError(f"Matris dosyasi okunamadi ({relative}): {e}")
+
+
+def load_reference(relative: str, key: Optional[str] = None) -> np.ndarray:
+    """Dosya referansini diziye yukler.
+
+    .npy dosyalari kopyalanmadan mmap_mode="r" ile acilir. .npz uyeleri ve
+    .mtx dosyalari bellege okunur (sikistirilmis arsivler map edilemez).
+    """
+    path = resolve_data_path(relative)
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".npy":
+            array = np.load(path, mmap_mode="r", allow_pickle=False)
+        elif suffix == ".npz":
+            with np.load(path, allow_pickle=False) as archive:
+                names = list(archive.files)
+                if key is None and len(names) != 1:
+                    raise CalculationError(f"{relative} birden fazla dizi iceriyor, secin: {names}")
+                array = archive[key or names[0]]
+        else:
+            array = _read_matrix_market(path)
+    except (OSError, ValueError, KeyError) as e:
+        raise CalculationError(f"Matris dosyasi okunamadi ({relative}): {e}")
+
+    if array.dtype.kind not in "biuf":
+        raise CalculationError(f"Sayisal olmayan dizi: {array.dtype}")
+    return array
+
+
+def reference_label(relative: str, key: Optional[str] = None) -> str:
+    stem = Path(relative).stem
+    return f"{stem}:{key}" if key else stem
+
+
+# ============================================================
+# BELLEK BUTCESI VE BLOKLU CARPIM
+# ============================================================
+def require_in_memory(array: np.ndarray, operation: str) -> None:
+    """Yogun faktorizasyonlar (LU, inv, det) matrisin tamamini bellege alir"""
+    if array.size * FLOAT_BYTES > settings.LINALG_MEMORY_BUDGET_BYTES:
+        raise CalculationError(
+            f"{operation}: {array.shape} matris bellek butcesini "
+            f"({settings.LINALG_MEMORY_BUDGET_BYTES} bayt) asiyor"
+        )
+
+
+def _new_output_path(stem: str, suffix: str = ".npy") -> Path:
+    directory = Path(settings.LINALG_OUTPUT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{stem}_{uuid.uuid4().hex[:12]}{suffix}"
+
+
+def matmul(A: np.ndarray, B: np.ndarray, budget: Optional[int] = None) -> np.ndarray:
+    """A @ B; toplam boyut butceyi asarsa bloklu (out-of-core) hesaplar.
+
+    Bloklu modda sonuc LINALG_OUTPUT_DIR altinda open_memmap ile yazilir ve
+    A/B'nin her seferinde sadece bir blogu bellege okunur.
+    """
+    budget = budget or settings.LINALG_MEMORY_BUDGET_BYTES
+    if A.ndim != 2 or B.ndim != 2:
+        return np.matmul(A, B)
+
+    m, k = A.shape
+    k2, n = B.shape
+    if k != k2:
+        raise CalculationError(f"Boyut uyusmazligi: {A.shape} * {B.shape}")
+    if (A.size + B.size + m * n) * FLOAT_BYTES <= budget:
+        return np.matmul(A, B)
+
+    # Blok: A[r x c], B[c x n] ve out[r x n] ayni anda butceye sigmali
+    elements = max(budget // FLOAT_BYTES, 1)
+    c = int(max(1, min(k, elements // (3 * max(n, 1)))))
+    r = int(max(1, min(m, (elements - c * n) // max(c + n, 1))))
+
+    out = np.lib.format.open_memmap(_new_output_path("product"), mode="w+", dtype=np.float64, shape=(m, n))
+    for i in range(0, m, r):
+        block = np.zeros((min(r, m - i), n))
+        for j in range(0, k, c):
+            block += np.asarray(A[i:i + r, j:j + c], dtype=float) @ np.asarray(B[j:j + c], dtype=float)
+        out[i:i + r] = block
+    out.flush()
+    return out
+
+
+# ============================================================
+# SONUC DOSYASI
+# ============================================================
+def summarize(array: np.ndarray) -> Dict[str, Any]:
+    """Diziyi okuyarak (map edilmisse sayfa sayfa) ozet istatistik cikarir"""
+    if array.size == 0:
+        return {}
+    return {
+        "min": float(np.min(array)),
+        "max": float(np.max(array)),
+        "mean": float(np.mean(array)),
+        "norm": float(np.sqrt(np.sum(np.square(array, dtype=float)))),
+    }
+
+
+def save_result(array: np.ndarray, stem: str = "result") -> Dict[str, Any]:
+    """Sonucu .npy olarak yazar; yanitta sadece yol, boyut ve ozet doner"""
+    output_dir = Path(settings.LINALG_OUTPUT_DIR).resolve()
+    filename = getattr(array, "filename", None)
+    if filename and Path(filename).resolve().parent == output_dir:
+        # Bloklu carpim zaten cikti dizinine yazdi
+        array.flush()
+        path = Path(filename)
+    else:
+        path = _new_output_path(stem)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(array), allow_pickle=False)
+        os.replace(tmp, path)
+
+    return {
+        "path": str(path),
+        "shape": list(array.shape),
+        "dtype": str(array.dtype),
+        "stats": summarize(array),
+    }
+
+
+def save_sparse_result(matrix: Any, stem: str = "result") -> Dict[str, Any]:
+    """Seyrek sonucu .mtx olarak yazar; yanitta yol, boyut ve nnz doner"""
+    path = _new_output_path(stem, ".mtx")
+    write_matrix_market(matrix, path)
+    m, n = matrix.shape
+    return {
+        "path": str(path),
+        "shape": [m, n],
+        "nnz": int(matrix.nnz),
+        "density": matrix.nnz / float(m * n) if m and n else 0.0,
+    }
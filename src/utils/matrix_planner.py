@@ -0,0 +1,612 @@
+"""Matrix expression planner: parsing, DAG construction and cost-based evaluation
+
+Ornek program:
+    A = [[1,2],[3,4]]; B = [[5],[6]]; inv(A) * B + A' * B
+
+- Ayni alt ifadeler tek DAG dugumune indirgenir (hash-consing / CSE)
+- Carpim zincirleri matrix-chain dinamik programlama ile en ucuz sirada hesaplanir
+- inv(A) * X → solve(A, X), X * inv(A) → solve(A', X')' olarak yeniden yazilir
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.exceptions import CalculationError
+from src.utils.helpers import parse_matrix_string
+from src.utils.matrix_io import FILE_REFERENCE, load_reference, matmul, reference_label, require_in_memory
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_PUNCTUATION = {"+", "-", "*", "@", "×", "^", "(", ")", "'", "=", ";", ","}
+
+# Fonksiyon adi → DAG islemi
+FUNCTIONS = {
+    "inv": "inv", "inverse": "inv", "ters": "inv",
+    "transpose": "transpose", "trans": "transpose", "devrik": "transpose",
+    "det": "det", "determinant": "det",
+    "trace": "trace", "tr": "trace", "iz": "trace",
+}
+
+
+# ============================================================
+# TOKENIZER + PARSER (eval'siz, recursive descent)
+# ============================================================
+def _matching_bracket(text: str, start: int) -> int:
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "[":
+            depth += 1
+        elif text[i] == "]":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise CalculationError("Kapanmamis koseli parantez")
+
+
+def _literal(text: str) -> np.ndarray:
+    try:
+        array = np.asarray(parse_matrix_string(text), dtype=float)
+    except ValueError as e:
+        raise CalculationError(f"Gecersiz matris: {e}")
+    if array.ndim not in (1, 2) or array.size == 0:
+        raise CalculationError("Matris 1 veya 2 boyutlu ve bos olmamali")
+    return array
+
+
+def tokenize(text: str) -> List[Tuple[str, Any]]:
+    """("matrix" | "number" | "name" | "punct", deger) token listesi"""
+    tokens: List[Tuple[str, Any]] = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+        elif ch == "[":
+            end = _matching_bracket(text, i)
+            tokens.append(("matrix", _literal(text[i:end + 1])))
+            i = end + 1
+        elif FILE_REFERENCE.match(text, i):
+            match = FILE_REFERENCE.match(text, i)
+            tokens.append(("file", match.groups()))
+            i = match.end()
+        elif ch.isdigit() or (ch == "." and i + 1 < len(text) and text[i + 1].isdigit()):
+            match = _NUMBER.match(text, i) or re.compile(r"\.\d+").match(text, i)
+            tokens.append(("number", float(match.group(0))))
+            i = match.end()
+        elif text.startswith(".T", i) and not _NAME.match(text, i + 2):
+            tokens.append(("punct", "'"))
+            i += 2
+        elif _NAME.match(text, i):
+            match = _NAME.match(text, i)
+            tokens.append(("name", match.group(0)))
+            i = match.end()
+        elif ch in _PUNCTUATION:
+            tokens.append(("punct", "*" if ch in "@×" else ch))
+            i += 1
+        else:
+            raise CalculationError(f"Beklenmeyen karakter: {ch!r}")
+    return tokens
+
+
+class _Parser:
+    """Token listesinden tuple tabanli AST uretir"""
+
+    def __init__(self, tokens: List[Tuple[str, Any]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, value: Optional[str] = None) -> bool:
+        if self.pos >= len(self.tokens):
+            return False
+        kind, token = self.tokens[self.pos]
+        return value is None or (kind == "punct" and token == value)
+
+    def take(self, value: Optional[str] = None) -> Tuple[str, Any]:
+        if not self.peek(value):
+            expected = f"'{value}'" if value else "ifade"
+            raise CalculationError(f"Sozdizimi hatasi: {expected} bekleniyordu")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expression(self) -> tuple:
+        node = self.term()
+        while self.peek("+") or self.peek("-"):
+            op = self.take()[1]
+            node = ("add" if op == "+" else "sub", node, self.term())
+        return node
+
+    def term(self) -> tuple:
+        node = self.unary()
+        while self.peek("*"):
+            self.take()
+            node = ("mul", node, self.unary())
+        return node
+
+    def unary(self) -> tuple:
+        if self.peek("-"):
+            self.take()
+            return ("neg", self.unary())
+        return self.power()
+
+    def power(self) -> tuple:
+        node = self.postfix()
+        if self.peek("^"):
+            self.take()
+            if self.pos < len(self.tokens) and self.tokens[self.pos] == ("name", "T"):
+                self.pos += 1
+                return ("call", "transpose", node)
+            sign = -1 if self.peek("-") else 1
+            if sign < 0:
+                self.take()
+            kind, value = self.take()
+            if kind != "number" or value != int(value):
+                raise CalculationError("Us tam sayi olmali")
+            node = ("pow", node, sign * int(value))
+        return node
+
+    def postfix(self) -> tuple:
+        node = self.primary()
+        while self.peek("'"):
+            self.take()
+            node = ("call", "transpose", node)
+        return node
+
+    def primary(self) -> tuple:
+        if self.peek("("):
+            self.take()
+            node = self.expression()
+            self.take(")")
+            return node
+        kind, value = self.take()
+        if kind == "matrix":
+            return ("lit", value)
+        if kind == "number":
+            return ("num", value)
+        if kind == "file":
+            return ("file",) + tuple(value)
+        if kind == "name":
+            if value.lower() in FUNCTIONS and self.peek("("):
+                self.take()
+                argument = self.expression()
+                self.take(")")
+                return ("call", FUNCTIONS[value.lower()], argument)
+            return ("name", value)
+        raise CalculationError(f"Beklenmeyen sembol: {value}")
+
+
+def parse_program(text: str) -> Tuple[List[Tuple[str, tuple]], tuple]:
+    """'A = ...; B = ...; ifade' programini (baglamalar, son ifade) olarak ayristirir"""
+    tokens = tokenize(text)
+    statements: List[List[Tuple[str, Any]]] = [[]]
+    for token in tokens:
+        if token == ("punct", ";"):
+            statements.append([])
+        else:
+            statements[-1].append(token)
+    statements = [s for s in statements if s]
+    if not statements:
+        raise CalculationError("Bos ifade")
+
+    bindings: List[Tuple[str, tuple]] = []
+    result: Optional[tuple] = None
+    for statement in statements:
+        name = None
+        if len(statement) > 2 and statement[0][0] == "name" and statement[1] == ("punct", "="):
+            name, statement = statement[0][1], statement[2:]
+        parser = _Parser(statement)
+        ast = parser.expression()
+        if parser.pos != len(statement):
+            raise CalculationError("Sozdizimi hatasi: beklenmeyen sembol")
+        if name is not None:
+            bindings.append((name, ast))
+            result = ("name", name)
+        else:
+            result = ast
+    return bindings, result
+
+
+# ============================================================
+# DAG + MALIYET MODELI
+# ============================================================
+# Matrisin tamamini bellege alan (bloklanamayan) islemler
+_IN_MEMORY_OPS = ("inv", "det", "solve", "power")
+
+
+class PlanNode:
+    """Islem DAG'inin bir dugumu. Ayni (op, cocuklar, veri) tek dugumdur."""
+
+    __slots__ = ("index", "op", "children", "shape", "value", "label")
+
+    def __init__(self, index: int, op: str, children: tuple, shape: tuple, value: Any, label: str):
+        self.index = index
+        self.op = op
+        self.children = children
+        self.shape = shape
+        self.value = value
+        self.label = label
+
+
+def _dims(shape: tuple) -> str:
+    return "x".join(map(str, shape)) if shape else "scalar"
+
+
+def _matmul_flops(m: int, k: int, n: int) -> int:
+    return 2 * m * k * n
+
+
+def chain_order(dims: List[int]) -> Tuple[int, List[List[int]]]:
+    """Matrix-chain DP. dims: p0..pk (i. matris p[i] x p[i+1]).
+
+    Returns:
+        (minimum FLOP, split tablosu)
+    """
+    k = len(dims) - 1
+    cost = [[0] * k for _ in range(k)]
+    split = [[0] * k for _ in range(k)]
+    for length in range(2, k + 1):
+        for i in range(k - length + 1):
+            j = i + length - 1
+            cost[i][j] = -1
+            for s in range(i, j):
+                c = cost[i][s] + cost[s + 1][j] + _matmul_flops(dims[i], dims[s + 1], dims[j + 1])
+                if cost[i][j] < 0 or c < cost[i][j]:
+                    cost[i][j], split[i][j] = c, s
+    return cost[0][k - 1], split
+
+
+def _left_to_right_flops(dims: List[int]) -> int:
+    return sum(_matmul_flops(dims[0], dims[i], dims[i + 1]) for i in range(1, len(dims) - 1))
+
+
+class MatrixPlanner:
+    """Programi DAG'e cevirir, planlar ve memoize ederek hesaplar"""
+
+    def __init__(self):
+        self._interned: Dict[tuple, PlanNode] = {}
+        self._nodes: List[PlanNode] = []
+        self._names: Dict[str, PlanNode] = {}
+        self._literal_count = 0
+        self.steps: List[str] = []
+        self.rewrites: List[str] = []
+
+    # ----------------------------------------------------------
+    # DAG kurulumu
+    # ----------------------------------------------------------
+    def _intern(self, op: str, children: tuple, shape: tuple, value: Any = None,
+                label: str = "", key: Any = None) -> PlanNode:
+        full_key = (op, tuple(c.index for c in children), key)
+        node = self._interned.get(full_key)
+        if node is None:
+            node = PlanNode(len(self._nodes), op, children, shape, value, label)
+            self._interned[full_key] = node
+            self._nodes.append(node)
+        return node
+
+    def _leaf(self, array: np.ndarray, label: Optional[str] = None, key: Any = None) -> PlanNode:
+        # Dosya yapraklari referansla, literal'ler icerikle anahtarlanir
+        key = key or ("leaf", array.shape, array.tobytes())
+        if key in self._interned:
+            return self._interned[key]
+        if label is None:
+            self._literal_count += 1
+            label = f"M{self._literal_count}"
+        node = PlanNode(len(self._nodes), "leaf", (), array.shape, array, label)
+        self._interned[key] = node
+        self._nodes.append(node)
+        return node
+
+    def _scalar(self, value: float) -> PlanNode:
+        return self._intern("scalar", (), (), value, f"{value:g}", key=value)
+
+    def build(self, ast: tuple) -> PlanNode:
+        kind = ast[0]
+        if kind == "lit":
+            return self._leaf(ast[1])
+        if kind == "file":
+            _, relative, member = ast
+            return self._leaf(load_reference(relative, member), reference_label(relative, member),
+                              key=("file", relative, member))
+        if kind == "num":
+            return self._scalar(ast[1])
+        if kind == "name":
+            if ast[1] not in self._names:
+                raise CalculationError(f"Tanimsiz matris adi: {ast[1]}")
+            return self._names[ast[1]]
+        if kind in ("add", "sub"):
+            return self._add(kind, self.build(ast[1]), self.build(ast[2]))
+        if kind == "neg":
+            operand = self.build(ast[1])
+            return self._intern("neg", (operand,), operand.shape, label=f"-{operand.label}")
+        if kind == "mul":
+            return self._product(self._flatten_mul(ast))
+        if kind == "pow":
+            return self._power(self.build(ast[1]), ast[2])
+        if kind == "call":
+            return self._call(ast[1], self.build(ast[2]))
+        raise CalculationError(f"Bilinmeyen dugum: {kind}")
+
+    def bind(self, name: str, ast: tuple) -> None:
+        if ast[0] == "lit":
+            node = self._leaf(ast[1], label=name)
+        elif ast[0] == "file":
+            node = self._leaf(load_reference(ast[1], ast[2]), label=name, key=("file",) + ast[1:])
+        else:
+            node = self.build(ast)
+        self._names[name] = node
+        self.steps.append(f"{name} = {node.label} ({_dims(node.shape)})")
+
+    def _flatten_mul(self, ast: tuple) -> List[PlanNode]:
+        if ast[0] == "mul":
+            return self._flatten_mul(ast[1]) + self._flatten_mul(ast[2])
+        return [self.build(ast)]
+
+    def _add(self, kind: str, left: PlanNode, right: PlanNode) -> PlanNode:
+        if left.shape and right.shape and left.shape != right.shape:
+            raise CalculationError(f"Boyut uyusmazligi: {_dims(left.shape)} {kind} {_dims(right.shape)}")
+        shape = left.shape or right.shape
+        symbol = "+" if kind == "add" else "-"
+        return self._intern(kind, (left, right), shape, label=f"({left.label} {symbol} {right.label})")
+
+    def _call(self, function: str, operand: PlanNode) -> PlanNode:
+        if function == "transpose":
+            if operand.op == "transpose":
+                return operand.children[0]
+            return self._intern("transpose", (operand,), operand.shape[::-1], label=f"{operand.label}'")
+        if len(operand.shape) != 2 or operand.shape[0] != operand.shape[1]:
+            raise CalculationError(f"{function} icin kare matris gerekli, boyut: {_dims(operand.shape)}")
+        if function == "inv":
+            if operand.op == "inv":
+                return operand.children[0]
+            return self._intern("inv", (operand,), operand.shape, label=f"inv({operand.label})")
+        return self._intern(function, (operand,), (), label=f"{function}({operand.label})")
+
+    def _power(self, operand: PlanNode, exponent: int) -> PlanNode:
+        if not operand.shape:
+            return self._intern("spow", (operand,), (), exponent, f"{operand.label}^{exponent}", key=exponent)
+        if exponent == 0:
+            # A^0 = I: hesaplama gerektirmeyen birim matris yapragi
+            if len(operand.shape) != 2 or operand.shape[0] != operand.shape[1]:
+                raise CalculationError("Us alma icin kare matris gerekli")
+            n = operand.shape[0]
+            return self._leaf(np.eye(n), label=f"I{n}", key=("identity", n))
+        if exponent == -1:
+            return self._call("inv", operand)
+        if exponent < 0:
+            operand, exponent = self._call("inv", operand), -exponent
+        if exponent == 1:
+            return operand
+        if len(operand.shape) != 2 or operand.shape[0] != operand.shape[1]:
+            raise CalculationError("Us alma icin kare matris gerekli")
+        return self._intern("power", (operand,), operand.shape, exponent,
+                            f"{operand.label}^{exponent}", key=exponent)
+
+    def _product(self, factors: List[PlanNode]) -> PlanNode:
+        scalars = [f for f in factors if not f.shape]
+        matrices = [f for f in factors if f.shape]
+
+        node = self._chain(matrices) if matrices else None
+        for scalar in scalars:
+            if node is None:
+                node = scalar
+            else:
+                node = self._intern("scale", (scalar, node), node.shape, label=f"{scalar.label}*{node.label}")
+        return node
+
+    def _chain(self, factors: List[PlanNode]) -> PlanNode:
+        """Carpim zinciri; inv() faktorlerini solve'a cevirir"""
+        if len(factors) == 1:
+            return factors[0]
+
+        for i, factor in enumerate(factors):
+            if factor.op != "inv":
+                continue
+            A = factor.children[0]
+            if i < len(factors) - 1:
+                right = self._chain(factors[i + 1:])
+                solved = self._solve(A, right)
+                self.rewrites.append(f"inv({A.label})*{right.label} → solve({A.label}, {right.label})")
+                return self._chain(factors[:i] + [solved])
+            left = self._chain(factors[:i])
+            solved = self._call("transpose", self._solve(self._call("transpose", A), self._call("transpose", left)))
+            self.rewrites.append(f"{left.label}*inv({A.label}) → solve({A.label}', {left.label}')'")
+            return solved
+
+        dims = self._chain_dims(factors)
+        # Bastaki/sondaki vektorun boyutu sonuctan duser
+        shape = tuple(
+            d for d, factor in ((dims[0], factors[0]), (dims[-1], factors[-1]))
+            if len(factor.shape) == 2
+        )
+        label = "*".join(f.label for f in factors)
+        return self._intern("chain", tuple(factors), shape, dims, label)
+
+    @staticmethod
+    def _chain_dims(factors: List[PlanNode]) -> List[int]:
+        dims: List[int] = []
+        last = len(factors) - 1
+        for i, factor in enumerate(factors):
+            shape = factor.shape
+            if len(shape) == 1:
+                if i == 0:
+                    shape = (1, shape[0])
+                elif i == last:
+                    shape = (shape[0], 1)
+                else:
+                    raise CalculationError("Vektor sadece zincirin basinda veya sonunda olabilir")
+            if dims and dims[-1] != shape[0]:
+                raise CalculationError(
+                    f"Boyut uyusmazligi: {factors[i - 1].label} * {factor.label} "
+                    f"({dims[-1]} != {shape[0]})"
+                )
+            if not dims:
+                dims.append(shape[0])
+            dims.append(shape[1])
+        return dims
+
+    def _solve(self, A: PlanNode, B: PlanNode) -> PlanNode:
+        if B.shape[0] != A.shape[0]:
+            raise CalculationError(f"Boyut uyusmazligi: solve({_dims(A.shape)}, {_dims(B.shape)})")
+        return self._intern("solve", (A, B), B.shape, label=f"solve({A.label}, {B.label})")
+
+    # ----------------------------------------------------------
+    # Planlama
+    # ----------------------------------------------------------
+    def _chain_plan(self, node: PlanNode) -> Tuple[int, List[List[int]]]:
+        return chain_order(node.value)
+
+    def _order_string(self, factors: tuple, split: List[List[int]], i: int, j: int) -> str:
+        if i == j:
+            return factors[i].label
+        s = split[i][j]
+        return f"({self._order_string(factors, split, i, s)}*{self._order_string(factors, split, s + 1, j)})"
+
+    def estimate(self, root: PlanNode) -> int:
+        """Plani adimlara yazar ve toplam tahmini FLOP'u dondurur (CSE dahil)"""
+        seen: set = set()
+        # Zincirler arasi paylasilan alt carpimlar (evaluate'teki products memo'su)
+        computed_ranges: set = set()
+        total = 0
+
+        def chain_cost(keys: tuple, dims: List[int], split: List[List[int]], i: int, j: int) -> int:
+            if i == j:
+                return 0
+            if keys[i:j + 1] in computed_ranges:
+                return 0
+            computed_ranges.add(keys[i:j + 1])
+            s = split[i][j]
+            return (chain_cost(keys, dims, split, i, s) + chain_cost(keys, dims, split, s + 1, j)
+                    + _matmul_flops(dims[i], dims[s + 1], dims[j + 1]))
+
+        def visit(node: PlanNode) -> None:
+            nonlocal total
+            if node.index in seen:
+                if node.op not in ("leaf", "scalar"):
+                    self.steps.append(f"Reused subexpression {node.label}")
+                return
+            seen.add(node.index)
+            for child in node.children:
+                visit(child)
+
+            size = int(np.prod(node.shape)) if node.shape else 1
+            n = node.children[0].shape[0] if node.children and node.children[0].shape else 0
+            if node.op in ("add", "sub", "neg", "scale"):
+                total += size
+            elif node.op == "inv":
+                total += 2 * n ** 3
+            elif node.op == "det":
+                total += (2 * n ** 3) // 3
+            elif node.op == "solve":
+                rhs = node.shape[1] if len(node.shape) == 2 else 1
+                total += (2 * n ** 3) // 3 + 2 * n * n * rhs
+            elif node.op == "power":
+                total += 2 * n ** 3 * 2 * max(1, int(np.ceil(np.log2(max(2, node.value)))))
+            elif node.op == "chain":
+                optimal, split = self._chain_plan(node)
+                naive = _left_to_right_flops(node.value)
+                last = len(node.children) - 1
+                order = self._order_string(node.children, split, 0, last)
+                keys = tuple(c.index for c in node.children)
+                cost = chain_cost(keys, node.value, split, 0, last)
+                total += cost
+                shared = f", {optimal - cost:.3g} reused" if cost < optimal else ""
+                self.steps.append(
+                    f"Chain {node.label}: order {order}, {optimal:.3g} FLOPs{shared} "
+                    f"(left-to-right {naive:.3g})"
+                )
+
+        visit(root)
+        return total
+
+    # ----------------------------------------------------------
+    # Hesaplama (memoize)
+    # ----------------------------------------------------------
+    def evaluate(self, root: PlanNode) -> Any:
+        memo: Dict[int, Any] = {}
+        products: Dict[tuple, np.ndarray] = {}
+
+        def product(values: List[np.ndarray], keys: tuple, split: List[List[int]], i: int, j: int) -> np.ndarray:
+            if i == j:
+                return values[i]
+            key = keys[i:j + 1]
+            if key not in products:
+                s = split[i][j]
+                products[key] = matmul(product(values, keys, split, i, s), product(values, keys, split, s + 1, j))
+            return products[key]
+
+        def run(node: PlanNode) -> Any:
+            if node.index in memo:
+                return memo[node.index]
+            args = [run(child) for child in node.children]
+            op = node.op
+            if op in _IN_MEMORY_OPS:
+                require_in_memory(args[0], op)
+            if op in ("leaf", "scalar"):
+                value = node.value
+            elif op == "add":
+                value = args[0] + args[1]
+            elif op == "sub":
+                value = args[0] - args[1]
+            elif op == "neg":
+                value = -args[0]
+            elif op == "scale":
+                value = args[0] * args[1]
+            elif op == "spow":
+                value = args[0] ** node.value
+            elif op == "transpose":
+                value = args[0].T
+            elif op == "inv":
+                value = np.linalg.inv(args[0])
+            elif op == "det":
+                value = float(np.linalg.det(args[0]))
+            elif op == "trace":
+                value = float(np.trace(args[0]))
+            elif op == "solve":
+                value = np.linalg.solve(args[0], args[1])
+            elif op == "power":
+                value = np.linalg.matrix_power(args[0], node.value)
+            elif op == "chain":
+                _, split = self._chain_plan(node)
+                last = len(args) - 1
+                values = [
+                    a.reshape(1, -1) if a.ndim == 1 and i == 0 else
+                    a.reshape(-1, 1) if a.ndim == 1 and i == last else a
+                    for i, a in enumerate(args)
+                ]
+                keys = tuple(c.index for c in node.children)
+                value = product(values, keys, split, 0, last).reshape(node.shape)
+                if not node.shape:
+                    value = float(value)
+            else:
+                raise CalculationError(f"Bilinmeyen islem: {op}")
+            memo[node.index] = value
+            return value
+
+        return run(root)
+
+
+def evaluate_program(text: str) -> Tuple[Any, List[str], Dict[str, Any]]:
+    """Matris programini planlayip hesaplar.
+
+    Returns:
+        (sonuc, adimlar, metadata) — metadata: flops, rewrites
+    """
+    bindings, expression = parse_program(text)
+    planner = MatrixPlanner()
+    for name, ast in bindings:
+        planner.bind(name, ast)
+    root = planner.build(expression)
+
+    for rewrite in planner.rewrites:
+        planner.steps.append(f"Rewrote {rewrite}")
+    flops = planner.estimate(root)
+    planner.steps.append(f"Estimated cost: {flops:.3g} FLOPs")
+
+    try:
+        value = planner.evaluate(root)
+    except ValueError as e:
+        raise CalculationError(f"Boyut uyusmazligi: {e}")
+
+    return value, planner.steps, {"flops": flops, "rewrites": len(planner.rewrites)}
@@ -0,0 +1,202 @@
+"""Off-event-loop plot rendering in a process pool
+
+Cizim worker surecelerinde pyplot kullanmadan (Figure + FigureCanvasAgg)
+yapilir; boylece global pyplot durumu paylasilmaz ve event loop bloklanmaz.
+Worker'lar baslarken font cache'ini isitir. PNG/SVG dosyasi ana surecte bir
+thread'de atomik olarak yazilir.
+
+Bu modul spawn ile baslatilan worker'larda da import edildigi icin ayarlara
+(settings) bagimli degildir; yapilandirma PlotRenderer'a parametre olarak verilir.
+"""
+
+import asyncio
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.utils.exceptions import CalculationError
+
+
+# ============================================================
+# WORKER TARAFI
+# ============================================================
+def _warm_up() -> None:
+    """Worker baslangici: Agg backend'i ve font cache'ini yukler"""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(1, 1))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_title("f(x) = 0")
+    ax.plot([0, 1], [0, 1])
+    fig.canvas.draw()
+
+
+def _draw_2d(fig: Any, spec: Dict[str, Any]) -> None:
+    ax = fig.add_subplot()
+    # NaN'lar sureksizlikte cizgiyi keser
+    ax.plot(spec["x"], spec["y"], "b-", linewidth=2)
+    if spec.get("ylim"):
+        ax.set_ylim(*spec["ylim"])
+    ax.grid(True, alpha=0.3)
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_title(spec["title"])
+
+
+# Renkle birlikte cizgi tipi de degisir (siyah-beyaz baskida da ayrisir)
+SERIES_LINESTYLES = ("-", "--", "-.", ":")
+
+
+def _draw_series(fig: Any, spec: Dict[str, Any]) -> None:
+    """Ortak eksende birden fazla seri: spec["series"] = [{"x", "y", "label"}, ...]"""
+    ax = fig.add_subplot()
+    for i, series in enumerate(spec["series"]):
+        ax.plot(
+            series["x"], series["y"],
+            color=f"C{i % 10}", linestyle=SERIES_LINESTYLES[i % len(SERIES_LINESTYLES)],
+            linewidth=2, label=series["label"],
+        )
+    if spec.get("ylim"):
+        ax.set_ylim(*spec["ylim"])
+    if spec.get("equal_aspect"):
+        # Parametrik/kutupsal egriler bozulmadan gorunsun
+        ax.set_aspect("equal", adjustable="datalim")
+    ax.grid(True, alpha=0.3)
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_title(spec["title"])
+    ax.legend(loc="best")
+
+
+def _draw_grid(fig: Any, spec: Dict[str, Any]) -> None:
+    """surface / contour / heatmap: spec["x"] (nx), spec["y"] (ny), spec["z"] (ny, nx)"""
+    import numpy as np
+
+    xs, ys = spec["x"], spec["y"]
+    Z = np.ma.masked_invalid(spec["z"])
+    vmin, vmax = spec.get("zlim") or (None, None)
+    kind = spec["kind"]
+
+    if kind == "surface":
+        ax = fig.add_subplot(projection="3d")
+        X, Y = np.meshgrid(xs, ys)
+        # Kutuplar z eksenini ezmesin: sinir disi degerler kirpilir
+        clipped = np.clip(spec["z"], vmin, vmax) if vmin is not None else spec["z"]
+        ax.plot_surface(X, Y, clipped, cmap="viridis", linewidth=0, antialiased=False,
+                        rstride=1, cstride=1)
+        ax.set_zlabel("z")
+    elif kind == "contour":
+        ax = fig.add_subplot()
+        levels = np.linspace(vmin, vmax, 21) if vmin is not None and vmax > vmin else 20
+        filled = ax.contourf(xs, ys, Z, levels=levels, cmap="viridis", extend="both")
+        ax.contour(xs, ys, Z, levels=filled.levels, colors="k", linewidths=0.3)
+        fig.colorbar(filled, ax=ax)
+    else:
+        ax = fig.add_subplot()
+        mesh = ax.pcolormesh(xs, ys, Z, cmap="viridis", vmin=vmin, vmax=vmax, shading="auto")
+        fig.colorbar(mesh, ax=ax)
+
+    ax.set_xlabel("x")
+    ax.set_ylabel("y")
+    ax.set_title(spec["title"])
+
+
+def render_figure(spec: Dict[str, Any]) -> bytes:
+    """Cizim spesifikasyonunu PNG/SVG baytlarina cevirir (worker'da calisir).
+
+    spec: kind ("2d" | "series" | "surface" | "contour" | "heatmap"), x, y, [z],
+    [series], title,
+    [format: "png" | "svg"], [ylim], [zlim], [dpi], [figsize]
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.get("figsize", (8, 5)))
+    FigureCanvasAgg(fig)
+    kind = spec.get("kind", "2d")
+    if kind == "2d":
+        _draw_2d(fig, spec)
+    elif kind == "series":
+        _draw_series(fig, spec)
+    else:
+        _draw_grid(fig, spec)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=spec.get("format", "png"), dpi=spec.get("dpi", 120), bbox_inches="tight")
+    return buffer.getvalue()
+
+
+# ============================================================
+# ANA SUREC TARAFI
+# ============================================================
+def write_atomic(path: Path, data: bytes) -> None:
+    """Gecici dosyaya yazip rename eder; yarim PNG gorulmez"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_arrays_atomic(path: Path, **arrays: Any) -> None:
+    """Tam cozunurluklu veriyi .npz olarak atomik yazar"""
+    import numpy as np
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    write_atomic(path, buffer.getvalue())
+
+
+class PlotRenderer:
+    """Process pool'a cizim isi gonderen, kuyruk sinirli async arayuz"""
+
+    def __init__(self, workers: int = 2, queue_limit: int = 32):
+        self.workers = max(1, workers)
+        self.queue_limit = max(1, queue_limit)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork, ana suretteki thread havuzlarini kopyalar; spawn daha guvenli
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=get_context("spawn"), initializer=_warm_up
+            )
+        return self._executor
+
+    async def render(self, spec: Dict[str, Any]) -> bytes:
+        """Cizimi bir worker'da yapar. Kuyruk doluysa hemen hata verir."""
+        if self._pending >= self.queue_limit:
+            raise CalculationError(f"Grafik kuyrugu dolu ({self.queue_limit} bekleyen istek)")
+
+        self._pending += 1
+        loop = asyncio.get_running_loop()
+        try:
+            try:
+                return await loop.run_in_executor(self._pool(), render_figure, spec)
+            except BrokenProcessPool:
+                # Coken worker havuzu bir kez yeniden kurulur
+                self.shutdown()
+                return await loop.run_in_executor(self._pool(), render_figure, spec)
+        finally:
+            self._pending -= 1
+
+    async def render_to_file(self, spec: Dict[str, Any], path: Path) -> Path:
+        data = await self.render(spec)
+        await asyncio.to_thread(write_atomic, path, data)
+        return Path(path)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,480 @@
+"""Function compilation, adaptive sampling and grid evaluation for plots
+
+Fonksiyon metni paylasilan ifade servisinden (src.utils.expressions) derlenmis
+olarak alinir; ayni ifade tekrar parse/lambdify edilmez. Ornekleme kaba bir izgarayla baslar; egriligin yuksek
+oldugu, sureksizlik/asimptot supheli araliklar her turda tek vektorize cagriyla
+ikiye bolunur, duz bolgeler seyrek kalir.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.expressions import compile_expression, parse_expression
+
+# Kaba baslangic izgarasi ve toplam degerlendirme butcesi
+INITIAL_POINTS = 33
+MAX_POINTS = 2000
+MAX_DEPTH = 12
+# Orta noktadaki dogrusal interpolasyon hatasi / y olcegi bu degeri asarsa bolunur
+TOLERANCE = 2e-3
+# f(x, y) izgarasi icin varsayilan nokta butcesi
+GRID_POINTS = 250_000
+
+
+def compile_function(
+    text: str, variables: Sequence[str] = ("x",)
+) -> Tuple[Callable[..., np.ndarray], Any]:
+    """Metni vektorize f(x) / f(x, y) fonksiyonuna derler.
+
+    Returns:
+        (f, sympy_ifadesi). Ifadede `variables` disinda serbest sembol varsa
+        ValueError firlatir.
+    """
+    compiled = compile_expression(text)
+    return compiled.function(variables), compiled.expr
+
+
+def compile_functions(
+    exprs: Sequence[Any], variables: Sequence[str] = ("x",)
+) -> Tuple[Callable[..., np.ndarray], List[Any]]:
+    """Birden fazla ifadeyi (metin ya da SymPy) tek vektorize fonksiyona derler.
+
+    Donen F(*args) tum ifadeleri tek cagrida hesaplayip (k, n) dizi dondurur.
+    """
+    import sympy
+
+    parsed = [parse_expression(e) if isinstance(e, str) else sympy.sympify(e) for e in exprs]
+    extra = set().union(*(e.free_symbols for e in parsed)) - {sympy.Symbol(v) for v in variables}
+    if extra:
+        raise ValueError(f"Tanimsiz degiskenler: {sorted(map(str, extra))}")
+
+    raw = sympy.lambdify([sympy.Symbol(v) for v in variables], parsed, modules="numpy")
+
+    def F(*args: np.ndarray) -> np.ndarray:
+        shape = np.broadcast_shapes(*map(np.shape, args))
+        with np.errstate(all="ignore"):
+            rows = [np.broadcast_to(np.asarray(r), shape) for r in raw(*args)]
+        Y = np.stack(rows)
+        if np.iscomplexobj(Y):
+            Y = np.where(np.abs(Y.imag) <= 1e-12, Y.real, np.nan)
+        return Y.astype(float)
+
+    return F, parsed
+
+
+def _scale(y: np.ndarray) -> float:
+    """Asimptotlardan etkilenmeyen y olcegi (5-95 yuzdelik araligi)"""
+    finite = y[np.isfinite(y)]
+    if finite.size < 2:
+        return 1.0
+    low, high = np.percentile(finite, [5, 95])
+    return float(high - low) or float(np.max(np.abs(finite))) or 1.0
+
+
+def adaptive_sample(
+    f: Callable[[np.ndarray], np.ndarray],
+    a: float,
+    b: float,
+    initial: int = INITIAL_POINTS,
+    max_points: int = MAX_POINTS,
+    tol: float = TOLERANCE,
+    max_depth: int = MAX_DEPTH,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """[a, b] araligini egrilige gore uyarlamali ornekler.
+
+    Her turda bolunecek araliklarin orta noktalari tek f cagrisiyla hesaplanir.
+    Bir aralik su durumlarda bolunur: orta noktadaki deger dogrusal
+    interpolasyondan tol * olcek'ten fazla sapiyorsa, uclardan biri tanimsizsa
+    (NaN/inf) ya da aralik uzerinde olcegi asan bir sicrama varsa.
+    Kontrol icin hesaplanan her orta nokta ornege katilir, yani hicbir
+    degerlendirme bosa gitmez. Sureksizliklerde cizgi NaN ile kesilir.
+
+    Returns:
+        (x, y, {"samples", "rounds", "discontinuities"}); samples f'nin
+        degerlendirildigi nokta sayisidir (kesme icin eklenen NaN'lar haric).
+    """
+    x, y, rounds, min_width = _sample_rows(f, a, b, initial, max_points, tol, max_depth)
+    evaluations = len(x)
+    x, y, breaks = _break_discontinuities(x, y, _scale(y), min_width, tol)
+    return x, y, {
+        "samples": int(evaluations),
+        "rounds": rounds,
+        "discontinuities": breaks,
+    }
+
+
+def _sample_rows(
+    f: Callable[[np.ndarray], np.ndarray],
+    a: float,
+    b: float,
+    initial: int,
+    max_points: int,
+    tol: float,
+    max_depth: int,
+) -> Tuple[np.ndarray, np.ndarray, int, float]:
+    """Kaba izgara + uyarlamali bolme; f (n,) ya da (k, n) dondurebilir"""
+    if not (np.isfinite(a) and np.isfinite(b)) or a >= b:
+        raise ValueError(f"Gecersiz aralik: [{a}, {b}]")
+
+    # Simetrik izgaralarin tekil noktalara (ornek: 1/x icin x=0) denk gelmesini onlemek icin
+    # ic noktalar cok az kaydirilir
+    x = np.linspace(a, b, initial)
+    x[1:-1] += (b - a) * 1e-7 * np.sin(np.arange(1, initial - 1))
+    y = f(x)
+    # pending[i]: [x[i], x[i+1]] araligi henuz kontrol edilmedi
+    pending = np.ones(initial - 1, dtype=bool)
+    min_width = (b - a) / (initial - 1) / 2 ** max_depth
+    x, y, rounds = _refine(f, x, y, pending, max_points, tol, min_width)
+    return x, y, rounds, min_width
+
+
+def _check(
+    rows: np.ndarray, y_probe: np.ndarray, left_idx: np.ndarray, t: float,
+    tol: float, scale: Optional[float],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """[x[i], x[i+1]] icinde t oranindaki kontrol degerine gore (bolunmeli_mi, hata/tolerans)"""
+    if scale is not None:
+        current = np.full((len(rows), 1), scale)
+    else:
+        current = np.array([[_scale(row)] for row in rows])
+    left, right = rows[:, left_idx], rows[:, left_idx + 1]
+    error = np.abs(y_probe - (left + t * (right - left)))
+    finite = np.isfinite(left) & np.isfinite(right) & np.isfinite(y_probe)
+    refine = ~finite | (error > tol * current) | (np.abs(right - left) > current)
+    # Tamamen tanimsiz araliklar (NaN-NaN-NaN) bolunmez
+    refine &= np.isfinite(left) | np.isfinite(right) | np.isfinite(y_probe)
+    ratio = np.nan_to_num(error / (tol * current), nan=0.0, posinf=0.0).max(axis=0)
+    return refine.any(axis=0), ratio
+
+
+# Ilk turda orta noktaya ek olarak bu orandaki nokta da kontrol edilir (ikili olmayan)
+_PROBE = (3 - np.sqrt(5)) / 2
+
+
+def _refine(
+    f: Callable[[np.ndarray], np.ndarray],
+    x: np.ndarray,
+    y: np.ndarray,
+    pending: np.ndarray,
+    max_points: int,
+    tol: float,
+    min_width: float,
+    scale: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Bekleyen araliklari her turda tek vektorize cagriyla ikiye boler.
+
+    y (n,) ya da ayni x'i paylasan (k, n) seriler olabilir; bir aralik
+    serilerden herhangi biri gerektiriyorsa bolunur. scale verilmezse her
+    serinin olcegi her turda ornekten yeniden hesaplanir.
+
+    Tek orta nokta kontrolu, aralik periyodun katina denk gelince (aliasing)
+    salinimi kacirabilir. Bu yuzden ilk turda her aralik orta nokta ve ikili
+    olmayan bir oranda (~0.38) iki noktayla kontrol edilir; sonraki turlarda
+    ebeveyninden birden cok daha duz gorunen parcalar bir kez daha bolunur.
+    """
+    rows = np.atleast_2d(y)
+    rounds = 0
+    # parent[i]: araligi ureten kontroldeki hata / tolerans orani
+    parent = np.zeros(len(x) - 1)
+
+    pending &= np.diff(x) > min_width
+    idx = np.flatnonzero(pending)
+    if idx.size and len(x) + 2 * idx.size <= max_points:
+        width = x[idx + 1] - x[idx]
+        probe, mid = x[idx] + _PROBE * width, x[idx] + width / 2
+        values = np.atleast_2d(f(np.concatenate([probe, mid])))
+        y_probe, y_mid = values[:, : idx.size], values[:, idx.size:]
+        rounds += 1
+
+        refine_p, ratio_p = _check(rows, y_probe, idx, _PROBE, tol, scale)
+        refine_m, ratio_m = _check(rows, y_mid, idx, 0.5, tol, scale)
+        refine, ratio = refine_p | refine_m, np.maximum(ratio_p, ratio_m)
+
+        # Aralik i → (x_i, probe), (probe, mid), (mid, x_i+1)
+        at = np.repeat(idx + 1, 2)
+        x = np.insert(x, at, np.column_stack([probe, mid]).ravel())
+        rows = np.insert(rows, at, np.stack([y_probe, y_mid], axis=2).reshape(len(rows), -1), axis=1)
+        first = idx + 2 * np.arange(idx.size)
+        positions = np.concatenate([first, first + 1, first + 2])
+        pending = np.insert(pending, at, False)
+        pending[positions] = np.tile(refine, 3)
+        parent = np.insert(parent, at, 0.0)
+        parent[positions] = np.tile(ratio, 3)
+
+    while len(x) < max_points:
+        pending &= np.diff(x) > min_width
+        idx = np.flatnonzero(pending)
+        if idx.size == 0:
+            break
+        if idx.size > max_points - len(x):
+            # Butce yetmiyorsa en genis araliklar bolunur (soldan kesilip sag taraf kaba kalmaz)
+            widths = x[idx + 1] - x[idx]
+            idx = np.sort(idx[np.argsort(-widths, kind="stable")[: max_points - len(x)]])
+
+        # Kontrol icin hesaplanan orta noktalar her durumda ornege eklenir
+        mid = (x[idx] + x[idx + 1]) / 2
+        y_mid = np.atleast_2d(f(mid))
+        rounds += 1
+
+        refine, ratio = _check(rows, y_mid, idx, 0.5, tol, scale)
+        # Hatasi yuzunden bolunen araligin parcasi birden cok duz gorunuyorsa
+        # (duzgun fonksiyonda ~1/4'u beklenir) bir kez daha kontrol edilir
+        refine |= (parent[idx] > 1) & (ratio * 16 < parent[idx])
+
+        # Aralik i → (i, i'); ikisi de ancak ebeveyn bolunmeliyse yeniden kontrol edilir
+        children = np.repeat(refine, 2)
+        positions = np.sort(np.concatenate([idx + np.arange(idx.size), idx + np.arange(idx.size) + 1]))
+        pending = np.insert(pending, idx + 1, False)
+        pending[positions] = children
+        parent = np.insert(parent, idx + 1, 0.0)
+        parent[positions] = np.repeat(ratio, 2)
+        x = np.insert(x, idx + 1, mid)
+        rows = np.insert(rows, idx + 1, y_mid, axis=1)
+    return x, (rows if np.ndim(y) == 2 else rows[0]), rounds
+
+
+def value_scale(y: np.ndarray) -> float:
+    """Asimptotlardan etkilenmeyen y olcegi"""
+    return _scale(y)
+
+
+def estimate_scale(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, points: int = INITIAL_POINTS) -> float:
+    """[a, b] uzerindeki kaba izgaradan y olcegi (asimptotlardan etkilenmez)"""
+    x = np.linspace(a, b, points)
+    x[1:-1] += (b - a) * 1e-7 * np.sin(np.arange(1, points - 1))
+    return _scale(f(x))
+
+
+def sample_interval(
+    f: Callable[[np.ndarray], np.ndarray],
+    a: float,
+    b: float,
+    initial: int,
+    max_points: int,
+    scale: float,
+    tol: float = TOLERANCE,
+    max_depth: int = MAX_DEPTH,
+    seed: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    grid: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """[a, b]'yi verilen y olcegine gore, sureksizlik kesmesi yapmadan ornekler.
+
+    grid: kaba izgara (varsayilan: initial noktali linspace); uclari a ve b olmali.
+    seed: baska araliklardan bilinen (x, y, sonraki_x) noktalari; yeniden
+    hesaplanmaz. sonraki_x, noktanin kendi orneginde kontrol edilmis komsusudur
+    (yoksa NaN). Bir aralik ancak iki ucu birbirinin kontrol edilmis komsusuysa
+    ve kaba aralik genisligini asmiyorsa cozulmus sayilir; digerleri bolunur.
+    Kaba izgara noktalarindan tohuma yakin olanlar atlanir. max_points yeni
+    degerlendirme butcesidir (tohumlar sayilmaz).
+
+    Returns:
+        (x, y, {"samples", "rounds"}); samples yeni degerlendirme sayisidir.
+    """
+    spacing = (b - a) / (initial - 1)
+    if grid is None:
+        grid = np.linspace(a, b, initial)
+        grid[1:-1] += (b - a) * 1e-7 * np.sin(np.arange(1, initial - 1))
+    else:
+        spacing = float(np.max(np.diff(grid)))
+
+    if seed is not None and len(seed[0]):
+        sx, sy, snext = seed
+        inside = (sx >= a) & (sx <= b)
+        sx, sy, snext = sx[inside], sy[inside], snext[inside]
+        nearest = (
+            np.abs(grid[:, None] - sx[None, :]).min(axis=1) if sx.size else np.full(grid.size, np.inf)
+        )
+        keep = nearest >= spacing / 2
+        # Uclar karonun siniridir; tohumda birebir yoksa hesaplanir
+        keep[[0, -1]] = ~np.isin(grid[[0, -1]], sx)
+        new_x = grid[keep]
+        x = np.concatenate([new_x, sx])
+        y = np.concatenate([f(new_x), sy])
+        following = np.concatenate([np.full(new_x.size, np.nan), snext])
+        order = np.argsort(x, kind="stable")
+        x, y, following = x[order], y[order], following[order]
+        evaluated = int(new_x.size)
+    else:
+        x, y = grid, f(grid)
+        following = np.full(grid.size, np.nan)
+        evaluated = int(grid.size)
+
+    resolved = (following[:-1] == x[1:]) & (np.diff(x) <= spacing)
+    start = len(x)
+    x, y, rounds = _refine(
+        f, x, y, ~resolved, start - evaluated + max_points, tol, spacing / 2 ** max_depth, scale
+    )
+    return x, y, {"samples": evaluated + len(x) - start, "rounds": rounds}
+
+
+def finish_samples(
+    x: np.ndarray, y: np.ndarray, min_width: float, tol: float = TOLERANCE
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Birlestirilmis ornekte sureksizliklerde cizgiyi keser"""
+    return _break_discontinuities(x, y, _scale(y), min_width, tol)
+
+
+def _break_discontinuities(
+    x: np.ndarray, y: np.ndarray, scale: float, min_width: float, tol: float
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Sureksizlik/asimptot olan araliklara NaN ekleyip cizgiyi keser.
+
+    Kutup: iki uc da olcegin disinda ve zit isaretli. Basamak: derinlik
+    sinirina kadar bolundugu halde komsularindan cok daha buyuk sicrama kaliyor.
+    """
+    gaps = _gaps(x, y, scale, min_width, tol)
+    if gaps.size == 0:
+        return x, y, 0
+    mid = (x[gaps] + x[gaps + 1]) / 2
+    return np.insert(x, gaps + 1, mid), np.insert(y, gaps + 1, np.nan), int(gaps.size)
+
+
+def _gaps(x: np.ndarray, y: np.ndarray, scale: float, min_width: float, tol: float) -> np.ndarray:
+    """Cizginin kesilmesi gereken [x[i], x[i+1]] araliklarinin indeksleri"""
+    if len(x) < 2:
+        return np.empty(0, dtype=int)
+    left, right = y[:-1], y[1:]
+    jump = np.abs(right - left)
+    finite = np.isfinite(left) & np.isfinite(right)
+    pole = (np.abs(left) > scale) & (np.abs(right) > scale) & (np.sign(left) != np.sign(right)) & (jump > scale)
+    # Dik ama surekli bolgede komsu araliklar da benzer sicrar; basamakta sicrama tek araliktadir
+    neighbours = np.maximum(np.concatenate([[0.0], jump[:-1]]), np.concatenate([jump[1:], [0.0]]))
+    step = (np.diff(x) <= min_width * 2) & (jump > 25 * tol * scale) & (jump > 4 * np.nan_to_num(neighbours))
+    return np.flatnonzero(finite & (pole | step))
+
+
+def sample_function(
+    text: str, x_range: Tuple[float, float], max_points: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """Metni derleyip [a, b] araliginda uyarlamali ornekler"""
+    f, expr = compile_function(text)
+    x, y, info = adaptive_sample(f, float(x_range[0]), float(x_range[1]), max_points=max_points or MAX_POINTS)
+    info["expression"] = str(expr)
+    return x, y, info
+
+
+# ============================================================
+# COKLU SERI (fonksiyon / parametrik / kutupsal)
+# ============================================================
+def sample_series(
+    series: Sequence[Dict[str, str]],
+    x_range: Tuple[float, float],
+    t_range: Tuple[float, float],
+    max_points: Optional[int] = None,
+) -> Tuple[List[Tuple[np.ndarray, np.ndarray]], Dict[str, Any]]:
+    """Serileri ortak izgarada tek vektorize grupla ornekler.
+
+    series ogeleri: {"kind": "function", "expr"} (x uzerinde),
+    {"kind": "parametric", "x", "y"} ya da {"kind": "polar", "r"} (t / theta
+    uzerinde). Tum y = f(x) serileri bir x izgarasini, tum egriler bir t
+    izgarasini paylasir; her izgara tek derlenmis fonksiyonla hesaplanir ve
+    serilerden herhangi birinin gerektirdigi yerde inceltilir.
+
+    Returns:
+        ([(x_i, y_i), ...] giris sirasiyla, {"samples", "rounds", "discontinuities", "labels"})
+    """
+    import sympy
+
+    t = sympy.Symbol("t")
+    budget = max_points or MAX_POINTS
+    out: List[Any] = [None] * len(series)
+    labels: List[str] = [""] * len(series)
+    samples, rounds, breaks = 0, 0, 0
+
+    functions = [i for i, s in enumerate(series) if s["kind"] == "function"]
+    curves = [i for i, s in enumerate(series) if s["kind"] != "function"]
+
+    if functions:
+        F, exprs = compile_functions([series[i]["expr"] for i in functions], ("x",))
+        x, Y, n_rounds, min_width = _sample_rows(
+            F, float(x_range[0]), float(x_range[1]), INITIAL_POINTS, budget, TOLERANCE, MAX_DEPTH
+        )
+        samples += len(x) * len(functions)
+        rounds = max(rounds, n_rounds)
+        for row, (i, expr) in enumerate(zip(functions, exprs)):
+            xi, yi, n_breaks = _break_discontinuities(x, Y[row], _scale(Y[row]), min_width, TOLERANCE)
+            out[i], labels[i] = (xi, yi), str(expr)
+            breaks += n_breaks
+
+    if curves:
+        components: List[Any] = []
+        for i in curves:
+            spec = series[i]
+            if spec["kind"] == "polar":
+                r = parse_expression(spec["r"])
+                labels[i] = f"r = {r}"
+                r = r.subs(sympy.Symbol("theta"), t)
+                components += [r * sympy.cos(t), r * sympy.sin(t)]
+            else:
+                cx, cy = parse_expression(spec["x"]), parse_expression(spec["y"])
+                components += [cx, cy]
+                labels[i] = f"({cx}, {cy})"
+        F, _ = compile_functions(components, ("t",))
+        ts, XY, n_rounds, min_width = _sample_rows(
+            F, float(t_range[0]), float(t_range[1]), INITIAL_POINTS, budget, TOLERANCE, MAX_DEPTH
+        )
+        samples += len(ts) * len(curves)
+        rounds = max(rounds, n_rounds)
+        for k, i in enumerate(curves):
+            cx, cy = XY[2 * k], XY[2 * k + 1]
+            # Egri, bilesenlerinden biri sicradiginda kesilir
+            gaps = np.union1d(
+                _gaps(ts, cx, _scale(cx), min_width, TOLERANCE),
+                _gaps(ts, cy, _scale(cy), min_width, TOLERANCE),
+            ).astype(int)
+            out[i] = (np.insert(cx, gaps + 1, np.nan), np.insert(cy, gaps + 1, np.nan))
+            breaks += int(gaps.size)
+
+    return out, {"samples": samples, "rounds": rounds, "discontinuities": breaks, "labels": labels}
+
+
+# ============================================================
+# f(x, y) IZGARASI
+# ============================================================
+def grid_resolution(x_range: Tuple[float, float], y_range: Tuple[float, float], budget: int) -> Tuple[int, int]:
+    """Nokta butcesini araliklarin en-boy oranina gore (nx, ny)'ye boler"""
+    width, height = x_range[1] - x_range[0], y_range[1] - y_range[0]
+    aspect = min(max(width / height, 1 / 16), 16) if height > 0 else 1.0
+    nx = int(np.sqrt(budget * aspect))
+    ny = int(budget / max(nx, 1))
+    return max(nx, 2), max(ny, 2)
+
+
+def evaluate_grid(
+    text: str,
+    x_range: Tuple[float, float],
+    y_range: Tuple[float, float],
+    budget: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+    """f(x, y)'yi butceden secilen izgarada tek vektorize cagriyla hesaplar.
+
+    meshgrid sparse kurulur (x: 1 x nx, y: ny x 1); bellekte sadece Z tam
+    boyutludur. Returns: (xs, ys, Z[ny, nx], {"grid", "samples", "expression", ...})
+    """
+    for low, high in (x_range, y_range):
+        if not (np.isfinite(low) and np.isfinite(high)) or low >= high:
+            raise ValueError(f"Gecersiz aralik: [{low}, {high}]")
+
+    f, expr = compile_function(text, ("x", "y"))
+    nx, ny = grid_resolution(x_range, y_range, budget or GRID_POINTS)
+    xs = np.linspace(x_range[0], x_range[1], nx)
+    ys = np.linspace(y_range[0], y_range[1], ny)
+    X, Y = np.meshgrid(xs, ys, sparse=True)
+    Z = f(X, Y)
+    finite = np.isfinite(Z)
+    return xs, ys, Z, {
+        "grid": [ny, nx],
+        "samples": int(Z.size),
+        "undefined": int(Z.size - finite.sum()),
+        "expression": str(expr),
+    }
+
+
+def downsample_grid(
+    xs: np.ndarray, ys: np.ndarray, Z: np.ndarray, max_side: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cizim icin izgarayi her eksende en fazla max_side noktaya seyreltir (kopyasiz dilim)"""
+    sy = max(1, int(np.ceil(len(ys) / max_side)))
+    sx = max(1, int(np.ceil(len(xs) / max_side)))
+    return xs[::sx], ys[::sy], Z[::sy, ::sx]
@@ -0,0 +1,298 @@
+"""Sparse matrices: CSR storage, products, iterative solvers and Matrix Market I/O
+
+scipy.sparse kuruluysa onun CSR'i ve cozuculeri kullanilir; degilse ayni
+arayuzu (A @ x, A @ B, A.T, A.nnz, A.shape, A.toarray()) saglayan yerlesik
+CSRMatrix devreye girer.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+try:
+    import scipy.sparse as _sp
+    import scipy.sparse.linalg as _spla
+except ImportError:  # pragma: no cover - scipy opsiyonel
+    _sp = None
+    _spla = None
+
+HAS_SCIPY = _sp is not None
+
+
+# ============================================================
+# YERLESIK CSR
+# ============================================================
+class CSRMatrix:
+    """Minimal CSR matris (scipy yokken kullanilir)"""
+
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: Tuple[int, int]):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @classmethod
+    def from_coo(cls, rows: Any, cols: Any, values: Any, shape: Tuple[int, int]) -> "CSRMatrix":
+        """Koordinat listesinden CSR kurar; tekrar eden (i, j) degerleri toplanir"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        m, n = shape
+        linear, inverse = np.unique(rows * n + cols, return_inverse=True)
+        data = np.bincount(inverse, weights=values, minlength=len(linear))
+        keep = data != 0
+        linear, data = linear[keep], data[keep]
+        row_ids = linear // n
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(row_ids, minlength=m))])
+        return cls(data, (linear % n).astype(np.int64), indptr.astype(np.int64), shape)
+
+    @property
+    def nnz(self) -> int:
+        return int(len(self.data))
+
+    def _row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def tocoo_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self._row_ids(), self.indices, self.data
+
+    @property
+    def T(self) -> "CSRMatrix":
+        rows, cols, data = self.tocoo_arrays()
+        return CSRMatrix.from_coo(cols, rows, data, self.shape[::-1])
+
+    def toarray(self) -> np.ndarray:
+        dense = np.zeros(self.shape)
+        rows, cols, data = self.tocoo_arrays()
+        dense[rows, cols] = data
+        return dense
+
+    def __matmul__(self, other: Any) -> Any:
+        if isinstance(other, CSRMatrix):
+            return self._spgemm(other)
+        other = np.asarray(other, dtype=float)
+        if other.shape[0] != self.shape[1]:
+            raise ValueError(f"Boyut uyusmazligi: {self.shape} @ {other.shape}")
+        rows = self._row_ids()
+        if other.ndim == 1:
+            return np.bincount(rows, weights=self.data * other[self.indices], minlength=self.shape[0])
+        out = np.zeros((self.shape[0], other.shape[1]))
+        np.add.at(out, rows, self.data[:, None] * other[self.indices])
+        return out
+
+    def _spgemm(self, other: "CSRMatrix") -> "CSRMatrix":
+        """Sparse x sparse: A'nin her (i, k) elemani B'nin k. satiriyla genisletilir"""
+        if self.shape[1] != other.shape[0]:
+            raise ValueError(f"Boyut uyusmazligi: {self.shape} @ {other.shape}")
+        a_rows, a_cols, a_data = self.tocoo_arrays()
+        starts = other.indptr[a_cols]
+        counts = other.indptr[a_cols + 1] - starts
+        total = int(counts.sum())
+        # Her genisletilmis eleman icin B'deki konum
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + offsets
+        return CSRMatrix.from_coo(
+            np.repeat(a_rows, counts),
+            other.indices[positions],
+            np.repeat(a_data, counts) * other.data[positions],
+            (self.shape[0], other.shape[1]),
+        )
+
+
+# ============================================================
+# ORTAK ARAYUZ
+# ============================================================
+def make_sparse(rows: Any, cols: Any, values: Any, shape: Tuple[int, int]) -> Any:
+    """COO uclulerinden CSR matris (scipy veya yerlesik)"""
+    if HAS_SCIPY:
+        return _sp.csr_matrix((values, (rows, cols)), shape=shape, dtype=float)
+    return CSRMatrix.from_coo(rows, cols, values, shape)
+
+
+def is_sparse(value: Any) -> bool:
+    return isinstance(value, CSRMatrix) or (HAS_SCIPY and _sp.issparse(value))
+
+
+def coo_arrays(matrix: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if isinstance(matrix, CSRMatrix):
+        return matrix.tocoo_arrays()
+    coo = matrix.tocoo()
+    return coo.row, coo.col, coo.data
+
+
+def density(matrix: Any) -> float:
+    m, n = matrix.shape
+    return matrix.nnz / float(m * n) if m and n else 0.0
+
+
+def is_symmetric(matrix: Any) -> bool:
+    """A - A^T'nin (goreli) sifir olup olmadigini seyrek olarak kontrol eder"""
+    if matrix.shape[0] != matrix.shape[1]:
+        return False
+    rows, cols, data = coo_arrays(matrix)
+    if not len(data):
+        return True
+    difference = CSRMatrix.from_coo(
+        np.concatenate([rows, cols]), np.concatenate([cols, rows]),
+        np.concatenate([data, -data]), matrix.shape,
+    )
+    return difference.nnz == 0 or np.max(np.abs(difference.data)) <= 1e-12 * np.max(np.abs(data))
+
+
+# ============================================================
+# ITERATIF COZUCULER
+# ============================================================
+def _relative_residual(A: Any, x: np.ndarray, b: np.ndarray) -> float:
+    norm_b = np.linalg.norm(b) or 1.0
+    return float(np.linalg.norm(b - A @ x) / norm_b)
+
+
+def _builtin_cg(A: Any, b: np.ndarray, tol: float, maxiter: int) -> Tuple[np.ndarray, int]:
+    x = np.zeros_like(b)
+    r = b.copy()
+    p = r.copy()
+    rs = r @ r
+    threshold = (tol * (np.linalg.norm(b) or 1.0)) ** 2
+    for iteration in range(1, maxiter + 1):
+        Ap = A @ p
+        alpha = rs / (p @ Ap)
+        x += alpha * p
+        r -= alpha * Ap
+        rs_new = r @ r
+        if rs_new <= threshold:
+            return x, iteration
+        p = r + (rs_new / rs) * p
+        rs = rs_new
+    return x, maxiter
+
+
+def _builtin_gmres(A: Any, b: np.ndarray, tol: float, maxiter: int, restart: int) -> Tuple[np.ndarray, int]:
+    """Yeniden baslatmali GMRES (Arnoldi + Givens donusleri)"""
+    n = b.shape[0]
+    x = np.zeros_like(b)
+    norm_b = np.linalg.norm(b) or 1.0
+    iterations = 0
+    while iterations < maxiter:
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        if beta / norm_b <= tol:
+            break
+        m = min(restart, n, maxiter - iterations)
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs, sn = np.zeros(m), np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+        k = 0
+        for k in range(m):
+            iterations += 1
+            w = A @ V[k]
+            for j in range(k + 1):
+                H[j, k] = w @ V[j]
+                w -= H[j, k] * V[j]
+            H[k + 1, k] = np.linalg.norm(w)
+            if H[k + 1, k] > 0:
+                V[k + 1] = w / H[k + 1, k]
+            for j in range(k):
+                H[j, k], H[j + 1, k] = (cs[j] * H[j, k] + sn[j] * H[j + 1, k],
+                                        -sn[j] * H[j, k] + cs[j] * H[j + 1, k])
+            denom = np.hypot(H[k, k], H[k + 1, k]) or 1.0
+            cs[k], sn[k] = H[k, k] / denom, H[k + 1, k] / denom
+            H[k, k], H[k + 1, k] = denom, 0.0
+            g[k], g[k + 1] = cs[k] * g[k], -sn[k] * g[k]
+            if abs(g[k + 1]) / norm_b <= tol:
+                break
+        size = k + 1
+        y = np.linalg.solve(H[:size, :size], g[:size]) if size else np.zeros(0)
+        x = x + V[:size].T @ y
+    return x, iterations
+
+
+def iterative_solve(
+    A: Any, b: Any, method: str = "auto", tol: float = 1e-8,
+    maxiter: int = 1000, restart: int = 50,
+) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """A x = b'yi CG (simetrik) veya GMRES ile cozer.
+
+    Returns:
+        (x, {"method", "iterations", "residual", "converged"})
+    """
+    b = np.asarray(b, dtype=float)
+    if method == "auto":
+        method = "cg" if is_symmetric(A) else "gmres"
+
+    if HAS_SCIPY:
+        counter = {"n": 0}
+
+        def callback(_: Any) -> None:
+            counter["n"] += 1
+
+        if method == "cg":
+            x, _ = _spla.cg(A, b, rtol=tol, atol=0.0, maxiter=maxiter, callback=callback)
+        else:
+            x, _ = _spla.gmres(A, b, rtol=tol, atol=0.0, restart=restart, maxiter=maxiter,
+                               callback=callback, callback_type="pr_norm")
+        iterations = counter["n"]
+    elif method == "cg":
+        x, iterations = _builtin_cg(A, b, tol, maxiter)
+    else:
+        x, iterations = _builtin_gmres(A, b, tol, maxiter, restart)
+
+    residual = _relative_residual(A, x, b)
+    return x, {
+        "method": method,
+        "iterations": iterations,
+        "residual": residual,
+        "converged": residual <= tol * 10,
+    }
+
+
+# ============================================================
+# MATRIX MARKET
+# ============================================================
+def read_matrix_market(path: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[int, int]]:
+    """.mtx dosyasini (satir, sutun, deger, boyut) ucluleri olarak okur (0 tabanli)"""
+    if HAS_SCIPY:
+        from scipy.io import mmread
+
+        data = mmread(str(path))
+        if _sp.issparse(data):
+            coo = data.tocoo()
+            return coo.row, coo.col, coo.data.astype(float), coo.shape
+        dense = np.asarray(data, dtype=float)
+        rows, cols = np.nonzero(dense)
+        return rows, cols, dense[rows, cols], dense.shape
+
+    with open(path, encoding="utf-8") as f:
+        header = f.readline().lower().split()
+        lines = [line for line in f if line.strip() and not line.startswith("%")]
+    size = lines[0].split()
+    m, n = int(size[0]), int(size[1])
+
+    if "array" in header:
+        dense = np.loadtxt(lines[1:], ndmin=1).reshape(n, m).T
+        rows, cols = np.nonzero(dense)
+        return rows, cols, dense[rows, cols], (m, n)
+
+    body = np.loadtxt(lines[1:], ndmin=2) if len(lines) > 1 else np.empty((0, 3))
+    rows, cols = body[:, 0].astype(np.int64) - 1, body[:, 1].astype(np.int64) - 1
+    values = body[:, 2] if body.shape[1] > 2 else np.ones(len(body))
+    if "symmetric" in header:
+        off = rows != cols
+        rows, cols, values = (np.concatenate([rows, cols[off]]), np.concatenate([cols, rows[off]]),
+                              np.concatenate([values, values[off]]))
+    return rows, cols, values, (m, n)
+
+
+def write_matrix_market(matrix: Any, path: Path) -> None:
+    """Seyrek matrisi koordinat formatinda atomik olarak yazar"""
+    rows, cols, data = coo_arrays(matrix)
+    tmp = Path(path).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("%%MatrixMarket matrix coordinate real general\n")
+        f.write(f"{matrix.shape[0]} {matrix.shape[1]} {len(data)}\n")
+        np.savetxt(f, np.column_stack([rows + 1, cols + 1, data]), fmt=["%d", "%d", "%.17g"])
+    os.replace(tmp, path)
@@ -0,0 +1,58 @@
+"""Tests for the content-addressed plot cache"""
+
+from src.core.plot_cache import PlotCache
+
+
+def _store(cache, key, size):
+    path = cache.path_for(key)
+    path.write_bytes(b"x" * size)
+    cache.put(key, path, {"visual_data": {"plot_paths": {"png": str(path)}}})
+    return path
+
+
+def test_make_key_is_stable_and_style_sensitive():
+    key = PlotCache.make_key("x**2", (-1, 1), {"dpi": 120})
+    assert key == PlotCache.make_key("x**2", [-1.0, 1.0], {"dpi": 120})
+    assert key != PlotCache.make_key("x**2", (-1, 1), {"dpi": 200})
+
+
+def test_lru_eviction_by_bytes_and_reconcile(tmp_path):
+    """Toplam bayt asilinca en eski erisilen silinmeli; dosyasi kaybolan kayit dusmeli"""
+    cache = PlotCache(str(tmp_path), max_bytes=250)
+    a = _store(cache, "a", 100)
+    b = _store(cache, "b", 100)
+    assert cache.get("a") is not None  # a artik en yeni erisilen
+    _store(cache, "c", 100)
+
+    assert a.exists() and not b.exists()
+    assert cache.get("b") is None
+    cache.close()
+
+    a.unlink()
+    reopened = PlotCache(str(tmp_path), max_bytes=250)
+    assert reopened.stats()["entries"] == 1
+    assert reopened.get("c") is not None
+
+
+def test_indexed_files_are_evicted_and_unindexed_files_discarded(tmp_path):
+    """Yan dosyalar indeksten silinmeli; sigmayan kayit ve yarim cizim dosya birakmamali"""
+    cache = PlotCache(str(tmp_path), max_bytes=250)
+    png, npz = cache.path_for("a"), cache.path_for("a", ".npz")
+    png.write_bytes(b"x" * 50)
+    npz.write_bytes(b"x" * 50)
+    cache.put("a", [png, npz], {})
+    assert cache.stats()["bytes"] == 100
+
+    _store(cache, "b", 200)
+    assert not png.exists() and not npz.exists()
+
+    big = cache.path_for("big")
+    big.write_bytes(b"x" * 300)
+    cache.put("big", big, {})
+    assert not big.exists() and cache.get("big") is None
+
+    orphan = cache.path_for("c", ".npz")
+    orphan.write_bytes(b"x")
+    cache.discard("c", [orphan, cache.path_for("c")])
+    cache.discard("b", [cache.path_for("b")])
+    assert not orphan.exists() and cache.path_for("b").exists()
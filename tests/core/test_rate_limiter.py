@@ -0,0 +1,43 @@
+"""Tests for the token-bucket rate limiter"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core.rate_limiter import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_burst_is_not_serialized():
+    """Burst kadar istek beklemeden gecmeli, sonraki token'i beklemeli"""
+    limiter = RateLimiter(calls_per_minute=600, burst=3)  # 10 token/sn
+
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+    assert time.monotonic() - started < 0.05
+
+    waited = await limiter.acquire()
+    assert waited >= 0.05
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_queue_depth():
+    """Ayni anda uctaki istek sayisi max_concurrency'yi asmamali"""
+    limiter = RateLimiter(calls_per_minute=6000, burst=10, max_concurrency=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.02)
+
+    tasks = [asyncio.ensure_future(call()) for _ in range(5)]
+    await asyncio.sleep(0.005)
+    assert limiter.queue_depth == 3
+
+    await asyncio.gather(*tasks)
+    assert peak == 2
+    assert limiter.stats()["acquired"] == 5
@@ -0,0 +1,97 @@
+"""Tests for the persistent response cache"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.agent import GeminiAgent
+from src.core.cache import LocalResultCache, ResponseCache
+
+
+def test_cache_survives_reopen(tmp_path):
+    """Cache process yeniden baslasa da kalici olmali"""
+    path = tmp_path / "responses.sqlite3"
+    key = ResponseCache.make_key("model", "prompt", {"temperature": 0.2})
+
+    cache = ResponseCache(str(path))
+    cache.set(key, {"result": 4.0})
+    cache.close()
+
+    reopened = ResponseCache(str(path))
+    assert reopened.get(key) == {"result": 4.0}
+    assert reopened.stats()["hits"] == 1
+
+
+def test_cache_lru_eviction(tmp_path):
+    """Limit asilinca en eski erisilen kayit silinmeli"""
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_json_response_served_from_cache(tmp_path):
+    """Ayni prompt ikinci kez API'ye gitmemeli, bypass edilirse gitmeli"""
+    agent = GeminiAgent(api_key="test-key")
+    agent.response_cache = ResponseCache(str(tmp_path / "c.sqlite3"))
+    agent.model = MagicMock()
+    agent.model.generate_content_async = AsyncMock(
+        return_value=MagicMock(text='{"result": 4}')
+    )
+
+    assert await agent.generate_json_response("2 + 2") == {"result": 4}
+    assert await agent.generate_json_response("2 + 2") == {"result": 4}
+    assert agent.model.generate_content_async.await_count == 1
+
+    await agent.generate_json_response("2 + 2", use_cache=False)
+    assert agent.model.generate_content_async.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_io_runs_off_event_loop(tmp_path, monkeypatch):
+    """SQLite okuma ve yazmalari event loop thread'inde calismamali"""
+    import threading
+
+    agent = GeminiAgent(api_key="test-key")
+    agent.response_cache = ResponseCache(str(tmp_path / "c.sqlite3"))
+    agent.model = MagicMock()
+    agent.model.generate_content_async = AsyncMock(return_value=MagicMock(text='{"result": 4}'))
+
+    threads = []
+    for name in ("get", "set"):
+        original = getattr(agent.response_cache, name)
+
+        def record(*args, _original=original):
+            threads.append(threading.get_ident())
+            return _original(*args)
+
+        monkeypatch.setattr(agent.response_cache, name, record)
+
+    await agent.generate_json_response("2 + 2")
+    await agent.generate_json_response("2 + 2")
+
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
+def test_local_result_cache_bounded_by_bytes():
+    """Bellek ici cache bayt siniriyla bosalmali; buyuk sonuclar saklanmamali"""
+    from src.schemas.models import CalculationResult
+
+    cache = LocalResultCache(max_entries=100, max_bytes=2000, max_item_bytes=1000)
+    small = CalculationResult(result="x" * 300, domain="test", metadata={"engine": "local"})
+    for i in range(10):
+        cache.set(f"k{i}", small)
+    assert cache.stats()["bytes"] <= 2000 and cache.get("k0") is None and cache.get("k9") is not None
+
+    cache.set("big", CalculationResult(result="x" * 5000, domain="test"))
+    assert cache.get("big") is None
+
+    hit = cache.get("k9")
+    hit.metadata["cache"] = "hit"
+    assert cache.get("k9").metadata == {"engine": "local"}
@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.core.sample_tiles import SampleTileCache
+from src.utils.sampling import adaptive_sample, compile_function, value_scale
+
+
+def test_zoom_and_pan_reuse_tiles():
+    """Ayni gorunum hic, kaydirma az, yakinlastirma yalnizca eksik kisimlari hesaplamali"""
+    tiles = SampleTileCache()
+    f, expr = compile_function("sin(x)/x")
+
+    x, y, first = tiles.sample(str(expr), f, -20, 20)
+    assert np.allclose(y[np.isfinite(y)], np.sinc(x[np.isfinite(y)] / np.pi))
+    assert x[0] == -20 and x[-1] == 20
+
+    _, _, again = tiles.sample(str(expr), f, -20, 20)
+    assert again["reused_tiles"] == again["tiles"] and again["samples"] == 2
+
+    _, _, zoomed = tiles.sample(str(expr), f, -1, 1)
+    assert zoomed["reused_tiles"] == 0 and zoomed["samples"] < first["samples"]
+
+
+def test_tiles_keep_discontinuity_breaks_and_memory_bound():
+    """Birlesik ornekte asimptot kesilmeli; toplam nokta siniri asilmamali"""
+    tiles = SampleTileCache(max_points=600)
+    f, expr = compile_function("1/x")
+
+    x, y, info = tiles.sample(str(expr), f, -5, 5)
+    assert info["discontinuities"] == 1 and np.isnan(y).sum() == 1
+
+    tiles.sample(str(expr), f, 100, 200)
+    assert tiles.stats()["points"] <= 600
+
+
+def _max_error(f, x, y, a, b):
+    """Sik referans izgaraya gore, y olcegine bolunmus en buyuk hata (kutuplar haric)"""
+    reference_x = np.linspace(a, b, 200_001)
+    reference_y = f(reference_x)
+    scale = value_scale(reference_y)
+    ok = np.isfinite(reference_y) & (np.abs(reference_y) < 5 * scale)
+    good = np.isfinite(y)
+    interpolated = np.interp(reference_x, x[good], y[good])
+    return np.max(np.abs(interpolated - reference_y)[ok]) / scale
+
+
+def test_tiles_match_dense_reference():
+    """Karolar hizli salinimda ve uzaklastirmada tek seferlik ornekleme kadar dogru olmali"""
+    tiles = SampleTileCache()
+    f, expr = compile_function("sin(50*x)")
+    x, y, _ = tiles.sample(str(expr), f, -10, 10)
+    fresh_x, fresh_y, _ = adaptive_sample(f, -10, 10)
+    assert _max_error(f, x, y, -10, 10) <= max(0.1, _max_error(f, fresh_x, fresh_y, -10, 10))
+
+    f, expr = compile_function("sin(x)/x")
+    tiles.sample(str(expr), f, -10, 10)
+    x, y, _ = tiles.sample(str(expr), f, -100, 100)
+    assert _max_error(f, x, y, -100, 100) < 0.05
@@ -0,0 +1,71 @@
+"""Tests for single-flight request coalescing"""
+
+import asyncio
+
+import pytest
+
+from src.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_coalesced():
+    """Eszamanli ozdes cagrilar tek bir isi paylasmali"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"result": 4}
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert calls == 1
+    assert flight.deduplicated == 4
+    assert all(r == {"result": 4} for r in results)
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_error_propagates_to_all_waiters():
+    """Ortak cagrinin hatasi tum bekleyenlere iletilmeli"""
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("api down")
+
+    results = await asyncio.gather(
+        *(flight.do("k", boom) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_shared_call():
+    """Bir bekleyenin iptali digerlerini etkilememeli, son bekleyen gidince is iptal olmali"""
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    first = asyncio.ensure_future(flight.do("k", slow))
+    second = asyncio.ensure_future(flight.do("k", slow))
+    await started.wait()
+
+    first.cancel()
+    assert await second == "ok"
+
+    lonely = asyncio.ensure_future(flight.do("other", slow))
+    await asyncio.sleep(0)
+    lonely.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lonely
+    assert flight.in_flight == 0
+    # Ayni anahtarla hemen gelen cagri iptal edilen goreve katilmamali
+    assert await flight.do("other", slow) == "ok"
@@ -0,0 +1,58 @@
+"""Tests for streamed Gemini JSON responses"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.agent import GeminiAgent
+from src.core.cache import ResponseCache
+
+
+class FakeStream:
+    """generate_content_async(stream=True) yanitini taklit eder"""
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for text in self.parts:
+            yield MagicMock(text=text, parts=[text])
+
+
+@pytest.mark.asyncio
+async def test_stream_json_response_emits_steps(tmp_path):
+    """Adimlar geldikce bildirilmeli, son JSON degismeden donmeli"""
+    agent = GeminiAgent(api_key="test-key")
+    agent.response_cache = ResponseCache(str(tmp_path / "c.sqlite3"))
+    agent.model = MagicMock()
+    agent.model.generate_content_async = AsyncMock(
+        return_value=FakeStream(['{"result": 12, "steps": ["a', '", "b"', '], "confidence_score": 1}'])
+    )
+
+    steps = []
+    result = await agent.stream_json_response("derivative", on_step=steps.append)
+
+    assert steps == ["a", "b"]
+    assert result == {"result": 12, "steps": ["a", "b"], "confidence_score": 1}
+
+    # Cache'ten gelen yanit da adimlari bildirir
+    replay = []
+    await agent.stream_json_response("derivative", on_step=replay.append)
+    assert replay == ["a", "b"]
+    assert agent.model.generate_content_async.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_cache_hit_returns_private_copy():
+    """Cache'ten donen yanit degistirilince cache'teki kayit bozulmamali"""
+    shared = {"result": 12, "steps": ["a", "b"]}
+    agent = GeminiAgent(api_key="test-key")
+    agent.response_cache = MagicMock()
+    agent.response_cache.get.return_value = shared
+
+    result = await agent.stream_json_response("derivative", on_step=lambda step: None)
+    result["steps"].append("c")
+
+    assert shared == {"result": 12, "steps": ["a", "b"]}
@@ -0,0 +1,91 @@
+"""Tests for shared BaseModule behaviour (prompt packing, canonical cache keys)"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.modules.basic_math import BasicMathModule
+from src.modules.base_module import _local_results
+from src.modules.calculus import CalculusModule
+
+
+@pytest.mark.asyncio
+async def test_calculate_many_packs_gemini_calls(mock_gemini_agent):
+    """Yerel cozulemeyen ifadeler tek pakette gitmeli, eksikler tek tek denenmeli"""
+    mock_gemini_agent.pack_size.return_value = 8
+    mock_gemini_agent.generate_json_array = AsyncMock(
+        return_value=[
+            {"index": 2, "result": 3.0, "steps": ["c"]},
+            {"index": 0, "result": 1.0, "steps": ["a"]},
+            "bozuk oge",
+        ]
+    )
+    module = BasicMathModule(mock_gemini_agent)
+
+    results = await module.calculate_many(
+        ["first word problem", "2 + 2", "second word problem", "third word problem"]
+    )
+
+    assert [r.result for r in results] == ["1.0", 4.0, "42.0", "3.0"]
+    assert results[1].metadata["engine"] == "local"
+    assert results[0].metadata["packed"] == 3
+    mock_gemini_agent.generate_json_array.assert_awaited_once()
+    # Paketteki [1] numarali oge eksikti → tek basina yeniden denendi
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_equivalent_queries_share_local_result(mock_gemini_agent):
+    """Esdeger yazim yerel motoru tekrar calistirmadan cache'ten donmeli"""
+    _local_results.clear()
+    module = CalculusModule(mock_gemini_agent)
+
+    first = await module.calculate("derivative of x^3 + 2x at x=2")
+    hits = _local_results.hits
+    second = await module.calculate("türev 2x + x ^ 3 at x = 2")
+
+    assert second.result == first.result
+    assert _local_results.hits == hits + 1
+    assert second.metadata["cache"] == "hit"
+    assert "cache" not in first.metadata
+
+
+@pytest.mark.asyncio
+async def test_equivalent_queries_share_response_cache_key(mock_gemini_agent):
+    """Gemini'ye giden prompt orijinal kalmali; cache anahtari kanonik bicimden uretilmeli"""
+    module = BasicMathModule(mock_gemini_agent)
+
+    await module._call_gemini("x^2+1 kac eder")
+    await module._call_gemini("1 + x ^ 2 kac  eder")
+
+    (first_args, first), (second_args, second) = mock_gemini_agent.generate_json_response.call_args_list
+    assert first["cache_prompt"] == second["cache_prompt"]
+    assert "x^2+1 kac eder" in first_args[0]
+    assert first_args[0] != second_args[0]
+
+
+@pytest.mark.asyncio
+async def test_isolated_local_job_is_killed_on_timeout(mock_gemini_agent):
+    """Zaman asimina ugrayan surec sonlandirilmali, sonraki isler yeni havuzda calismali"""
+    import math
+    import time
+
+    from src.modules import base_module
+    from src.utils.exceptions import UnsupportedExpressionError
+
+    module = BasicMathModule(mock_gemini_agent)
+    with pytest.raises(UnsupportedExpressionError):
+        await module._run_local(time.sleep, 30, timeout=0.5, isolated=True)
+
+    assert base_module._local_processes is None
+    assert await module._run_local(math.factorial, 5, isolated=True) == 120
+
+
+@pytest.mark.asyncio
+async def test_sign_products_do_not_share_cached_result(mock_gemini_agent):
+    """"-1" sonucu "-1*-1" icin cache'ten donmemeli"""
+    _local_results.clear()
+    module = BasicMathModule(mock_gemini_agent)
+
+    assert float((await module.calculate("-1")).result) == -1.0
+    assert float((await module.calculate("-1*-1")).result) == 1.0
+    assert float((await module.calculate("2*(-1)*(-1)")).result) == 2.0
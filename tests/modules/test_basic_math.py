@@ -24,3 +24,52 @@ async def test_basic_sqrt(mock_gemini_agent):
     assert result is not None
     assert result.domain == "basic_math"
 
+
+
+@pytest.mark.asyncio
+async def test_local_fast_path_skips_gemini(mock_gemini_agent):
+    """Saf aritmetik Gemini'ye gitmeden yerel olarak hesaplanmali"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("2 ^ 10 + sqrt(16)")
+
+    assert result.result == 1028.0
+    assert result.metadata["engine"] == "local"
+    assert len(result.steps) >= 2
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_exact_fraction_mode(mock_gemini_agent):
+    """Fraction modu tam sonuc dondurmeli"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("1/3 + 1/6", mode="fraction")
+
+    assert result.result == "1/2"
+    assert result.metadata["numeric"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_unsupported_expression_falls_back_to_gemini(mock_gemini_agent):
+    """Yerel olarak islenemeyen ifade Gemini'ye gitmeli"""
+    module = BasicMathModule(mock_gemini_agent)
+    result = await module.calculate("what is two plus two")
+
+    assert result.metadata["engine"] == "gemini"
+    assert module.engine_stats == {"local": 0, "gemini": 1}
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+def test_exact_modes_keep_literal_digits_and_cap_size():
+    """Kesin modlar ondalik sayiyi metinden kurmali; dev sonuclar formatlanmadan reddedilmeli"""
+    from decimal import Decimal
+
+    from src.core.evaluator import evaluate_expression
+    from src.utils.exceptions import UnsupportedExpressionError
+
+    assert evaluate_expression("1.0000000000000000001 * 3", mode="decimal")[0] == Decimal(
+        "3.0000000000000000003"
+    )
+    assert str(evaluate_expression("0.1 + 0.2", mode="fraction")[0]) == "3/10"
+    for expression in ("3^10000", "2^3000 * 2^3000 * 2^3000 * 2^3000 * 2^3000"):
+        with pytest.raises(UnsupportedExpressionError):
+            evaluate_expression(expression)
@@ -34,3 +34,39 @@ async def test_calculus_integral(mock_gemini_agent):
     assert result is not None
     assert result.domain == "calculus"
 
+
+
+@pytest.mark.asyncio
+async def test_calculus_local_sympy_engine(mock_gemini_agent):
+    """Turev/integral/limit Gemini'ye gitmeden SymPy ile cozulmeli"""
+    module = CalculusModule(mock_gemini_agent)
+
+    derivative = await module.calculate("derivative x^3 at x=2")
+    integral = await module.calculate("integral x^2 from 0 to 1")
+    limit = await module.calculate("limit sin(x)/x as x->0")
+
+    assert derivative.result == 12.0
+    assert derivative.metadata["engine"] == "local"
+    assert integral.metadata["exact"] == "1/3"
+    assert limit.result == 1.0
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_calculus_falls_back_to_gemini(mock_gemini_agent):
+    """Ayristirilamayan komut Gemini'ye gitmeli"""
+    module = CalculusModule(mock_gemini_agent)
+    result = await module.calculate("explain the derivative of a moving car")
+
+    assert result.metadata["engine"] == "gemini"
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_calculus_accepts_turkish_function_names(mock_gemini_agent):
+    """Turkce fonksiyon adlari ortak ifade servisinde cozulmeli"""
+    module = CalculusModule(mock_gemini_agent)
+    result = await module.calculate("derivative karekök(x) at x=4")
+
+    assert result.result == pytest.approx(0.25)
+    mock_gemini_agent.generate_json_response.assert_not_called()
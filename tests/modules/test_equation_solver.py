@@ -0,0 +1,59 @@
+"""Tests for equation solver module"""
+
+import numpy as np
+import pytest
+
+from src.modules.equation_solver import EquationSolverModule, polynomial_roots
+
+
+@pytest.mark.asyncio
+async def test_quadratic_solved_locally(mock_gemini_agent):
+    """Ikinci derece denklem Gemini'siz, kesin koklerle cozulmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("2x^2 - 5x + 3 = 0")
+
+    assert result.result == [1.0, 1.5]
+    assert result.metadata["exact"] == ["1", "3/2"]
+    assert result.metadata["engine"] == "local"
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_linear_system_solved_locally(mock_gemini_agent):
+    """Kucuk dogrusal sistem numpy.linalg.solve ile cozulmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("2x + y = 5; x - y = 1")
+
+    assert result.result == {"x": 2.0, "y": 1.0}
+    assert result.domain == "equation_solver"
+
+
+@pytest.mark.asyncio
+async def test_unclassified_equation_falls_back(mock_gemini_agent):
+    """Polinom olmayan denklem Gemini'ye gitmeli"""
+    module = EquationSolverModule(mock_gemini_agent)
+    result = await module.calculate("sin(x) = x / 2")
+
+    assert result.metadata["engine"] == "gemini"
+
+
+def test_polynomial_roots_vectorized():
+    """Ayni dereceli polinomlar tek cagrida cozulmeli"""
+    roots = polynomial_roots([[1, 0, -1], [1, -3, 2]])
+
+    assert roots.shape == (2, 2)
+    assert np.allclose(np.sort(roots.real, axis=1), [[-1, 1], [1, 2]])
+
+
+@pytest.mark.asyncio
+async def test_high_degree_goes_to_gemini(mock_gemini_agent):
+    """Derece siniri ustundeki polinomlar companion matrisi kurulmadan Gemini'ye gitmeli"""
+    from src.utils.exceptions import UnsupportedExpressionError
+
+    module = EquationSolverModule(mock_gemini_agent)
+    for equation in ("x^20000 = 1", "(x + 1)^20000 = 0"):
+        result = await module.calculate(equation)
+        assert result.metadata["engine"] == "gemini"
+
+    with pytest.raises(UnsupportedExpressionError):
+        polynomial_roots(np.ones(20_001))
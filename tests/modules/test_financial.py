@@ -0,0 +1,128 @@
+"""Tests for financial module"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.modules.financial import FinancialModule, parse_financial_command
+from src.utils import finance
+
+
+@pytest.mark.asyncio
+async def test_npv_computed_locally(mock_gemini_agent):
+    """Regex ile ayristirilan NPV Gemini'siz hesaplanmali"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("npv 10% [-1000, 300, 400, 500]")
+
+    assert result.result == pytest.approx(-21.04, abs=0.01)
+    assert result.metadata["engine"] == "local"
+    assert result.metadata["currency"] == "USD"
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_loan_payment_and_amortization(mock_gemini_agent):
+    """Aylik kredi taksiti ve odeme plani kapali formla hesaplanmali"""
+    module = FinancialModule(mock_gemini_agent)
+    loan = await module.calculate("loan 200000 at 5% for 30 years")
+    schedule = await module.calculate("amortization 200000 at 5% for 30 years")
+
+    assert loan.result == pytest.approx(1073.64, abs=0.01)
+    assert len(schedule.result["schedule"]) == 360
+    assert schedule.result["schedule"][-1][-1] == pytest.approx(0.0, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_exact_mode_returns_decimal_string(mock_gemini_agent):
+    """exact=True Decimal ile kurus hassasiyetinde sonuc vermeli"""
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("npv 10% [-1000, 300, 400, 500]", exact=True)
+
+    assert result.result == "-21.04"
+    assert result.metadata["exact"] is True
+
+
+@pytest.mark.asyncio
+async def test_gemini_extracts_parameters_only(mock_gemini_agent):
+    """Regex yetmezse Gemini sadece parametre cikarir, hesap yerel yapilir"""
+    mock_gemini_agent.generate_json_response.return_value = {
+        "operation": "irr",
+        "cashflows": [-100, 60, 60],
+    }
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("yatirimin getirisi ne kadar, once 100 verdim sonra iki kez 60 aldim")
+
+    assert result.result == pytest.approx(0.130662, abs=1e-6)
+    assert result.metadata["engine"] == "gemini_parse"
+
+
+def test_extracted_rate_is_annual_percent():
+    """Cikarilan oran yillik yuzde olmali; belirsiz "rate" alani kabul edilmemeli"""
+    from src.modules.financial import command_from_params
+
+    command = command_from_params(
+        {"operation": "pmt", "annual_rate_percent": 6, "nper": 360, "pv": 200000, "periods_per_year": 12}
+    )
+    assert command["rate"] == pytest.approx(0.06)
+    assert command_from_params({"operation": "pmt", "rate": 0.005, "nper": 360, "pv": 200000}) is None
+
+
+@pytest.mark.asyncio
+async def test_unsupported_request_uses_one_gemini_call(mock_gemini_agent):
+    """Desteklenmeyen istekte cikarim yaniti cozumu de getirmeli, ikinci cagri olmamali"""
+    mock_gemini_agent.generate_json_response.return_value = {
+        "operation": "other",
+        "result": 1250.0,
+        "steps": ["Kira getirisi hesaplandi"],
+    }
+    module = FinancialModule(mock_gemini_agent)
+    result = await module.calculate("kira getirim ne kadar olur acaba")
+
+    assert result.result == "1250.0"
+    assert result.metadata["engine"] == "gemini"
+    mock_gemini_agent.generate_json_response.assert_awaited_once()
+
+
+def test_irr_and_xirr_vectorized():
+    """Bircok seri tek cagrida cozulmeli; isaret degisimi yoksa NaN"""
+    rates = finance.irr([[-1000, 300, 400, 500], [-100, 110, 0, 0], [100, 10, 10, 10]])
+
+    assert rates[0] == pytest.approx(0.088963, abs=1e-6)
+    assert rates[1] == pytest.approx(0.10, abs=1e-9)
+    assert np.isnan(rates[2])
+    assert finance.xirr(
+        [-1000, 1100], [date(2023, 1, 1), date(2024, 1, 1)]
+    ) == pytest.approx(0.10, abs=1e-9)
+
+
+def test_parse_financial_command():
+    """Anahtar=deger ve oran bicimleri ayristirilmali"""
+    command = parse_financial_command("fv rate=5% nper=10 pmt=-100 pv=-1000")
+
+    assert command["operation"] == "fv"
+    assert command["rate"] == pytest.approx(0.05)
+    assert command["pmt"] == -100
+    assert parse_financial_command("what is my loan") is None
+
+
+@pytest.mark.asyncio
+async def test_turkish_percent_prefix_is_not_read_as_principal(mock_gemini_agent):
+    """"%2" oran, 100000 anapara olmali; ayni sayi iki alana birden yazilmamali"""
+    command = parse_financial_command("kredi 100000 %2 faiz 12 ay")
+
+    assert command["rate"] == pytest.approx(0.02)
+    assert command["pv"] == 100000 and command["nper"] == 12
+
+    loan = await FinancialModule(mock_gemini_agent).calculate("kredi 100000 %2 faiz 12 ay")
+    assert loan.result == pytest.approx(8423.89, abs=0.01)
+    assert loan.metadata["engine"] == "local"
+
+
+def test_ambiguous_or_implausible_rates_fall_back():
+    """Bosluklu yuzde, ondalik virgul ve %100 ustu oranlar yerelde ayristirilmamali"""
+    assert parse_financial_command("kredi 100000 % 2 faiz 12 ay") is None
+    assert parse_financial_command("kredi %2,5 100000 12 ay") is None
+    assert parse_financial_command("loan 1000 at 150% for 1 year") is None
+    assert parse_financial_command("fv rate=1 nper=10 pmt=-100")["rate"] == pytest.approx(0.01)
+    assert parse_financial_command("fv rate=0.05 nper=10 pmt=-100")["rate"] == pytest.approx(0.05)
@@ -0,0 +1,219 @@
+"""Tests for graph plotter module"""
+
+import pytest
+from src.modules.graph_plotter import GraphPlotterModule, parse_plot_command
+
+
+@pytest.fixture
+def plotter(mock_gemini_agent, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return GraphPlotterModule(mock_gemini_agent)
+
+
+def test_parse_plot_command_ranges():
+    """Fonksiyon ve aralik farkli yazimlardan ayrilmali"""
+    command = parse_plot_command("plot sin(x) from -5 to 5")
+    assert command["function"] == "sin(x)" and command["x_range"] == (-5.0, 5.0)
+    assert parse_plot_command("graph of y = x^2, x=-2..3")["x_range"] == (-2.0, 3.0)
+    assert parse_plot_command("tan(x)")["x_range"] == (-10.0, 10.0)
+    surface = parse_plot_command("surface sin(x)*cos(y), x from -3 to 3, y from -1 to 1")
+    assert surface["mode"] == "surface" and surface["y_range"] == (-1.0, 1.0)
+
+
+def test_parse_plot_command_series():
+    """Liste, parametrik ve kutupsal bicimler seri olarak ayrilmali"""
+    multi = parse_plot_command("plot x^2, 2^x, log(max(x, 1)) from 0.1 to 4")
+    assert [s["expr"] for s in multi["series"]] == ["x^2", "2^x", "log(max(x, 1))"]
+    assert multi["x_range"] == (0.1, 4.0)
+
+    curves = parse_plot_command("plot r = 1 + cos(θ); (cos(t), sin(t)), t=0..pi")
+    assert [s["kind"] for s in curves["series"]] == ["polar", "parametric"]
+    assert curves["t_range"][1] == pytest.approx(3.14159, abs=1e-5)
+    assert parse_plot_command("parametric x=cos(t), y=sin(t)")["series"] == [
+        {"kind": "parametric", "x": "cos(t)", "y": "sin(t)"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_plots_requested_function_locally(plotter, mock_gemini_agent):
+    """Istenen fonksiyon Gemini'siz cizilmeli, ornek sayisi metadata'da olmali"""
+    from pathlib import Path
+
+    result = await plotter.calculate("plot sin(x) from -5 to 5")
+
+    assert result.visual_data["function"] == "sin(x)"
+    assert Path(result.visual_data["plot_paths"]["png"]).is_file()
+    assert 0 < result.metadata["samples"] < 500
+    assert result.metadata["engine"] == "local"
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+def test_adaptive_sampling_refines_near_asymptote():
+    """Duz bolge seyrek, asimptot cevresi yogun orneklenmeli ve cizgi kesilmeli"""
+    import numpy as np
+    from src.utils.sampling import sample_function
+
+    x, y, info = sample_function("1/x", (-5, 5))
+
+    assert info["discontinuities"] == 1
+    assert np.isnan(y).sum() == 1
+    near = np.sum(np.abs(x) < 0.5)
+    far = np.sum(np.abs(x) > 4.5)
+    assert near > 5 * far
+    assert info["samples"] < 1000
+
+
+@pytest.mark.asyncio
+async def test_plot_cache_survives_restart(plotter, mock_gemini_agent):
+    """Ayni grafik (yazim farkli olsa da) yeni bir ornekte yeniden cizilmemeli"""
+    first = await plotter.calculate("plot x^2 + 1 from -2 to 2")
+    restarted = GraphPlotterModule(mock_gemini_agent)
+    second = await restarted.calculate("plot 1 + x^2, x=-2..2")
+
+    assert second.metadata["cache"] == "hit"
+    assert second.visual_data["plot_paths"] == first.visual_data["plot_paths"]
+    assert second.metadata["samples"] == first.metadata["samples"]
+
+
+@pytest.mark.asyncio
+async def test_contour_plot_keeps_full_grid_in_export(plotter, monkeypatch):
+    """f(x, y) tek gecisle izgarada hesaplanmali; cizim seyreltilmis, veri tam cozunurlukte olmali"""
+    import numpy as np
+    from src.config.settings import settings
+
+    monkeypatch.setattr(settings, "PLOT_GRID_POINTS", 400 * 200)
+    result = await plotter.calculate("contour x^2 - y^2, x=-4..4, y=-1..1")
+
+    assert result.visual_data["plot_type"] == "contour"
+    ny, nx = result.metadata["grid"]
+    assert ny * nx <= 400 * 200 and nx > ny
+    assert max(result.metadata["render_grid"]) <= 300
+    with np.load(result.visual_data["plot_paths"]["data"]) as data:
+        assert data["z"].shape == (ny, nx)
+        assert data["z"][0, 0] == pytest.approx(16 - 1)
+
+
+def test_data_output_returns_series_without_matplotlib(tmp_path):
+    """output=data ornekleri dondurmeli; Matplotlib hic yuklenmemeli"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "import asyncio, sys\n"
+        "from unittest.mock import MagicMock\n"
+        "from src.modules.graph_plotter import GraphPlotterModule\n"
+        "result = asyncio.run(GraphPlotterModule(MagicMock()).calculate('plot x^2 from 0 to 1 as data'))\n"
+        "assert result.visual_data['output'] == 'data'\n"
+        "x, y = result.result['x'].to_numpy(), result.result['y'].to_numpy()\n"
+        "assert x.shape == y.shape and abs(y[-1] - 1) < 1e-9\n"
+        "assert 'matplotlib' not in sys.modules\n"
+    )
+    root = Path(__file__).resolve().parents[2]
+    env = {**__import__("os").environ, "PYTHONPATH": str(root), "GOOGLE_API_KEY": "dummy"}
+    completed = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert completed.returncode == 0, completed.stderr
+
+
+@pytest.mark.asyncio
+async def test_svg_output_and_invalid_format(plotter):
+    """svg ciktisi vektorel dosya uretmeli; bilinmeyen bicim reddedilmeli"""
+    from pathlib import Path
+    from src.utils.exceptions import CalculationError
+
+    result = await plotter.calculate("plot cos(x) from -3 to 3", output="svg")
+    svg = Path(result.visual_data["plot_paths"]["svg"])
+    assert svg.suffix == ".svg" and b"<svg" in svg.read_bytes()[:500]
+
+    with pytest.raises(CalculationError):
+        await plotter.calculate("plot cos(x)", output="gif")
+
+
+@pytest.mark.asyncio
+async def test_pan_reuses_sample_tiles(plotter):
+    """Kaydirilan gorunum ortusen karolari yeniden kullanip az nokta hesaplamali"""
+    first = await plotter.calculate("plot sin(x)/x + 2 from -20 to 20")
+    panned = await plotter.calculate("plot sin(x)/x + 2 from -25 to 15")
+
+    assert first.metadata["reused_tiles"] == 0
+    assert panned.metadata["reused_tiles"] >= panned.metadata["tiles"] - 2
+    assert panned.metadata["samples"] < first.metadata["samples"] / 4
+
+
+@pytest.mark.asyncio
+async def test_multiple_series_share_one_figure(plotter):
+    """Fonksiyonlar tek grafikte, ortak x izgarasinda hesaplanmali"""
+    import numpy as np
+
+    result = await plotter.calculate("plot x^2, 2^x, log(x) from 0.1 to 4 output=data")
+
+    assert result.metadata["series"] == 3
+    assert [s["label"] for s in result.visual_data["series"]] == ["x**2", "2**x", "log(x)"]
+    x0, x2 = result.result["x0"].to_numpy(), result.result["x2"].to_numpy()
+    assert np.array_equal(x0, x2)
+    assert np.allclose(result.result["y2"].to_numpy(), np.log(x2))
+
+    figure = await plotter.calculate("plot r = 1 + cos(theta), sin(x) from -2 to 2")
+    assert figure.visual_data["plot_type"] == "mixed"
+    assert len(figure.visual_data["plot_paths"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_local_timeout_falls_back_to_gemini(plotter, mock_gemini_agent, monkeypatch):
+    """Yerel motor zaman asimina ugrarsa hata degil Gemini sonucu donmeli"""
+    from src.utils.exceptions import UnsupportedExpressionError
+
+    async def timeout(*args, **kwargs):
+        raise UnsupportedExpressionError("Yerel hesaplama zaman asimi")
+
+    monkeypatch.setattr(plotter, "_run_local", timeout)
+    result = await plotter.calculate("plot sin(x) from -5 to 5")
+
+    assert result.metadata["engine"] == "gemini"
+    mock_gemini_agent.generate_json_response.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_render_leaves_no_files(plotter, monkeypatch):
+    """Cizim hata verirse once yazilan .npz dosyasi cache dizininde kalmamali"""
+    from src.modules import graph_plotter
+    from src.utils.exceptions import CalculationError
+
+    async def broken(spec, path):
+        raise RuntimeError("renderer down")
+
+    monkeypatch.setattr(graph_plotter._renderer, "render_to_file", broken)
+    with pytest.raises(CalculationError):
+        await plotter.calculate("surface x*y, x from -1 to 1, y from -1 to 1")
+
+    assert not [p for p in plotter.cache_dir.iterdir() if p.suffix in (".npz", ".png", ".svg")]
+
+
+@pytest.mark.asyncio
+async def test_huge_range_bound_fails_fast(plotter, mock_gemini_agent):
+    """9^9^9 gibi sinirlar event loop'u kilitlememeli; izole surec oldurulup Gemini'ye dusulmeli"""
+    import asyncio
+    import time
+
+    assert parse_plot_command("plot x from 0 to 10^400") is None
+
+    started = time.monotonic()
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.1)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        result = await asyncio.wait_for(plotter.calculate("plot x from 0 to 9^9^9"), 30)
+    finally:
+        beat.cancel()
+
+    assert result.metadata["engine"] == "gemini"
+    assert time.monotonic() - started < 20
+    assert ticks >= 10  # bekleme boyunca loop cevap vermeye devam etti
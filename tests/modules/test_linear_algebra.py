@@ -23,3 +23,166 @@ async def test_determinant(mock_gemini_agent):
     assert result is not None
     assert result.domain == "linear_algebra"
 
+
+
+@pytest.mark.asyncio
+async def test_local_operation_set(mock_gemini_agent):
+    """Ters, rank, iz, us ve sistem cozumu Gemini'siz hesaplanmali"""
+    import numpy as np
+
+    module = LinearAlgebraModule(mock_gemini_agent)
+
+    inverse = await module.calculate("inverse [[4, 7], [2, 6]]")
+    assert np.allclose(inverse.result.to_numpy(), [[0.6, -0.7], [-0.2, 0.4]])
+    assert inverse.metadata["shape"] == [2, 2]
+
+    assert (await module.calculate("rank [[1, 2], [2, 4]]")).result == 1
+    assert (await module.calculate("trace [[1, 2], [3, 4]]")).result == 5
+    assert (await module.calculate("[[1, 1], [1, 0]] ^ 5")).result.to_numpy().tolist() == [[8, 5], [5, 3]]
+    assert (await module.calculate("solve [[3, 1], [1, 2]] [9, 8]")).result.to_numpy() == pytest.approx([2, 3])
+    mock_gemini_agent.generate_json_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_eigen_and_norm(mock_gemini_agent):
+    """Simetrik matriste eigh kullanilmali; norm sirasi secilebilmeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+
+    eigen = await module.calculate("eigen [[2, 0], [0, 3]]")
+    assert eigen.result["eigenvalues"] == [2.0, 3.0]
+    assert (await module.calculate("norm [3, 4]")).result == 5.0
+    assert (await module.calculate("norm inf [[1, -2], [3, 4]]")).result == 7.0
+
+
+@pytest.mark.asyncio
+async def test_code_in_matrix_is_rejected(mock_gemini_agent):
+    """Matris metni eval edilmemeli"""
+    from src.utils.exceptions import CalculationError
+
+    module = LinearAlgebraModule(mock_gemini_agent)
+    with pytest.raises(CalculationError):
+        await module.calculate("determinant [[len('ab'), 1], [1, 1]]")
+
+
+@pytest.mark.asyncio
+async def test_matrix_chain_expression(mock_gemini_agent):
+    """A*B*C zinciri ve plan/FLOP bilgisi adimlarda raporlanmali"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    result = await module.calculate("[[1, 2]] * [[1], [1]] * [[2, 3]]")
+
+    assert result.result.to_numpy().tolist() == [[6.0, 9.0]]
+    assert result.metadata["shape"] == [1, 2]
+    assert result.metadata["flops"] > 0
+    assert any(step.startswith("Chain") for step in result.steps)
+
+
+@pytest.fixture
+def linalg_files(tmp_path, monkeypatch):
+    """Gecici veri koku ve cikti dizini"""
+    from src.config.settings import settings
+
+    monkeypatch.setattr(settings, "LINALG_DATA_ROOT", str(tmp_path))
+    monkeypatch.setattr(settings, "LINALG_OUTPUT_DIR", str(tmp_path / "out"))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_file_product_is_blocked_and_written_to_file(mock_gemini_agent, linalg_files, monkeypatch):
+    """Butceyi asan carpim bloklu hesaplanip dosyaya yazilmali"""
+    import numpy as np
+    from src.config.settings import settings
+
+    rng = np.random.default_rng(0)
+    A, B = rng.random((60, 40)), rng.random((40, 30))
+    np.save(linalg_files / "A.npy", A)
+    np.save(linalg_files / "B.npy", B)
+    monkeypatch.setattr(settings, "LINALG_MEMORY_BUDGET_BYTES", 8 * 1000)
+
+    module = LinearAlgebraModule(mock_gemini_agent)
+    result = await module.calculate("@A.npy * @B.npy")
+
+    assert result.result["shape"] == [60, 30]
+    assert np.allclose(np.load(result.result["path"]), A @ B)
+    assert result.result["stats"]["max"] == pytest.approx((A @ B).max())
+
+
+@pytest.mark.asyncio
+async def test_file_reference_outside_data_root_is_rejected(mock_gemini_agent, linalg_files):
+    """Veri kokunun disina cikan yol reddedilmeli"""
+    from src.utils.exceptions import CalculationError
+
+    module = LinearAlgebraModule(mock_gemini_agent)
+    with pytest.raises(CalculationError):
+        await module.calculate("determinant @../secret.npy")
+
+
+@pytest.mark.asyncio
+async def test_batch_determinant_and_inverse(mock_gemini_agent):
+    """Yigin tek vektorize cagrida islenmeli; tekil matris tum yigini dusurmemeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+
+    dets = await module.calculate("batch determinant [[[1, 2], [3, 4]], [[2, 0], [0, 2]]]")
+    assert dets.result.to_numpy() == pytest.approx([-2.0, 4.0])
+    assert dets.metadata["count"] == 2
+    assert "matrices_per_second" in dets.metadata
+
+    inverses = await module.calculate("batch inverse [[[2, 0], [0, 4]], [[1, 2], [2, 4]]]")
+    assert inverses.metadata["shape"] == [2, 2, 2]
+    assert inverses.result.to_numpy()[0].tolist() == [[0.5, 0.0], [0.0, 0.25]]
+    assert inverses.metadata["singular_indices"] == [1]
+
+
+@pytest.mark.asyncio
+async def test_sparse_coo_solve_and_product(mock_gemini_agent):
+    """Seyrek coo girdisi CG ile cozulmeli, carpim seyrek kalmali"""
+    import numpy as np
+
+    n = 40
+    triplets = [[i, i, 4] for i in range(n)] + [[i, i + 1, -1] for i in range(0, n - 1, 8)] \
+        + [[i + 1, i, -1] for i in range(0, n - 1, 8)]
+    literal = f"coo({n}x{n}){triplets}".replace(" ", "")
+    A = np.zeros((n, n))
+    for i, j, v in triplets:
+        A[i, j] = v
+    b = list(range(1, n + 1))
+
+    module = LinearAlgebraModule(mock_gemini_agent)
+    solved = await module.calculate(f"solve {literal} {b} tol=1e-10")
+    assert np.allclose(solved.result.to_numpy(), np.linalg.solve(A, b))
+    assert solved.metadata["method"] == "cg"
+    assert solved.metadata["converged"] is True
+
+    product = await module.calculate(f"{literal} * {literal}")
+    assert product.result["format"] == "coo"
+    assert product.result["nnz"] == np.count_nonzero(A @ A)
+
+
+@pytest.mark.asyncio
+async def test_dense_enough_coo_input_uses_dense_path(mock_gemini_agent):
+    """Yogunlugu esigin ustundeki coo girdisi yogun matrise cevrilmeli"""
+    module = LinearAlgebraModule(mock_gemini_agent)
+    result = await module.calculate("determinant coo[[0,0,2],[1,1,3]]")
+
+    assert result.result == pytest.approx(6.0)
+    assert result.metadata["representation"] == ["dense"]
+
+
+@pytest.mark.asyncio
+async def test_array_result_keeps_shape_and_serializes_buffer(mock_gemini_agent):
+    """Matris sonucu dtype/shape ile tasinmali; JSON'da base64, ekranda kisaltilmis"""
+    import numpy as np
+    from src.schemas.models import ArrayResult
+    from src.utils.helpers import format_result_for_display
+
+    module = LinearAlgebraModule(mock_gemini_agent)
+    result = await module.calculate("[[1, 2], [3, 4]] * [[1, 0], [0, 1]]")
+
+    assert result.result.shape == [2, 2]
+    payload = result.model_dump(mode="json")["result"]
+    assert isinstance(payload["data"], str)
+    restored = ArrayResult.model_validate_json(result.result.model_dump_json())
+    assert restored.to_numpy().tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+    big = ArrayResult.from_numpy(np.arange(10000.0).reshape(100, 100))
+    text = format_result_for_display(big)
+    assert "..." in text and len(text) < 1000
@@ -0,0 +1,128 @@
+"""Tests for batch mode"""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from src.core.batch import iter_batch_input, run_batch
+from src.schemas.models import CalculationResult
+
+
+class FakeAgent:
+    """CalculatorAgent.evaluate yerine gecen sahte agent"""
+
+    def __init__(self):
+        self.seen = []
+
+    async def evaluate(self, expression: str) -> CalculationResult:
+        self.seen.append(expression)
+        await asyncio.sleep(random.random() / 100)
+        if expression == "boom":
+            raise ValueError("bad input")
+        return CalculationResult(result=float(len(expression)), domain="basic_math")
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_batch_preserves_input_order(tmp_path):
+    """Esazamanli islense de sonuclar girdi sirasinda yazilmali"""
+    src = tmp_path / "in.jsonl"
+    lines = [json.dumps({"expression": "1" * i, "id": i}) for i in range(1, 21)]
+    lines.insert(5, json.dumps("boom"))
+    src.write_text("\n".join(lines) + "\n")
+    out = tmp_path / "out.jsonl"
+
+    stats = await run_batch(FakeAgent(), str(src), str(out), concurrency=4)
+
+    records = _read(out)
+    assert [r["line"] for r in records] == list(range(1, 22))
+    assert stats == {"processed": 21, "skipped": 0, "failed": 1}
+    assert records[5]["ok"] is False
+    assert records[0]["output"]["result"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_batch_resumes_from_checkpoint(tmp_path):
+    """Yarim kalan calisma tamamlanan satirlari tekrar islememeli"""
+    src = tmp_path / "in.csv"
+    src.write_text("id,expression\n1,2+2\n2,3*3\n3,4-1\n")
+    out = tmp_path / "out.jsonl"
+    out.write_text(json.dumps({"line": 1, "ok": True}) + "\n" + '{"line": 2, "ok"')
+
+    agent = FakeAgent()
+    stats = await run_batch(agent, str(src), str(out), concurrency=2, ordered=False)
+
+    assert agent.seen == ["3*3", "4-1"]
+    assert stats["skipped"] == 1
+    assert sorted(r["line"] for r in _read(out)) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_batch_resume_retries_failed_records(tmp_path):
+    """Hatali kayitlar checkpoint sayilmamali; yeniden denenip dosyada tek kayit kalmali"""
+    src = tmp_path / "in.jsonl"
+    src.write_text('"2+2"\n"3*3"\n')
+    out = tmp_path / "out.jsonl"
+    out.write_text(
+        json.dumps({"line": 1, "ok": True}) + "\n" + json.dumps({"line": 2, "ok": False, "error": "x"}) + "\n"
+    )
+
+    agent = FakeAgent()
+    stats = await run_batch(agent, str(src), str(out), concurrency=2)
+
+    assert agent.seen == ["3*3"]
+    assert stats == {"processed": 1, "skipped": 1, "failed": 0}
+    assert [(r["line"], r["ok"]) for r in _read(out)] == [(1, True), (2, True)]
+
+
+def test_iter_batch_input_is_lazy(tmp_path):
+    """Girdi satir satir okunmali"""
+    src = tmp_path / "in.jsonl"
+    src.write_text('"2+2"\n\n{"command": "!calculus derivative x^2"}\n')
+
+    items = iter_batch_input(str(src))
+    assert next(items) == (1, "2+2", None)
+    assert next(items) == (3, "!calculus derivative x^2", None)
+
+
+class GroupingAgent(FakeAgent):
+    """evaluate_many sunan sahte agent: gruplari kaydeder"""
+
+    def __init__(self):
+        super().__init__()
+        self.groups = []
+
+    async def evaluate_many(self, expressions):
+        self.groups.append(list(expressions))
+        outcomes = []
+        for expression in expressions:
+            try:
+                outcomes.append(await self.evaluate(expression))
+            except ValueError as e:
+                outcomes.append(e)
+        return outcomes
+
+
+@pytest.mark.asyncio
+async def test_batch_groups_pending_records(tmp_path):
+    """Kuyrukta bekleyen kayitlar evaluate_many ile birlikte islenmeli, sira korunmali"""
+    src = tmp_path / "in.jsonl"
+    lines = [json.dumps("1" * i) for i in range(1, 31)]
+    lines.insert(3, json.dumps("boom"))
+    src.write_text("\n".join(lines) + "\n")
+    out = tmp_path / "out.jsonl"
+
+    agent = GroupingAgent()
+    stats = await run_batch(agent, str(src), str(out), concurrency=2, group_size=4)
+
+    records = _read(out)
+    assert [r["line"] for r in records] == list(range(1, 32))
+    assert stats == {"processed": 31, "skipped": 0, "failed": 1}
+    assert records[3]["ok"] is False and records[4]["output"]["result"] == 4.0
+    assert max(len(group) for group in agent.groups) > 1
+    assert all(len(group) <= 4 for group in agent.groups)
@@ -50,3 +50,17 @@ async def test_command_parsing():
     module, expr = parser.parse("solve 2x + 3 = 0")
     assert module == "equation_solver" or module == "basic_math"
 
+
+
+@pytest.mark.asyncio
+async def test_evaluate_many_groups_by_module(mock_gemini_agent):
+    """Ayni module dusen komutlar birlikte islenmeli; hatali komut digerlerini dusurmemeli"""
+    agent = CalculatorAgent()
+    for module in agent.modules.values():
+        module.gemini_agent = mock_gemini_agent
+
+    results = await agent.evaluate_many(["2 + 2", "eval('malicious code')", "3 * 3"])
+
+    assert [results[0].result, results[2].result] == [4, 9]
+    assert isinstance(results[1], SecurityViolationError)
+    mock_gemini_agent.generate_json_response.assert_not_called()
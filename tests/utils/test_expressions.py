@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from src.utils.expressions import (
+    ExpressionCache,
+    canonical_key,
+    compile_expression,
+    normalize_expression,
+)
+
+
+def test_equivalent_spellings_share_one_key():
+    """^, ortuk carpim, bosluk, π ve Turkce adlar ayni normalize metne inmeli"""
+    assert normalize_expression("3x^2 + sin(x)") == normalize_expression("3*x**2+sin( x )")
+    assert normalize_expression("2(x+1)(x-1)") == "2*(x+1)*(x-1)"
+    assert normalize_expression("2π r²") == "2*pi*r**2"
+    assert normalize_expression("karekök(x) + Sinüs(x)") == "sqrt(x)+sin(x)"
+    with pytest.raises(ValueError):
+        normalize_expression("x.real")
+
+
+def test_cache_reuses_compiled_object_and_is_bounded():
+    """Ayni ifade tek kez parse/lambdify edilmeli; LRU siniri asilmamali"""
+    cache = ExpressionCache(max_entries=2)
+    first = cache.compile("x^2 + 1")
+    assert cache.compile("x ^ 2+1") is first
+    assert first.function(("x",)) is first.function(("x",))
+    assert np.allclose(first.function()(np.array([0.0, 2.0])), [1.0, 5.0])
+
+    cache.compile("y + 1")
+    cache.compile("z + 1")
+    assert cache.stats()["entries"] == 2
+    assert cache.compile("x^2+1") is not first
+
+    # Reel eksende tanimsiz deger NaN olmali
+    assert np.isnan(compile_expression("sqrt(x)").function()(np.array([-1.0]))[0])
+
+
+def test_canonical_key_unifies_equivalent_queries():
+    """Bosluk, terim sirasi, sayi yazimi ve TR/EN komut kelimeleri anahtari degistirmemeli"""
+    assert canonical_key("x^2+1") == canonical_key("x ^ 2 + 1") == canonical_key("1 + x^2")
+    assert canonical_key("y*x*2") == canonical_key("2*x*y")
+    assert canonical_key("2.50x") == canonical_key("2.5 * x")
+    assert canonical_key("türev x^2 at x = 4") == canonical_key("derivative of x^2 at x=4")
+    assert canonical_key("çöz x^2 - 4 = 0") == canonical_key("solve -4 + x^2 = 0")
+    assert canonical_key("∫ sin x from 0 to π") == canonical_key("integrate sin(x) from 0 to pi")
+
+    # Farkli ifadeler ayrik kalmali; sayilar hesaplanmaz, tam/ondalik ayrimi korunur
+    assert canonical_key("2+3") != canonical_key("5")
+    assert canonical_key("7/2") != canonical_key("7/2.0")
+    assert canonical_key("x^2 at x=4") != canonical_key("x^2 at x=5")
+    # Matrislerde carpim degismeli degil; tokenize edilemeyen metin de anahtar uretir
+    assert canonical_key("A*B", commutative=False) != canonical_key("B*A", commutative=False)
+    assert canonical_key("det [[1, 2],[3,4]]", commutative=False) == "determinant [[1,2],[3,4]]"
+    assert canonical_key("Faiz  5 %") == canonical_key("faiz 5%")
+
+
+def test_canonical_key_keeps_distinct_numbers_apart():
+    """Virgullu yazimlar ve tam basamakli ondaliklar ayni anahtara dusmemeli"""
+    assert canonical_key("loan 2,050 rate=6 nper=12") != canonical_key("loan 2,50 rate=6 nper=12")
+    assert canonical_key("1,05") != canonical_key("1,5")
+    assert canonical_key("0.1000000000000001 x") != canonical_key("0.1 x")
+    assert canonical_key("x + 050") != canonical_key("x + 50")
+
+
+def test_canonical_key_never_evaluates_calls():
+    """Anahtar uretimi fonksiyonlari hesaplamamali; uzun girdi parse edilmemeli"""
+    import time
+
+    started = time.perf_counter()
+    assert canonical_key("factorial(300000) + 1") == canonical_key("1 + factorial(300000)")
+    assert canonical_key("ln(x) + abs(x)") == canonical_key("abs(x) + ln(x)")
+    long_sum = "+".join(f"x^{i}" for i in range(2000))
+    assert canonical_key(long_sum) == canonical_key(long_sum.replace("+", " + "))
+    assert time.perf_counter() - started < 0.5
+
+
+def test_canonical_key_keeps_sign_products_apart():
+    """-1 carpanlari hesaplanmadan kalmali: "-1*-1" ile "-1" ayni anahtara dusmemeli"""
+    assert canonical_key("-1*-1") != canonical_key("-1")
+    assert canonical_key("(-1)*(-1)") != "-1"
+    assert canonical_key("2*(-1)*(-1)") != canonical_key("-2")
+    assert canonical_key("-1*-1*-1") != canonical_key("-1")
+    assert canonical_key("-2") == "-2" and canonical_key("x - 3") == canonical_key("-3 + x")
@@ -0,0 +1,19 @@
+"""Tests for incremental JSON step parsing"""
+
+from src.utils.json_stream import StepStreamParser
+
+
+def test_steps_emitted_as_they_complete():
+    """Adimlar yanit bitmeden, kapandiklari anda donmeli"""
+    parser = StepStreamParser()
+    chunks = ['{"result": 6, "ste', 'ps": ["x^2 turevi', ' 2x", {"a": "b]"}', ', "ad\\"im 3"', "]}"]
+
+    emitted = [parser.feed(chunk) for chunk in chunks]
+
+    assert emitted == [[], [], ["x^2 turevi 2x", "{'a': 'b]'}"], ['ad"im 3'], []]
+    assert parser.done
+
+
+def test_missing_steps_key_emits_nothing():
+    parser = StepStreamParser()
+    assert parser.feed('{"result": 1}') == []
@@ -0,0 +1,44 @@
+"""Tests for the matrix expression planner"""
+
+import numpy as np
+import pytest
+
+from src.utils.matrix_planner import chain_order, evaluate_program
+
+
+def test_chain_order_picks_cheapest_parenthesization():
+    """10x100 * 100x5 * 5x50: (AB)C, A(BC)'den 10 kat ucuz"""
+    cost, split = chain_order([10, 100, 5, 50])
+
+    assert cost == 2 * (10 * 100 * 5 + 10 * 5 * 50)
+    assert split[0][2] == 1
+
+
+def test_inverse_times_vector_becomes_solve():
+    """inv(A)*b acik ters almadan solve ile hesaplanmali"""
+    value, steps, metadata = evaluate_program("A = [[3, 1], [1, 2]]; b = [9, 8]; inv(A) * b")
+
+    assert np.allclose(value, [2, 3])
+    assert metadata["rewrites"] == 1
+    assert any("solve(A, b)" in step for step in steps)
+
+
+def test_common_subexpression_is_reused():
+    """Ayni alt ifade bir kez hesaplanmali; transpose ve let-baglamalari desteklenmeli"""
+    A = np.array([[1.0, 2.0], [3.0, 4.0]])
+    B = np.array([[0.0, 1.0], [1.0, 0.0]])
+    value, steps, _ = evaluate_program(
+        "A = [[1, 2], [3, 4]]; B = [[0, 1], [1, 0]]; A' * B * A + A' * B * A"
+    )
+
+    assert np.allclose(value, 2 * A.T @ B @ A)
+    assert any(step.startswith("Reused subexpression") for step in steps)
+
+
+def test_zero_and_small_powers():
+    """A^0 birim matris olmali; maliyet tahmini log2(0) ile patlamamali"""
+    value, _, _ = evaluate_program("[[1, 1], [1, 0]] ^ 0")
+    assert np.allclose(value, np.eye(2))
+
+    value, _, _ = evaluate_program("[[1, 1], [1, 0]] ^ 2 + [[1, 1], [1, 0]] ^ 0")
+    assert np.allclose(value, [[3, 1], [1, 2]])
@@ -0,0 +1,34 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.utils.exceptions import CalculationError
+from src.utils.plot_render import PlotRenderer, render_figure
+
+
+def _spec():
+    x = np.linspace(0, 1, 50)
+    return {"x": x, "y": x ** 2, "title": "f(x) = x**2"}
+
+
+def test_render_figure_without_pyplot():
+    """Figure/FigureCanvasAgg ile PNG baytlari uretilmeli"""
+    assert render_figure(_spec()).startswith(b"\x89PNG")
+
+
+@pytest.mark.asyncio
+async def test_renderer_writes_file_and_enforces_queue_limit(tmp_path):
+    """Worker'da cizilip atomik yazilmali; kuyruk siniri asilinca reddedilmeli"""
+    renderer = PlotRenderer(workers=1, queue_limit=1)
+    try:
+        path = await renderer.render_to_file(_spec(), tmp_path / "plot.png")
+        assert path.read_bytes().startswith(b"\x89PNG")
+        assert not list(tmp_path.glob("*.tmp"))
+
+        results = await asyncio.gather(
+            renderer.render(_spec()), renderer.render(_spec()), return_exceptions=True
+        )
+        assert sum(isinstance(r, CalculationError) for r in results) == 1
+    finally:
+        renderer.shutdown()
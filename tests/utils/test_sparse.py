@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.utils import sparse
+
+
+@pytest.fixture
+def builtin_backend(monkeypatch):
+    monkeypatch.setattr(sparse, "HAS_SCIPY", False)
+
+
+def _random_sparse(rng, shape, nnz):
+    rows = rng.integers(0, shape[0], nnz)
+    cols = rng.integers(0, shape[1], nnz)
+    values = rng.standard_normal(nnz)
+    dense = np.zeros(shape)
+    np.add.at(dense, (rows, cols), values)
+    return sparse.make_sparse(rows, cols, values, shape), dense
+
+
+def test_builtin_csr_products_match_dense(builtin_backend):
+    """Yerlesik CSR: matvec, sparse-sparse carpim ve transpoz yogun sonuca esit olmali"""
+    rng = np.random.default_rng(1)
+    A, dense_a = _random_sparse(rng, (15, 12), 30)
+    B, dense_b = _random_sparse(rng, (12, 9), 25)
+    x = rng.standard_normal(12)
+
+    assert isinstance(A, sparse.CSRMatrix)
+    assert np.allclose(A @ x, dense_a @ x)
+    assert np.allclose((A @ B).toarray(), dense_a @ dense_b)
+    assert np.allclose(A.T.toarray(), dense_a.T)
+
+
+@pytest.mark.parametrize("method", ["cg", "gmres"])
+def test_builtin_iterative_solvers(builtin_backend, method):
+    """Yerlesik CG/GMRES istenen toleransa yakinsamali"""
+    n = 40
+    rows = np.concatenate([np.arange(n), np.arange(n - 1), np.arange(1, n)])
+    cols = np.concatenate([np.arange(n), np.arange(1, n), np.arange(n - 1)])
+    values = np.concatenate([np.full(n, 4.0), np.full(n - 1, -1.0), np.full(n - 1, -1.0)])
+    A = sparse.make_sparse(rows, cols, values, (n, n))
+    b = np.arange(1.0, n + 1)
+
+    x, info = sparse.iterative_solve(A, b, method=method, tol=1e-10, restart=10)
+
+    assert info["converged"]
+    assert np.allclose(x, np.linalg.solve(A.toarray(), b))
+
+
+def test_matrix_market_round_trip(tmp_path):
+    rng = np.random.default_rng(2)
+    A, dense = _random_sparse(rng, (6, 5), 8)
+    path = tmp_path / "a.mtx"
+
+    sparse.write_matrix_market(A, path)
+
+    assert np.allclose(sparse.make_sparse(*sparse.read_matrix_market(path)).toarray(), dense)